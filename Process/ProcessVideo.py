@@ -1,21 +1,63 @@
 from queue import Full
+from collections import deque
 import cv2 as cv
 import sys
 import numpy as np
-from ultralytics import YOLO
-import random
+import threading
 import time
 from datetime import datetime
 
-import pymysql
-from dbconfig import dbconnect
-
 import traceback, logging
 import os
 from pathlib import Path
 
-import s3client
-from s3_config import ACCESS_KEY_ID, SECRET_ACCESS_KEY, DEFAULT_REGION, BUCKET
+from recognition_config import (
+    PERSON_CLASS_ID,
+    RECORD_RING_SIZE,
+    MOTION_GATE,
+    AUTOTUNE_INTERVAL,
+    PREROLL_SECONDS,
+    PREROLL_MAX_MB,
+    PREROLL_JPEG_QUALITY,
+    UPLOAD_EXIT_TIMEOUT,
+    RECORDER,
+    FFMPEG_PRESET,
+    FFMPEG_CRF,
+    RECORD_FALLBACK_FPS,
+    RELAY,
+    RELAY_CONNECT_TIMEOUT,
+    ANNOTATION_MODE,
+    DETECTION_STORE,
+    DETECTION_STORE_RETENTION_DAYS,
+    HEATMAP,
+    HEATMAP_SIZE,
+    HEATMAP_HALF_LIFE,
+    HEATMAP_SAVE_INTERVAL,
+    COUNT_EARLY_DELTA,
+    COUNT_EARLY_MIN_INTERVAL,
+)
+from motion_gate import MotionGate
+from overlay import OverlayRenderer
+from profiles import DEFAULT_PROFILE, crop_roi, offset_detections, scale_detections
+from stride import BoxInterpolator, StrideController
+from autotuner import AutoTuner
+from detections import EMPTY_DETECTIONS
+from uploader import Uploader
+from sidecar import SidecarWriter
+from detection_store import DetectionStoreWriter
+from count_stats import CountStats, ThresholdMonitor
+from zones import ZoneCounter
+from heatmap import OccupancyHeatmap
+from snapshots import SnapshotWriter
+from ffmpeg_writer import FFmpegWriter
+from cpu_budget import apply_cpu_budget
+from pipeline import (
+    LatestFrame,
+    FrameRing,
+    PreRollBuffer,
+    CaptureThread,
+    EncoderThread,
+)
 
 # 로그 설정
 logging.basicConfig(
@@ -24,24 +66,131 @@ logging.basicConfig(
 
 baseDir = Path(__file__).parent.parent  # 추가
 VIDEO_FOLDER = baseDir / "dt_videos"  # 추가
+DETECTION_FOLDER = baseDir / "dt_detections"  # 검출 사이드카 (ANNOTATION_MODE = "sidecar")
+DETECTION_STORE_FOLDER = baseDir / "dt_store"  # 검출 결과 저장소 (DETECTION_STORE)
+HEATMAP_FOLDER = baseDir / "dt_heatmaps"  # 점유 히트맵 (HEATMAP)
+SNAPSHOT_FOLDER = baseDir / "apps" / "snapshots"  # 감지 이벤트 스냅샷 (Flask SNAPSHOT_FOLDER)
+
+
+def count_persons(dets, person_class_id):
+    """검출 배열에서 'person' 클래스 수"""
+    return int((dets[:, 6].astype(int) == person_class_id).sum())
+
+
+def video_row(camera_idx, safe_timestamp, s3_file_path):
+    """videos 테이블 행 (녹화 종료 시점 기준)"""
+    rec_date, rec_time = safe_timestamp.split("_")
+    rend_date, rend_time = datetime.now().strftime("%Y%m%d_%H%M%S").split("_")
+    return {
+        "camera_id": camera_idx,
+        "camera_name": "Camera " + str(camera_idx),
+        "recorded_date": rec_date,
+        "recorded_time": rec_time,
+        "video_path": s3_file_path,
+        "is_dt": 1,
+        "rend_date": rend_date,
+        "rend_time": rend_time,
+    }
 
 
-def ProcessVideo(camera_url, camera_idx, q, pipe):
-    # YOLO 모델 불러오기
+def open_stream(url, relay_key):
+    """카메라 스트림 열기 (릴레이 사용 시 공유 메모리 구독)"""
+    if RELAY:
+        from frame_relay import RelaySubscriber
+
+        return RelaySubscriber(relay_key, timeout=RELAY_CONNECT_TIMEOUT)
+    return cv.VideoCapture(url)
+
+
+def save_heatmap(camera_idx, heatmap, frame, q):
+    """히트맵 파일 저장 후 main 에 격자 전달 (heatmaps 테이블 저장)"""
+    heatmap.decay(time.time())  # 사람이 없어 추론을 건너뛴 동안의 감쇠 반영
     try:
-        model = YOLO("yolo11n.pt")  # 모델 파일 경로 확인
-        logging.info(f"[Cam {camera_idx}] YOLO model loaded successfully.")
+        heatmap.save(HEATMAP_FOLDER, camera_idx, frame)
     except Exception as e:
-        logging.error(f"[Cam {camera_idx}] Failed to load YOLO model: {e}")
-        return  # 모델 로드 실패 시 프로세스 종료
+        logging.error(f"[Cam {camera_idx}] Failed to save heatmap: {e}")
+    grid_h, grid_w = heatmap.grid.shape
+    data = {
+        "width": grid_w,
+        "height": grid_h,
+        "grid": heatmap.grid.tobytes(),
+        "updated": heatmap.updated,
+    }
+    try:
+        q.put([camera_idx, "Heatmap", data], block=False)
+    except Full:
+        logging.warning(f"[Cam {camera_idx}] Queue is full. Heatmap update skipped.")
+
+
+def ProcessVideo(
+    camera_url,
+    camera_idx,
+    q,
+    pipe,
+    infer_queues=None,
+    headless=False,
+    profile=None,
+    sub_url=None,
+    zones=None,
+    cpu_budget=None,
+):
+    # infer_queues: 추론 서버 모드일 때 (요청 큐, 응답 큐). None 이면 직접 모델을 로드한다.
+    # headless: 화면 출력 없이 실행. 오버레이는 녹화되는 프레임에만 그린다.
+    # profile: 검출 프로필 (모델, 입력 크기, conf, 클래스 필터, 목표 fps, ROI)
+    # sub_url: 저해상도 서브스트림 주소. 있으면 인식은 서브스트림, 녹화는 메인 스트림에서 한다.
+    # zones: 구역 / 통과선 목록 (zones.load_zones)
+    # cpu_budget: 스레드 수 / 코어 고정 (cpu_budget.plan_cpu_budget). 모델 로드 전에 적용한다.
+    if cpu_budget is not None:
+        apply_cpu_budget(cpu_budget, f"Cam {camera_idx}", torch_threads=infer_queues is None)
+    profile = profile or dict(DEFAULT_PROFILE)
+    logging.info(f"[Cam {camera_idx}] Detection profile: {profile}")
+    detector_options = {
+        "model_path": profile["model_path"],
+        "imgsz": profile["imgsz"],
+        "conf": profile["conf"],
+        "classes": profile["classes"],
+    }
+    if infer_queues is not None:
+        from inference_server import InferenceClient
+
+        detector = InferenceClient(camera_idx, *infer_queues, **detector_options)
+        logging.info(f"[Cam {camera_idx}] Using shared inference server.")
+    else:
+        # YOLO 모델 불러오기
+        try:
+            from detector import create_detector
 
-    # 비디오 영상 불러오기
-    cap = cv.VideoCapture(camera_url)
+            detector = create_detector(**detector_options)
+            logging.info(
+                f"[Cam {camera_idx}] YOLO model loaded successfully ({detector.backend})."
+            )
+        except Exception as e:
+            logging.error(f"[Cam {camera_idx}] Failed to load YOLO model: {e}")
+            return  # 모델 로드 실패 시 프로세스 종료
+
+    # 비디오 영상 불러오기 (릴레이 사용 시 공유 메모리 구독)
+    cap = open_stream(camera_url, camera_idx)
 
     if not cap.isOpened():
         logging.error(f"[Cam {camera_idx}] Cannot open camera stream: {camera_url}")
         sys.exit(f"Cannot open camera {camera_idx}")  # 구체적인 에러 메시지와 함께 종료
 
+    # 서브스트림 (없거나 열 수 없으면 메인 스트림 하나로 인식과 녹화를 모두 처리)
+    sub_cap = None
+    if sub_url:
+        sub_cap = open_stream(sub_url, f"{camera_idx}_sub")
+        if sub_cap.isOpened():
+            logging.info(
+                f"[Cam {camera_idx}] Dual-stream: inference on substream "
+                f"{int(sub_cap.get(cv.CAP_PROP_FRAME_WIDTH))}x{int(sub_cap.get(cv.CAP_PROP_FRAME_HEIGHT))}"
+            )
+        else:
+            logging.warning(
+                f"[Cam {camera_idx}] Cannot open substream {sub_url}, falling back to single stream."
+            )
+            sub_cap.release()
+            sub_cap = None
+
     # 비디오 저장을 위한 변수
     fps = int(cap.get(cv.CAP_PROP_FPS))
     width = int(cap.get(cv.CAP_PROP_FRAME_WIDTH))
@@ -59,34 +208,37 @@ def ProcessVideo(camera_url, camera_idx, q, pipe):
             f"[Cam {camera_idx}] Invalid video properties obtained from camera. Recording might fail. W:{width}, H:{height}, FPS:{fps}"
         )
 
-    # 사람별 색상 저장 딕셔너리
-    person_colors = {}
-
-    # 사람 클래스 ID 찾기
-    person_class_id = None
-    if hasattr(model, "names"):
-        try:
-            person_class_id = [k for k, v in model.names.items() if v == "person"][0]
+    # 사람 클래스 ID 찾기 (추론 서버 모드에서는 설정값 사용)
+    person_class_id = PERSON_CLASS_ID
+    if infer_queues is None:
+        person_class_id = detector.class_id("person")
+        if person_class_id is not None:
             logging.info(
                 f"[Cam {camera_idx}] 'person' class ID found: {person_class_id}"
             )
-        except IndexError:
+        else:
             logging.warning(
-                "[Cam {camera_idx}] 'person' class not found in YOLO model names."
+                f"[Cam {camera_idx}] 'person' class not found in YOLO model names. Person detection might not work as expected."
             )
-    else:
-        logging.warning(
-            "[Cam {camera_idx}] Model does not have 'names' attribute. Cannot find 'person' class ID."
-        )
-
-    if person_class_id is None:
-        logging.warning(
-            "[Cam {camera_idx}] 'person' class ID not set. Person detection might not work as expected."
-        )
 
     # 타이머 설정 (30초마다 DB 전송용)
     log_interval = 30  # 초
     last_log_time = time.time()
+    # 로그 주기 동안의 인원 수 통계 (주기 경계의 순간 값 대신 구간 최대 / 평균 / p95 / ID 수)
+    count_stats = CountStats()
+    count_stats.reset(last_log_time)
+    sent_count = 0  # 마지막으로 전송한 인원 수 (조기 전송 판단용)
+    last_early_time = 0.0  # 마지막 조기 전송 시각
+    # main 이 내려보낸 모드 규칙 기준 즉시 경보
+    threshold_monitor = ThresholdMonitor()
+    # 구역별 인원 수 / 통과선 통과 수
+    zone_counter = ZoneCounter(zones or [], person_class_id)
+    zone_counts = {}
+    if zone_counter:
+        logging.info(
+            f"[Cam {camera_idx}] Zones: {[z['name'] for z in zone_counter.zones]}, "
+            f"lines: {[z['name'] for z in zone_counter.lines]}"
+        )
 
     # 녹화 관련 변수
     is_recording = False
@@ -97,124 +249,317 @@ def ProcessVideo(camera_url, camera_idx, q, pipe):
 
     status = False
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            logging.warning(
-                f"[Cam {camera_idx}] Failed to read frame from camera or stream ended."
+    # 스테이지 구성: 캡처 -> (최신 프레임) -> 추론 / 캡처 -> (링 버퍼) -> 인코딩·출력
+    stop_event = threading.Event()
+    latest_frame = LatestFrame()
+    record_ring = FrameRing(maxlen=RECORD_RING_SIZE)
+    # 추론 스레드가 갱신하고 인코더 스레드가 읽는 최신 결과 (dets, person_count)
+    detection_state = {"result": (EMPTY_DETECTIONS, 0)}
+
+    # 키프레임 사이 프레임은 추적 속도로 박스 위치를 보간하여 그린다
+    interpolator = BoxInterpolator()
+
+    overlay = OverlayRenderer(person_class_id)
+
+    def render(frame, frame_time):
+        count = detection_state["result"][1]
+        dets = interpolator.predict(frame_time)
+        return overlay.render(frame, dets, count, frame_time)
+
+    def open_writer(path):
+        """설정된 녹화기(RECORDER)로 녹화 파일 열기"""
+        if RECORDER == "ffmpeg":
+            # 캡처 시각 기준으로 프레임을 맞추므로 fps 는 출력 프레임 간격일 뿐이다
+            return FFmpegWriter(
+                path,
+                width,
+                height,
+                fps or RECORD_FALLBACK_FPS,
+                preset=FFMPEG_PRESET,
+                crf=FFMPEG_CRF,
+                wallclock=False,
             )
-            break
+        return cv.VideoWriter(path, fourcc, fps, (width, height))
 
-        if not status:
-            status = True
-            q.put([camera_idx, "Status", True], block=False)
+    # 녹화 파일 업로드 (videos 행은 큐로 메인 프로세스에 전달하여 일괄 저장)
+    uploader = Uploader(
+        camera_idx, lambda row: q.put([camera_idx, "Video", row], block=False)
+    )
 
-        # 객체 추적 수행
+    # 모든 추론 결과를 카메라 / 날짜별 저장소에 기록
+    store = None
+    if DETECTION_STORE:
         try:
-            results = model.track(frame, persist=True, verbose=False, conf=0.3)
-        except Exception as e:
-            logging.error(f"[Cam {camera_idx}] Error during YOLO tracking: {e}")
-            continue  # 현재 프레임 건너뛰기
-
-        person_count = 0
-        # 결과 처리 및 프레임에 그리기
-        if results and results[0].boxes:
-            # CPU로 데이터 이동 및 타입 변환 (오류 방지)
-            boxes = (
-                results[0].boxes.xyxy.cpu().numpy().astype(int)
-                if results[0].boxes.xyxy is not None
-                else []
-            )
-            classes = (
-                results[0].boxes.cls.cpu().numpy().astype(int)
-                if results[0].boxes.cls is not None
-                else []
-            )
-            track_ids = (
-                results[0].boxes.id.cpu().numpy().astype(int)
-                if results[0].boxes.id is not None
-                else []
-            )
-            confidences = (
-                results[0].boxes.conf.cpu().numpy()
-                if results[0].boxes.conf is not None
-                else []
+            store = DetectionStoreWriter(
+                DETECTION_STORE_FOLDER,
+                camera_idx,
+                person_class_id,
+                retention_days=DETECTION_STORE_RETENTION_DAYS,
             )
+        except OSError as e:
+            logging.error(f"[Cam {camera_idx}] Failed to open detection store: {e}")
 
-            # track_ids가 있을 경우에만 처리 (없으면 추적 실패)
-            if len(track_ids) > 0 and len(boxes) == len(classes) == len(
-                track_ids
-            ) == len(confidences):
-                for i, (x1, y1, x2, y2) in enumerate(boxes):
-                    current_class = classes[i]
-                    track_id = track_ids[i]
-                    confidence = confidences[i]
-
-                    # 'person' 클래스인 경우
-                    if current_class == person_class_id:
-                        person_count += 1
-
-                        # 사람별 색상 생성 (처음 등장하는 사람에 대해서만)
-                        if track_id not in person_colors:
-                            person_colors[track_id] = (
-                                random.randint(0, 255),
-                                random.randint(0, 255),
-                                random.randint(0, 255),
-                            )
-                        color = person_colors[track_id]
-
-                        # 바운딩 박스 그리기
-                        cv.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-
-                        # 레이블(ID) 및 신뢰도 표시
-                        label = f"ID: {track_id} {confidence:.2f}"  # Conf: {confidence:.2f} # 필요시 신뢰도 추가
-                        cv.putText(
-                            frame,
-                            label,
-                            (x1, y1 - 10),
-                            cv.FONT_HERSHEY_SIMPLEX,
-                            0.5,
-                            color,
-                            2,
-                        )
+    # 점유 히트맵: 이전에 저장한 격자가 있으면 이어서 누적
+    heatmap = None
+    if HEATMAP:
+        heatmap = OccupancyHeatmap(*HEATMAP_SIZE, half_life=HEATMAP_HALF_LIFE)
+        try:
+            if heatmap.load(HEATMAP_FOLDER, camera_idx):
+                logging.info(f"[Cam {camera_idx}] Restored occupancy heatmap.")
+        except Exception as e:
+            logging.error(f"[Cam {camera_idx}] Failed to load heatmap: {e}")
+    last_heatmap_save = time.time()
+
+    # 마지막 추론 (frame_time, 프레임, 추론 프레임 좌표 검출, 인원 수): 히트맵 배경 / 이벤트 스냅샷
+    last_inference = None
+
+    # 감지 이벤트 스냅샷 (main 의 ("SNAPSHOT", md_idx) 요청 시)
+    snapshots = SnapshotWriter(
+        camera_idx,
+        SNAPSHOT_FOLDER,
+        person_class_id,
+        lambda md_idx, path: q.put(
+            [camera_idx, "Snapshot", {"md_idx": md_idx, "path": path}], block=False
+        ),
+    )
 
-        # 현재 시간 표시
-        current_timestamp_display = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cv.putText(
-            frame,
-            current_timestamp_display,
-            (10, 30),
-            cv.FONT_HERSHEY_SIMPLEX,
-            1,
-            (255, 255, 255),
-            2,
-            cv.LINE_AA,
-        )  # 흰색, 외곽선 추가
-
-        # 인원 수 표시
-        person_count_text = f"Persons: {person_count}"
-        cv.putText(
-            frame,
-            person_count_text,
-            (10, height - 10),
-            cv.FONT_HERSHEY_SIMPLEX,
-            0.8,
-            (0, 255, 0),
-            2,
-            cv.LINE_AA,
-        )  # 녹색
-
-        # 화면 출력
-        cv.imshow(
-            f"Person Tracking - Cam {camera_idx}", frame
-        )  # 창 제목에 카메라 ID 추가
+    # 사이드카 모드: 주석 영상 대신 검출 결과만 기록 (REC ON 이전 PREROLL_SECONDS 만큼 포함)
+    sidecar_mode = ANNOTATION_MODE == "sidecar"
+    sidecar = None
+    recent_dets = deque()  # (frame_time, dets), 녹화 중이 아닐 때의 최근 검출 결과
+    if sidecar_mode:
+        logging.info(f"[Cam {camera_idx}] Recording detections as sidecar (no annotated video).")
+
+    # REC ON 이전 프레임을 녹화 앞부분에 넣기 위한 프리롤 버퍼
+    preroll = None
+    if PREROLL_SECONDS > 0 and not sidecar_mode:
+        preroll = PreRollBuffer(
+            PREROLL_SECONDS, PREROLL_MAX_MB * 1024 * 1024, PREROLL_JPEG_QUALITY
+        )
+
+    if sub_cap is None:
+        capture = CaptureThread(cap, camera_idx, [latest_frame, record_ring], stop_event)
+        sub_capture = None
+    else:
+        # 메인 스트림은 녹화만, 서브스트림은 추론만 받는다
+        capture = CaptureThread(cap, camera_idx, [record_ring], stop_event)
+        sub_capture = CaptureThread(
+            sub_cap, camera_idx, [latest_frame], stop_event, stream="sub"
+        )
+    encoder = EncoderThread(
+        record_ring, camera_idx, render, stop_event, show=not headless, preroll=preroll
+    )
+    if headless:
+        logging.info(f"[Cam {camera_idx}] Running in headless mode.")
+    capture.start()
+    if sub_capture is not None:
+        sub_capture.start()
+    encoder.start()
+
+    def stream_scale(sub_frame):
+        """서브스트림 -> 메인 스트림 좌표 배율 (sx, sy)"""
+        main_shape = capture.shape or (height, width)
+        sub_h, sub_w = sub_frame.shape[:2]
+        if not main_shape[0] or not main_shape[1]:
+            return 1.0, 1.0
+        return main_shape[1] / sub_w, main_shape[0] / sub_h
+
+    # 움직임 필터 / 목표 추론 fps
+    motion_gate = MotionGate() if MOTION_GATE else None
+    min_inference_interval = (
+        1.0 / profile["target_fps"] if profile["target_fps"] else 0.0
+    )
+    last_inference_time = 0.0
+    inference_count = 0
+    stride_control = StrideController(profile["stride"])
+
+    # 자동 튜닝 (프로필에 지연 시간 예산이 있을 때)
+    tuner = None
+    if profile["latency_budget_ms"]:
+        tuner = AutoTuner(camera_idx, profile["latency_budget_ms"], profile)
+    last_tune_time = time.time()
+
+    tuning_models = {}  # model_path -> 백그라운드에서 미리 불러온 모델
+    pending_tuning = {}  # "setting": 모델 로드가 끝나 적용을 기다리는 단계
+
+    def load_tuning_model(setting):
+        path = setting["model_path"]
+        try:
+            tuning_models[path] = detector.load_model(path)
+        except Exception as e:
+            logging.error(f"[Cam {camera_idx}] Failed to load tuning model {path}: {e}")
+            return
+        pending_tuning["setting"] = setting
+
+    def apply_tuning(setting):
+        nonlocal min_inference_interval
+        path = setting["model_path"]
+        if (
+            hasattr(detector, "load_model")
+            and path != detector.model_path
+            and path not in tuning_models
+        ):
+            # 모델 로드 / 내보내기는 수 초가 걸릴 수 있으므로 추론 루프 밖에서 불러온 뒤 적용한다
+            threading.Thread(
+                target=load_tuning_model,
+                args=(setting,),
+                daemon=True,
+                name=f"tune-load-{camera_idx}",
+            ).start()
+            return
+        if hasattr(detector, "load_model"):
+            detector.configure(path, setting["imgsz"], model=tuning_models.get(path))
+        else:
+            detector.configure(path, setting["imgsz"])
+        min_inference_interval = (
+            1.0 / setting["target_fps"] if setting["target_fps"] else 0.0
+        )
+
+    if tuner is not None:
+        apply_tuning(tuner.current)
+        logging.info(
+            f"[Cam {camera_idx}] AutoTune enabled: budget {profile['latency_budget_ms']}ms, "
+            f"level {tuner.level} {tuner.current}"
+        )
+
+    person_count = 0
+    last_stats_time = time.time()
+
+    while not stop_event.is_set():
+        item = latest_frame.get(timeout=0.5)
+
+        if item is not None:
+            frame_no, frame_time, frame = item
+
+            if not status:
+                status = True
+                q.put([camera_idx, "Status", True], block=False)
+
+            # 객체 추적 수행 (항상 가장 최근 프레임)
+            # 장면 변화가 없으면 추론을 건너뛰고 이전 결과와 인원 수를 그대로 사용
+            if frame_time - last_inference_time < min_inference_interval:
+                pass  # 목표 fps 초과분은 추론하지 않는다
+            elif not stride_control.is_keyframe():
+                pass  # 키프레임이 아니면 보간된 박스를 사용
+            elif motion_gate is None or motion_gate.should_infer(frame, frame_time):
+                last_inference_time = frame_time
+                try:
+                    # ROI 만 추론하고 박스는 전체 프레임 좌표로 되돌린다
+                    roi_frame, roi_offset = crop_roi(frame, profile["roi"])
+                    dets = offset_detections(detector.track(roi_frame), roi_offset)
+                    if zone_counter:
+                        # 구역 마스크는 추론 프레임 해상도 기준 (서브스트림 좌표 변환 전)
+                        zone_counts = zone_counter.update(frame.shape, dets, frame_time)
+                    if heatmap is not None:
+                        heatmap.add(frame.shape, dets, frame_time, person_class_id)
+                    infer_dets = dets.copy() if sub_capture is not None else dets  # scale_detections 는 제자리 수정
+                    if sub_capture is not None:
+                        # 서브스트림 좌표 -> 녹화(메인 스트림) 좌표
+                        dets = scale_detections(dets, stream_scale(frame))
+                    inference_count += 1
+                    person_count = count_persons(dets, person_class_id)
+                    last_inference = (frame_time, frame, infer_dets, person_count)
+                    count_stats.observe(
+                        frame_time,
+                        person_count,
+                        dets[dets[:, 6].astype(int) == person_class_id, 4],
+                    )
+                    crossed = threshold_monitor.update(person_count, zone_counts)
+                    if crossed is not None:
+                        event = {
+                            "over": crossed,
+                            "count": threshold_monitor.smoothed,
+                            "limit": threshold_monitor.threshold,
+                            "mode_id": threshold_monitor.rule.get("id"),
+                            "frame_time": frame_time,  # main 에서 프레임 -> REC ON 지연 측정
+                        }
+                        q.put([camera_idx, "Threshold", event], block=False)
+                        logging.info(f"[Cam {camera_idx}] Threshold event: {event}")
+                    detection_state["result"] = (dets, person_count)
+                    interpolator.update(dets, frame_time)
+                    if store is not None:
+                        try:
+                            store.append(frame_time, dets)
+                        except OSError as e:
+                            logging.error(f"[Cam {camera_idx}] Detection store write failed: {e}")
+                            store.close()
+                            store = None
+                    if sidecar is not None:
+                        sidecar.write(frame_time, dets)
+                    elif sidecar_mode:
+                        recent_dets.append((frame_time, dets))
+                        while recent_dets[0][0] < frame_time - PREROLL_SECONDS:
+                            recent_dets.popleft()
+                    stride_control.adapt(person_count, interpolator.speed)
+                    if tuner is not None:
+                        tuner.observe(time.time() - frame_time)  # 프레임 -> 인원 수 지연
+                except Exception as e:
+                    logging.error(f"[Cam {camera_idx}] Error during YOLO tracking: {e}")
+
+        # 자동 튜닝 단계 조정
+        if tuner is not None and time.time() - last_tune_time >= AUTOTUNE_INTERVAL:
+            last_tune_time = time.time()
+            setting = tuner.step(last_tune_time)
+            # 백그라운드 로드가 끝난 단계는 아직 현재 단계일 때만 적용
+            loaded = pending_tuning.pop("setting", None)
+            if setting is None and loaded is not None and loaded is tuner.current:
+                setting = loaded
+            if setting is not None:
+                try:
+                    apply_tuning(setting)
+                except Exception as e:
+                    logging.error(f"[Cam {camera_idx}] Failed to apply tuning {setting}: {e}")
+
+        # 인코더가 쓰기 오류로 녹화를 중단한 경우
+        if is_recording and not encoder.is_recording:
+            is_recording = False
+            video_writer = None
 
         # Pipe 메시지 처리 (녹화 제어)
         try:
             if pipe.poll():
                 msg = pipe.recv()
                 logging.info(f"[Cam {camera_idx}] Received message: {msg}")
-                if msg == "REC ON":
+                if isinstance(msg, tuple) and msg[0] == "RULES":
+                    threshold_monitor.set_rules(
+                        msg[1], [z["id"] for z in zone_counter.zones]
+                    )
+                elif isinstance(msg, tuple) and msg[0] == "SNAPSHOT":
+                    # 사람이 보이는 카메라만 스냅샷 (그 외에는 바로 없음으로 응답)
+                    if last_inference is not None and last_inference[3] > 0:
+                        shot_time, shot_frame, shot_dets, shot_count = last_inference
+                        snapshots.submit(
+                            msg[1], shot_frame.copy(), shot_dets, shot_count, shot_time
+                        )
+                    else:
+                        q.put(
+                            [camera_idx, "Snapshot", {"md_idx": msg[1], "path": None}],
+                            block=False,
+                        )
+                elif msg == "REC ON" and sidecar_mode:
+                    if sidecar is None:
+                        rec_h, rec_w = (capture.shape or (height, width))[:2]
+                        start = recent_dets[0][0] if recent_dets else time.time()
+                        try:
+                            sidecar = SidecarWriter(
+                                DETECTION_FOLDER, camera_idx, rec_w, rec_h, start_time=start
+                            )
+                            while recent_dets:
+                                sidecar.write(*recent_dets.popleft())
+                            logging.info(
+                                f"[Cam {camera_idx}] Started detection sidecar: {sidecar.path}"
+                            )
+                        except OSError as e:
+                            logging.error(f"[Cam {camera_idx}] Failed to open sidecar: {e}")
+                            sidecar = None
+                elif msg == "REC OFF" and sidecar_mode:
+                    if sidecar is not None:
+                        sidecar.close()
+                        logging.info(
+                            f"[Cam {camera_idx}] Stopped detection sidecar ({sidecar.records} records)."
+                        )
+                        sidecar = None
+                elif msg == "REC ON":
                     if not is_recording:
                         # 영상 녹화 저장 경로 설정
                         base_recording_folder = VIDEO_FOLDER  # 수정
@@ -248,13 +593,18 @@ def ProcessVideo(camera_url, camera_idx, q, pipe):
                         record_start_time_sec = time.time()
 
                         # VideoWriter 생성
-                        video_writer = cv.VideoWriter(
-                            output_path, fourcc, fps, (width, height)
-                        )
+                        try:
+                            video_writer = open_writer(output_path)
+                        except Exception as e:
+                            logging.error(f"[Cam {camera_idx}] Failed to start recorder: {e}")
+                            video_writer = None
 
                         # VideoWriter 생성 성공 여부 확인
-                        if video_writer.isOpened():
+                        if video_writer is not None and video_writer.isOpened():
                             is_recording = True
+                            if preroll is None:
+                                record_ring.clear()  # REC ON 이전 프레임은 녹화하지 않는다
+                            encoder.open(video_writer)
                             logging.info(
                                 f"[Cam {camera_idx}] Started recording to: {output_path}"
                             )
@@ -270,54 +620,13 @@ def ProcessVideo(camera_url, camera_idx, q, pipe):
                 elif msg == "REC OFF":
                     if is_recording and video_writer is not None:
                         is_recording = False
-                        video_writer.release()  # 파일 저장 완료
-                        s3client.upload_file(
+                        encoder.close()  # 파일 저장 완료
+                        # 업로드 / DB 기록은 백그라운드에서 처리 (프레임 루프는 대기하지 않음)
+                        uploader.submit(
                             output_path,
                             s3_file_path,
+                            video_row(camera_idx, safe_timestamp, s3_file_path),
                         )
-                        try:
-                            os.remove(output_path)
-                            logging.info(f"로컬 파일 {output_path} 삭제완료")
-                        except:
-                            logging.error(f"로컬 파일 {output_path} 삭제실패")
-                        try:
-                            conn = dbconnect()
-                            cur = conn.cursor(pymysql.cursors.DictCursor)
-                            rend_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            sql_video = "INSERT INTO videos (camera_id, camera_name, recorded_date, recorded_time, video_path, is_dt, rend_date, rend_time) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
-                            cur.execute(
-                                sql_video,
-                                (
-                                    camera_idx,
-                                    "Camera " + str(camera_idx),
-                                    safe_timestamp[0 : safe_timestamp.find("_")],
-                                    safe_timestamp[
-                                        safe_timestamp.find("_")
-                                        + 1 : len(safe_timestamp)
-                                    ],
-                                    s3_file_path,
-                                    1,
-                                    rend_timestamp[0 : safe_timestamp.find("_")],
-                                    rend_timestamp[
-                                        safe_timestamp.find("_")
-                                        + 1 : len(safe_timestamp)
-                                    ],
-                                ),
-                            )  # 시간 포맷 맞춰주기
-                            conn.commit()
-                        except pymysql.Error as e:
-                            logging.error(f"Database error: {e}")
-                            sys.exit(1)  # DB 오류 시 종료
-                        except ConnectionError as e:
-                            logging.error(f"Database connection error: {e}")
-                            sys.exit(1)
-                        except Exception as e:  # 예상치 못한 다른 오류
-                            logging.error(
-                                f"An unexpected error occurred during DB setup: {e}"
-                            )
-                            traceback.print_exc()
-                            sys.exit(1)
-
                         logging.info(
                             f"[Cam {camera_idx}] Stopped recording. File saved."
                         )
@@ -341,26 +650,38 @@ def ProcessVideo(camera_url, camera_idx, q, pipe):
             logging.error(f"[Cam {camera_idx}] Error processing pipe message: {e}")
             traceback.print_exc()  # 상세 오류 출력
 
-        # --- 프레임 녹화 ---
-        if is_recording and video_writer is not None:
+        # 인원 수가 급변하면 주기를 기다리지 않고 "Count" 메시지로 바로 알린다.
+        # 주기 로그와는 별도 메시지이므로 모든 카메라의 주기 로그 시점(main 의 배치 합계)은 그대로 유지된다.
+        current_time = time.time()
+        if (
+            COUNT_EARLY_DELTA > 0
+            and abs(person_count - sent_count) >= COUNT_EARLY_DELTA
+            and current_time - last_early_time >= COUNT_EARLY_MIN_INTERVAL
+        ):
+            last_early_time = current_time
+            sent_count = person_count
+            logging.info(
+                f"[Cam {camera_idx}] Count changed sharply, sending early: {person_count}"
+            )
             try:
-                video_writer.write(frame)
-            except Exception as e:
-                logging.error(
-                    f"[Cam {camera_idx}] Error writing frame to video file: {e}"
+                q.put(
+                    [camera_idx, "Count", {"count": person_count, "time": datetime.now()}],
+                    block=False,
                 )
-                # 녹화 중단 또는 오류 처리 로직 추가 가능
-                is_recording = False
-                video_writer.release()
-                video_writer = None
+            except Full:
+                pass
 
         # 주기적 로그 전송
-        current_time = time.time()
         if current_time - last_log_time >= log_interval:
             log_time = datetime.now()  # 로그 시점의 정확한 시간 기록
-            # logging.info(f"[Cam {camera_idx}] Sending log: Count={person_count} at {log_time}")
+            stats = count_stats.summary(current_time)
+            count_stats.reset(current_time)
+            if zone_counter:
+                stats.update(zone_counter.summary())
+                zone_counter.reset()
+            sent_count = person_count
             try:
-                q.put([camera_idx, person_count, log_time], block=False)
+                q.put([camera_idx, person_count, log_time, stats], block=False)
             except Full:  # Queue가 가득 찼을 경우 (메인 프로세스 처리 지연)
                 logging.warning(
                     f"[Cam {camera_idx}] Queue is full. Log data might be lost."
@@ -370,76 +691,84 @@ def ProcessVideo(camera_url, camera_idx, q, pipe):
 
             last_log_time = current_time  # 마지막 로그 시간 갱신
 
-        # 종료 키 처리 ('q')
-        key = cv.waitKey(1) & 0xFF
-        if key == ord("q"):
-            logging.info(f"[Cam {camera_idx}] 'q' key pressed. Exiting loop.")
-            break
+        # 점유 히트맵 저장 (파일 + main 을 통해 DB)
+        if heatmap is not None and current_time - last_heatmap_save >= HEATMAP_SAVE_INTERVAL:
+            last_heatmap_save = current_time
+            save_heatmap(
+                camera_idx, heatmap, last_inference[1] if last_inference else None, q
+            )
+
+        # 스테이지 상태 로그 및 메트릭 전송
+        if current_time - last_stats_time >= log_interval:
+            metrics = {
+                "captured": capture.frames,
+                "sub_captured": sub_capture.frames if sub_capture is not None else 0,
+                "inference_dropped": latest_frame.dropped,
+                "record_dropped": record_ring.dropped,
+                "inference_fps": round(
+                    inference_count / (current_time - last_stats_time), 2
+                ),
+                "skip_ratio": (
+                    round(motion_gate.pop_skip_ratio(), 3) if motion_gate else 0.0
+                ),
+                "stride": stride_control.stride,
+                "preroll_kb": preroll.nbytes // 1024 if preroll is not None else 0,
+            }
+            if tuner is not None:
+                metrics["autotune"] = tuner.status()
+            logging.info(
+                f"[Cam {camera_idx}] Pipeline: captured={metrics['captured']}, "
+                f"inference_dropped={metrics['inference_dropped']}, record_dropped={metrics['record_dropped']}, "
+                f"inference_fps={metrics['inference_fps']}, skip_ratio={metrics['skip_ratio']:.1%}, "
+                f"stride={metrics['stride']}"
+            )
+            try:
+                q.put([camera_idx, "Metrics", metrics], block=False)
+            except Full:
+                pass
+            inference_count = 0
+            last_stats_time = current_time
 
     # 루프 종료 후 정리
     logging.info(f"[Cam {camera_idx}] Cleaning up resources...")
+    stop_event.set()
+    capture.join(timeout=5)
+    if sub_capture is not None:
+        sub_capture.join(timeout=5)
+    encoder.join(timeout=5)
     if is_recording and video_writer is not None:
         try:
             logging.info(
                 f"[Cam {camera_idx}] Releasing video writer due to loop exit..."
             )
-            video_writer.release()
-            s3client.upload_file(
+            encoder.close()
+            uploader.submit(
                 output_path,
                 s3_file_path,
+                video_row(camera_idx, safe_timestamp, s3_file_path),
             )
-            logging.info(
-                f"{output_path} -> s3://{BUCKET}/{s3_file_path} 저장 완료(움직임 감지 녹화 중 프로세스 종료)"
-            )
-            time.sleep(1)
-            try:
-                os.remove(output_path)
-                logging.info(f"로컬 파일 {output_path} 삭제완료")
-            except:
-                logging.error(f"로컬 파일 {output_path} 삭제실패")
-
-            if is_recording == True:
-                try:
-                    conn = dbconnect()
-                    cur = conn.cursor(pymysql.cursors.DictCursor)
-                    rend_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    sql_video = "INSERT INTO videos (camera_id, camera_name, recorded_date, recorded_time, video_path, is_dt, rend_date, rend_time) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
-                    cur.execute(
-                        sql_video,
-                        (
-                            camera_idx,
-                            "Camera " + str(camera_idx),
-                            safe_timestamp[0 : safe_timestamp.find("_")],
-                            safe_timestamp[
-                                safe_timestamp.find("_") + 1 : len(safe_timestamp)
-                            ],
-                            s3_file_path,
-                            1,
-                            rend_timestamp[0 : safe_timestamp.find("_")],
-                            rend_timestamp[
-                                safe_timestamp.find("_") + 1 : len(safe_timestamp)
-                            ],
-                        ),
-                    )  # 시간 포맷 맞춰주기
-                    conn.commit()
-                except pymysql.Error as e:
-                    logging.error(f"Database error: {e}")
-                    sys.exit(1)  # DB 오류 시 종료
-                except ConnectionError as e:
-                    logging.error(f"Database connection error: {e}")
-                    sys.exit(1)
-                except Exception as e:  # 예상치 못한 다른 오류
-                    logging.error(f"An unexpected error occurred during DB setup: {e}")
-                    traceback.print_exc()
-                    sys.exit(1)
         except Exception as e:
             logging.error(
                 f"[Cam {camera_idx}] Error releasing video writer during cleanup: {e}"
             )
 
+    if sidecar is not None:
+        sidecar.close()
+    if store is not None:
+        store.close()
+    snapshots.close()
+    if heatmap is not None:
+        save_heatmap(camera_idx, heatmap, last_inference[1] if last_inference else None, q)
+
+    # 남은 업로드 완료 대기 (메인 프로세스의 종료 대기 시간 안에서)
+    uploader.close(timeout=UPLOAD_EXIT_TIMEOUT)
+
     q.put([camera_idx, "Status", False], block=False)
 
     if cap is not None and cap.isOpened():
         cap.release()
-    cv.destroyAllWindows()
+    if sub_cap is not None:
+        sub_cap.release()
+    if infer_queues is not None:
+        detector.close()
     logging.info(f"[Cam {camera_idx}] Process finished.")
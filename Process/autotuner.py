@@ -0,0 +1,134 @@
+import logging
+import random
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import psutil
+
+from recognition_config import (
+    AUTOTUNE_LADDER,
+    AUTOTUNE_START_LEVEL,
+    AUTOTUNE_WINDOW,
+    AUTOTUNE_COOLDOWN,
+    AUTOTUNE_UP_RATIO,
+    AUTOTUNE_CPU_HIGH,
+    AUTOTUNE_CPU_LOW,
+    AUTOTUNE_CPU_PATIENCE,
+    AUTOTUNE_COOLDOWN_JITTER,
+)
+
+
+class AutoTuner:
+    """
+    카메라별 지연 시간 예산 유지 컨트롤러.
+
+    프레임 캡처부터 인원 수 산출까지의 지연(p90)과 CPU 사용률을 보고
+    AUTOTUNE_LADDER 의 단계(모델, 입력 크기, 추론 fps)를 한 칸씩 올리거나 내린다.
+    단계 0 이 가장 정확하고 무거운 설정이다.
+    프로필 설정이 단계에 없으면 프로필 설정을 단계 0 으로 두고 AUTOTUNE_START_LEVEL 부터의 단계를 잇는다.
+    (운영자가 고른 설정에서 시작하고, 그보다 무거운 설정으로는 올라가지 않는다)
+    """
+
+    def __init__(self, camera_idx, budget_ms, profile, ladder=AUTOTUNE_LADDER):
+        self.camera_idx = camera_idx
+        self.budget_ms = budget_ms
+        self.latencies = deque(maxlen=AUTOTUNE_WINDOW)
+        self.last_change = 0.0
+        self.cooldown = self._jittered_cooldown()
+        self.cpu_high = 0  # CPU 사용률 초과 연속 횟수
+        self.cpu_low = 0
+        self.decisions = deque(maxlen=10)
+
+        # 프로필과 같은 단계가 있으면 그 단계에서 시작
+        self.ladder = list(ladder)
+        self.level = None
+        for i, step in enumerate(ladder):
+            if (step["model_path"], step["imgsz"]) == (
+                profile["model_path"],
+                profile["imgsz"],
+            ):
+                self.level = i
+                break
+        if self.level is None:
+            own = {
+                "model_path": profile["model_path"],
+                "imgsz": profile["imgsz"],
+                "target_fps": profile.get("target_fps"),
+            }
+            self.ladder = [own] + list(ladder[AUTOTUNE_START_LEVEL:])
+            self.level = 0
+        psutil.cpu_percent(interval=None)  # 첫 호출은 기준값 설정용
+
+    @staticmethod
+    def _jittered_cooldown():
+        return AUTOTUNE_COOLDOWN * (1 + random.random() * AUTOTUNE_COOLDOWN_JITTER)
+
+    @property
+    def current(self):
+        return self.ladder[self.level]
+
+    def observe(self, latency):
+        """추론 1회의 지연 시간(초) 기록"""
+        self.latencies.append(latency)
+
+    def step(self, now):
+        """단계를 조정한다. 바뀐 경우 새 단계 설정, 아니면 None"""
+        if now - self.last_change < self.cooldown:
+            return None
+        if len(self.latencies) < self.latencies.maxlen // 2:
+            return None
+
+        p90 = float(np.percentile(self.latencies, 90)) * 1000
+        cpu = psutil.cpu_percent(interval=None)
+        self.cpu_high = self.cpu_high + 1 if cpu > AUTOTUNE_CPU_HIGH else 0
+        self.cpu_low = self.cpu_low + 1 if cpu < AUTOTUNE_CPU_LOW else 0
+
+        level = self.level
+        if p90 > self.budget_ms or self.cpu_high >= AUTOTUNE_CPU_PATIENCE:
+            level = min(level + 1, len(self.ladder) - 1)
+            reason = f"p90 {p90:.0f}ms / budget {self.budget_ms}ms, cpu {cpu:.0f}%"
+        elif (
+            p90 < self.budget_ms * AUTOTUNE_UP_RATIO
+            and self.cpu_low >= AUTOTUNE_CPU_PATIENCE
+        ):
+            level = max(level - 1, 0)
+            reason = f"headroom: p90 {p90:.0f}ms, cpu {cpu:.0f}%"
+
+        if level == self.level:
+            return None
+
+        direction = "down" if level > self.level else "up"
+        logging.info(
+            f"[Cam {self.camera_idx}] AutoTune step {direction}: level {self.level} -> {level} "
+            f"{self.ladder[level]} ({reason})"
+        )
+        self.decisions.append(
+            {
+                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "from": self.level,
+                "to": level,
+                "reason": reason,
+            }
+        )
+        self.level = level
+        self.last_change = now
+        self.cooldown = self._jittered_cooldown()
+        self.cpu_high = self.cpu_low = 0
+        self.latencies.clear()  # 새 설정으로 다시 측정
+        return self.current
+
+    def status(self):
+        """메트릭 전송용 상태"""
+        p90 = (
+            round(float(np.percentile(self.latencies, 90)) * 1000, 1)
+            if self.latencies
+            else None
+        )
+        return {
+            "budget_ms": self.budget_ms,
+            "p90_ms": p90,
+            "level": self.level,
+            "setting": self.current,
+            "decisions": list(self.decisions),
+        }
@@ -0,0 +1,61 @@
+import logging
+from pathlib import Path
+
+from recognition_config import DETECT_BACKEND, BACKEND_AUTO_EXPORT
+
+# 백엔드별 ultralytics export 형식과 내보낸 모델 경로 규칙 (yolo11n.pt 기준)
+#   torch    -> yolo11n.pt (PyTorch, 기존 동작)
+#   onnx     -> yolo11n.onnx (ONNX Runtime, onnxruntime 패키지 필요)
+#   openvino -> yolo11n_openvino_model/ (OpenVINO IR, openvino 패키지 필요)
+BACKENDS = {
+    "torch": None,
+    "onnx": {"format": "onnx", "suffix": ".onnx"},
+    "openvino": {"format": "openvino", "suffix": "_openvino_model"},
+}
+
+
+def exported_path(model_path, backend):
+    """.pt 모델을 backend 로 내보냈을 때의 경로"""
+    spec = BACKENDS[backend]
+    if spec is None:
+        return model_path
+    path = Path(model_path)
+    return str(path.with_name(path.stem + spec["suffix"]))
+
+
+def export_model(model_path, backend, imgsz=640):
+    """
+    .pt 모델을 backend 형식으로 내보낸다.
+    프로필/자동 튜닝에서 입력 크기가 바뀌므로 동적 입력 크기로 내보낸다.
+    """
+    from ultralytics import YOLO
+
+    spec = BACKENDS[backend]
+    if spec is None:
+        return model_path
+    logging.info(f"Exporting {model_path} to {backend} ...")
+    path = YOLO(model_path).export(format=spec["format"], imgsz=imgsz, dynamic=True)
+    return str(path)
+
+
+def resolve_model(model_path, backend=DETECT_BACKEND):
+    """
+    백엔드에 맞는 모델 경로 반환.
+    이미 내보낸 모델(.onnx, _openvino_model)을 지정했거나 torch 백엔드면 그대로 사용하고,
+    내보낸 모델이 없으면 BACKEND_AUTO_EXPORT 설정에 따라 내보내거나 .pt 로 대체한다.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown detector backend: {backend}")
+    if BACKENDS[backend] is None or not str(model_path).endswith(".pt"):
+        return model_path
+
+    path = exported_path(model_path, backend)
+    if Path(path).exists():
+        return path
+    if BACKEND_AUTO_EXPORT:
+        return export_model(model_path, backend)
+    logging.warning(
+        f"{path} not found. Falling back to PyTorch model {model_path} "
+        f"(run bench/export_backends.py to export)."
+    )
+    return model_path
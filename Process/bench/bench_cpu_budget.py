@@ -0,0 +1,106 @@
+"""
+카메라 프로세스별 CPU 스레드 예산 / 코어 고정 설정에 따른 전체 처리량 비교.
+
+녹화된 영상 파일을 카메라 N대로 재생하며 (INFERENCE_MODE = "process" 와 같은 구성)
+설정마다 일정 시간 동안 처리한 프레임 수를 측정한다.
+    default : 라이브러리 기본값 (프로세스마다 전체 코어 수만큼 스레드)
+    budget  : plan_cpu_budget 자동 스레드 수
+    pinned  : budget + 워커별 코어 고정
+    threads=K : 프로세스당 K 스레드 (--threads 로 여러 값 지정)
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/bench_cpu_budget.py sample.mp4 --cameras 8 --seconds 30 --threads 1 2 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2 as cv
+
+from cpu_budget import apply_cpu_budget, plan_cpu_budget, usable_cores
+
+
+def _replay(video_path):
+    """영상 파일을 무한 반복 재생"""
+    cap = cv.VideoCapture(video_path)
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            cap.set(cv.CAP_PROP_POS_FRAMES, 0)
+            continue
+        yield frame
+
+
+def camera_worker(video_path, camera_idx, seconds, counter, budget, ready):
+    if budget is not None:
+        apply_cpu_budget(budget, f"Cam {camera_idx}")
+
+    from detector import Detector
+
+    detector = Detector()
+    frames = _replay(video_path)
+    detector.track(next(frames))  # 워밍업
+    ready.wait()
+
+    processed = 0
+    end = time.time() + seconds
+    while time.time() < end:
+        detector.track(next(frames))
+        processed += 1
+
+    with counter.get_lock():
+        counter.value += processed
+
+
+def run(name, budgets, video_path, cameras, seconds):
+    counter = multiprocessing.Value("i", 0)
+    ready = multiprocessing.Event()
+    processes = []
+    for camera_idx in range(cameras):
+        p = multiprocessing.Process(
+            target=camera_worker,
+            args=(video_path, camera_idx, seconds, counter, budgets[camera_idx], ready),
+        )
+        p.start()
+        processes.append(p)
+
+    time.sleep(5)  # 모델 로드 대기
+    ready.set()
+    for p in processes:
+        p.join()
+
+    fps = counter.value / seconds
+    threads = budgets[0]["threads"] if budgets[0] else "all"
+    print(
+        f"{name:10s} cameras={cameras:3d} threads/proc={threads!s:>4s} "
+        f"total_fps={fps:8.1f} per_cam_fps={fps / cameras:6.2f}"
+    )
+    return fps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--threads", type=int, nargs="*", default=[], help="고정 스레드 수 설정 추가")
+    args = parser.parse_args()
+
+    print(f"usable cores: {len(usable_cores())}")
+    settings = [
+        ("default", [None] * args.cameras),
+        ("budget", plan_cpu_budget(args.cameras, pin=False)),
+        ("pinned", plan_cpu_budget(args.cameras, pin=True)),
+    ]
+    for threads in args.threads:
+        settings.append((f"threads={threads}", plan_cpu_budget(args.cameras, threads=threads, pin=False)))
+
+    results = {name: run(name, budgets, args.video, args.cameras, args.seconds) for name, budgets in settings}
+    base = max(results["default"], 1e-9)
+    for name, fps in results.items():
+        print(f"{name:10s} vs default: {fps / base:.2f}x")
@@ -0,0 +1,78 @@
+"""
+추론 경로별 프레임당 오버헤드 비교 (ultralytics predictor vs FastDetector).
+
+같은 프레임에서 프레임당 전체 시간과 네트워크 forward 만의 시간을 재고,
+그 차이(전처리 + 후처리 + 변환 오버헤드)를 구현별로 보고한다.
+forward 는 정사각형 입력 기준이라 ultralytics 쪽(직사각형 letterbox)은 근사값이다.
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/bench_fast_detector.py sample.mp4 --frames 300 --imgsz 640
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import torch
+
+from bench_stride_replay import load_frames
+from detector import create_detector
+from recognition_config import PERSON_CLASS_ID
+
+
+def forward_ms(detector, imgsz, repeat=50):
+    """고정 입력으로 네트워크 forward 시간만 측정 (ms)"""
+    net = detector.model.model.fuse(verbose=False).eval()
+    x = torch.zeros((1, 3, imgsz, imgsz))
+    times = []
+    with torch.inference_mode():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            net(x)
+            times.append(time.perf_counter() - start)
+    return np.median(times) * 1000
+
+
+def per_frame_ms(detector, frames, warmup=10):
+    for frame in frames[:warmup]:
+        detector.track(frame)
+    times, counts = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        dets = detector.track(frame)
+        times.append(time.perf_counter() - start)
+        counts.append(int(np.sum(dets[:, 6].astype(int) == PERSON_CLASS_ID)))
+    return np.array(times) * 1000, np.array(counts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--model", default="yolo11n.pt")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    frames, _ = load_frames(args.video, args.frames)
+    print(f"{len(frames)} frames {frames[0].shape[1]}x{frames[0].shape[0]}, imgsz={args.imgsz}, threads={torch.get_num_threads()}")
+
+    results = {}
+    for impl in ("ultralytics", "fast"):
+        detector = create_detector(
+            impl, model_path=args.model, imgsz=args.imgsz, classes=[PERSON_CLASS_ID]
+        )
+        times, counts = per_frame_ms(detector, frames)
+        fwd = forward_ms(detector, args.imgsz)
+        results[impl] = counts
+        print(
+            f"{impl:<12s} per_frame mean={times.mean():6.2f}ms p50={np.median(times):6.2f}ms "
+            f"p90={np.percentile(times, 90):6.2f}ms forward={fwd:6.2f}ms "
+            f"overhead={np.median(times) - fwd:6.2f}ms"
+        )
+
+    diff = np.abs(results["fast"] - results["ultralytics"])
+    print(f"count agreement: exact={np.mean(diff == 0):6.1%} max_diff={diff.max()}")
@@ -0,0 +1,116 @@
+"""
+카메라별 프로세스 추론 vs 공유 배치 추론 서버 처리량 비교.
+
+녹화된 영상 파일을 카메라 N대로 재생하며 일정 시간 동안 처리한 프레임 수와
+전체 메모리 사용량(RSS)을 측정한다.
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/bench_inference_layout.py sample.mp4 --cameras 16 --workers 2 --seconds 60
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2 as cv
+import psutil
+
+from inference_server import InferenceServer, InferenceClient
+
+
+def _replay(video_path):
+    """영상 파일을 무한 반복 재생"""
+    cap = cv.VideoCapture(video_path)
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            cap.set(cv.CAP_PROP_POS_FRAMES, 0)
+            continue
+        yield frame
+
+
+def camera_worker(video_path, camera_idx, seconds, counter, infer_queues, ready):
+    if infer_queues is None:
+        from detector import Detector
+
+        detector = Detector()
+    else:
+        detector = InferenceClient(camera_idx, *infer_queues)
+
+    frames = _replay(video_path)
+    detector.track(next(frames))  # 워밍업
+    ready.wait()
+
+    processed = 0
+    end = time.time() + seconds
+    while time.time() < end:
+        detector.track(next(frames))
+        processed += 1
+
+    with counter.get_lock():
+        counter.value += processed
+    if infer_queues is not None:
+        detector.close()
+
+
+def _tree_rss_mb():
+    proc = psutil.Process()
+    total = proc.memory_info().rss
+    for child in proc.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return total / 1024 / 1024
+
+
+def run(layout, video_path, cameras, workers, seconds):
+    counter = multiprocessing.Value("i", 0)
+    ready = multiprocessing.Event()
+    server = None
+    if layout == "server":
+        server = InferenceServer(list(range(cameras)), workers=workers)
+        server.start()
+
+    processes = []
+    for camera_idx in range(cameras):
+        infer_queues = server.queues_for(camera_idx) if server else None
+        p = multiprocessing.Process(
+            target=camera_worker,
+            args=(video_path, camera_idx, seconds, counter, infer_queues, ready),
+        )
+        p.start()
+        processes.append(p)
+
+    time.sleep(5)  # 모델 로드 대기
+    ready.set()
+    time.sleep(seconds / 2)
+    rss = _tree_rss_mb()
+    for p in processes:
+        p.join()
+    if server:
+        server.stop()
+
+    fps = counter.value / seconds
+    print(
+        f"{layout:8s} cameras={cameras:3d} workers={workers if server else cameras:3d} "
+        f"total_fps={fps:8.1f} per_cam_fps={fps / cameras:6.2f} rss={rss:8.0f}MB"
+    )
+    return fps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seconds", type=int, default=30)
+    args = parser.parse_args()
+
+    process_fps = run("process", args.video, args.cameras, args.workers, args.seconds)
+    server_fps = run("server", args.video, args.cameras, args.workers, args.seconds)
+    print(f"speedup (server / process): {server_fps / max(process_fps, 1e-9):.2f}x")
@@ -0,0 +1,85 @@
+"""
+INT8 모델 속도 / 인원 수 정확도 비교.
+
+라벨이 있는 재생 영상(프레임별 실제 인원 수)에서 FP32 모델과 INT8 모델을 돌려
+초당 프레임 수와 인원 수 오차를 비교한다. Secure 모드에서는 사람을 놓치는 것이
+문제이므로 과소 계수(실제보다 적게 센 프레임)와, 사람이 있는데 한 명도
+검출하지 못한 프레임(blind_frames)을 따로 보고한다.
+
+라벨 파일은 "frame,count" 형식의 CSV (frame 은 0부터 시작하는 프레임 번호).
+라벨이 없는 프레임은 평가에서 제외하고, 라벨 파일을 주지 않으면 FP32 결과를 기준으로 삼는다.
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/bench_int8.py replay.mp4 --labels replay.csv --int8 yolo11n_int8.onnx
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from bench_stride_replay import load_frames
+from detector import Detector
+from recognition_config import PERSON_CLASS_ID
+
+
+def load_labels(path):
+    with open(path, newline="") as f:
+        return {int(row["frame"]): int(row["count"]) for row in csv.DictReader(f)}
+
+
+def run(model_path, frames, imgsz):
+    detector = Detector(model_path, imgsz=imgsz)
+    detector.track(frames[0])  # 워밍업
+    detector.reset(0)
+    counts = []
+    start = time.perf_counter()
+    for frame in frames:
+        dets = detector.track(frame)
+        counts.append(int(np.sum(dets[:, 6].astype(int) == PERSON_CLASS_ID)))
+    fps = len(frames) / (time.perf_counter() - start)
+    return np.array(counts), fps
+
+
+def report(name, counts, fps, reference, frames_idx, base_fps=None):
+    pred = counts[frames_idx]
+    diff = pred - reference
+    speedup = f" speedup={fps / base_fps:5.2f}x" if base_fps else ""
+    print(
+        f"{name:<28s} fps={fps:6.1f}{speedup} count_mae={np.abs(diff).mean():.3f} "
+        f"count_exact={np.mean(diff == 0):6.1%} undercount_frames={np.mean(diff < 0):6.1%} "
+        f"missed_persons={int(-diff[diff < 0].sum())} blind_frames={np.mean((pred == 0) & (reference > 0)):6.1%}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--labels", help="frame,count CSV")
+    parser.add_argument("--fp32", default="yolo11n.pt")
+    parser.add_argument("--int8", default="yolo11n_int8.onnx")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--frames", type=int, default=3000)
+    args = parser.parse_args()
+
+    frames, _ = load_frames(args.video, args.frames)
+    fp32_counts, fp32_fps = run(args.fp32, frames, args.imgsz)
+    int8_counts, int8_fps = run(args.int8, frames, args.imgsz)
+
+    if args.labels:
+        labels = load_labels(args.labels)
+        frames_idx = np.array(sorted(i for i in labels if i < len(frames)))
+        reference = np.array([labels[i] for i in frames_idx])
+        print(f"{len(frames)} frames, {len(frames_idx)} labelled")
+    else:
+        frames_idx = np.arange(len(frames))
+        reference = fp32_counts
+        print(f"{len(frames)} frames, no labels: FP32 counts used as reference")
+
+    report(f"fp32 {args.fp32}", fp32_counts, fp32_fps, reference, frames_idx)
+    report(f"int8 {args.int8}", int8_counts, int8_fps, reference, frames_idx, fp32_fps)
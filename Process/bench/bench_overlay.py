@@ -0,0 +1,120 @@
+"""
+오버레이 그리기 시간 비교 (기존 프레임별 putText 방식 vs overlay.OverlayRenderer).
+
+모델 없이 임의의 추적 결과(사람 N 명, 프레임마다 조금씩 이동, stride 프레임마다 갱신)를
+만들어 같은 프레임에 두 방식으로 그리고 프레임당 시간을 비교한다.
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/bench_overlay.py --persons 0 5 20 50 --frames 1000 --size 1920x1080 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2 as cv
+import numpy as np
+
+from overlay import OverlayRenderer
+
+PERSON = 0
+
+
+def draw_overlay_legacy(frame, dets, person_count, person_class_id, person_colors):
+    """기존 ProcessVideo.draw_overlay (비교 기준)"""
+    height = frame.shape[0]
+    for x1, y1, x2, y2, track_id, confidence, current_class in dets:
+        if int(current_class) == person_class_id:
+            x1, y1, x2, y2, track_id = int(x1), int(y1), int(x2), int(y2), int(track_id)
+            if track_id not in person_colors:
+                person_colors[track_id] = (
+                    random.randint(0, 255),
+                    random.randint(0, 255),
+                    random.randint(0, 255),
+                )
+            color = person_colors[track_id]
+            cv.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+            label = f"ID: {track_id} {confidence:.2f}"
+            cv.putText(frame, label, (x1, y1 - 10), cv.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    cv.putText(
+        frame, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), (10, 30),
+        cv.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv.LINE_AA,
+    )
+    cv.putText(
+        frame, f"Persons: {person_count}", (10, height - 10),
+        cv.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2, cv.LINE_AA,
+    )
+    return frame
+
+
+def make_tracks(persons, frames, width, height, stride, seed=0):
+    """프레임별 검출 배열. stride 프레임마다 새 결과, 사이 프레임은 같은 결과를 반복한다."""
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform([0, 0], [width - 100, height - 200], (persons, 2))
+    vel = rng.uniform(-4, 4, (persons, 2))
+    ids = np.arange(1, persons + 1)
+    result = []
+    dets = None
+    for i in range(frames):
+        pos = np.clip(pos + vel, 0, [width - 100, height - 200])
+        if dets is None or i % stride == 0:
+            dets = np.zeros((persons, 7), np.float32)
+            dets[:, 0:2] = pos
+            dets[:, 2:4] = pos + [80, 180]
+            dets[:, 4] = ids
+            dets[:, 5] = rng.uniform(0.3, 0.95, persons)
+            dets[:, 6] = PERSON
+        result.append(dets)
+    return result
+
+
+def bench(name, draw, base, tracks, repeat):
+    """repeat 번 돌려 가장 빠른 값 (프레임 복사 시간 제외)"""
+    frame = base.copy()
+    best = None
+    for _ in range(repeat):
+        copy_start = time.perf_counter()
+        for _ in tracks:
+            frame[:] = base
+        copy_time = time.perf_counter() - copy_start
+        start = time.perf_counter()
+        for dets in tracks:
+            frame[:] = base
+            draw(frame, dets, len(dets))
+        elapsed = max(time.perf_counter() - start - copy_time, 0) / len(tracks)
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {name:<10s} {best * 1000:7.3f}ms/frame")
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--persons", type=int, nargs="+", default=[0, 5, 20, 50])
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--stride", type=int, default=3, help="검출 결과가 바뀌는 프레임 간격")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수 (가장 빠른 값 사용)")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    base = np.random.default_rng(1).integers(0, 255, (height, width, 3), np.uint8)
+
+    for persons in args.persons:
+        tracks = make_tracks(persons, args.frames, width, height, args.stride)
+        print(f"{persons} persons, {width}x{height}, stride {args.stride}")
+        colors = {}
+        legacy = bench(
+            "legacy", lambda f, d, c: draw_overlay_legacy(f, d, c, PERSON, colors),
+            base, tracks, args.repeat,
+        )
+        renderer = OverlayRenderer(PERSON)
+        cached = bench(
+            "renderer", lambda f, d, c: renderer.render(f, d, c, time.time()),
+            base, tracks, args.repeat,
+        )
+        print(f"  speedup    {legacy / max(cached, 1e-9):7.2f}x")
@@ -0,0 +1,69 @@
+"""
+녹화기 인코딩 처리량 비교 (cv.VideoWriter vs ffmpeg 하위 프로세스).
+
+같은 프레임을 녹화기별로 최대 속도로 기록하여 초당 인코딩 프레임 수,
+호출 스레드가 write() 에서 보낸 시간(캡처 스레드를 막는 시간), 파일 크기를 비교한다.
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/bench_recorder.py sample.mp4 --frames 600 --presets ultrafast veryfast --crf 23 28
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2 as cv
+
+from bench_stride_replay import load_frames
+from ffmpeg_writer import FFmpegWriter
+
+
+def run(name, writer, frames, path):
+    write_time = 0.0
+    start = time.perf_counter()
+    for frame in frames:
+        t = time.perf_counter()
+        writer.write(frame)
+        write_time += time.perf_counter() - t
+    writer.release()  # 인코딩 완료까지 포함
+    total = time.perf_counter() - start
+    size = os.path.getsize(path) / 1024 / 1024
+    print(
+        f"{name:<28s} fps={len(frames) / total:7.1f} "
+        f"write_call={write_time / len(frames) * 1000:6.2f}ms/frame size={size:7.2f}MB"
+    )
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--fps", type=float, default=15)
+    parser.add_argument("--fourcc", nargs="+", default=["avc1", "mp4v"])
+    parser.add_argument("--presets", nargs="+", default=["ultrafast", "veryfast", "medium"])
+    parser.add_argument("--crf", type=int, nargs="+", default=[23])
+    args = parser.parse_args()
+
+    frames, _ = load_frames(args.video, args.frames)
+    h, w = frames[0].shape[:2]
+    print(f"{len(frames)} frames {w}x{h}")
+    tmp = tempfile.mkdtemp()
+
+    for fourcc in args.fourcc:
+        path = os.path.join(tmp, f"cv_{fourcc}.mp4")
+        writer = cv.VideoWriter(path, cv.VideoWriter_fourcc(*fourcc), args.fps, (w, h))
+        if not writer.isOpened():
+            print(f"opencv {fourcc:<21s} unavailable")
+            continue
+        run(f"opencv {fourcc}", writer, frames, path)
+
+    for preset in args.presets:
+        for crf in args.crf:
+            path = os.path.join(tmp, f"ffmpeg_{preset}_{crf}.mp4")
+            writer = FFmpegWriter(path, w, h, args.fps, preset=preset, crf=crf, wallclock=False)
+            run(f"ffmpeg {preset} crf={crf}", writer, frames, path)
@@ -0,0 +1,105 @@
+"""
+간격 추론 + 박스 보간의 인원 수 정확도 / 속도 비교 (매 프레임 추론 기준).
+
+녹화 영상을 재생하며 매 프레임 추론한 결과를 기준값으로 두고,
+추론 간격 N 별로 인원 수 오차, 박스 IoU, 추론 시간을 비교한다.
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/bench_stride_replay.py sample.mp4 --strides 2 3 5 --frames 1500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2 as cv
+import numpy as np
+
+from detector import Detector
+from stride import BoxInterpolator, StrideController
+from recognition_config import PERSON_CLASS_ID
+
+
+def load_frames(video_path, limit):
+    cap = cv.VideoCapture(video_path)
+    fps = cap.get(cv.CAP_PROP_FPS) or 30
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames, fps
+
+
+def persons(dets):
+    return dets[dets[:, 6].astype(int) == PERSON_CLASS_ID]
+
+
+def mean_best_iou(reference, predicted):
+    """기준 박스마다 가장 잘 겹치는 예측 박스의 IoU 평균"""
+    if len(reference) == 0:
+        return 1.0 if len(predicted) == 0 else 0.0
+    if len(predicted) == 0:
+        return 0.0
+    a, b = reference[:, None, :4], predicted[None, :, :4]
+    ix = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    iy = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = ix * iy
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    iou = inter / np.maximum(area_a + area_b - inter, 1e-6)
+    return float(iou.max(axis=1).mean())
+
+
+def run(frames, fps, stride, adaptive):
+    detector = Detector()
+    control = StrideController(stride)
+    interpolator = BoxInterpolator()
+    counts, boxes = [], []
+    count = 0
+    inference_time = 0.0
+    inferences = 0
+    for i, frame in enumerate(frames):
+        t = i / fps
+        if control.is_keyframe():
+            start = time.perf_counter()
+            dets = persons(detector.track(frame))
+            inference_time += time.perf_counter() - start
+            inferences += 1
+            count = len(dets)
+            interpolator.update(dets, t)
+            if adaptive:
+                control.adapt(count, interpolator.speed)
+        counts.append(count)
+        boxes.append(interpolator.predict(t))
+    return np.array(counts), boxes, inference_time, inferences
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--strides", type=int, nargs="+", default=[2, 3, 5])
+    parser.add_argument("--frames", type=int, default=1500)
+    parser.add_argument("--fixed", action="store_true", help="인원/속도에 따른 간격 조정 끄기")
+    args = parser.parse_args()
+
+    frames, fps = load_frames(args.video, args.frames)
+    print(f"{len(frames)} frames @ {fps:.1f}fps")
+
+    ref_counts, ref_boxes, ref_time, _ = run(frames, fps, 1, adaptive=False)
+    print(f"stride=1  inference={ref_time:7.2f}s (reference)")
+
+    for stride in args.strides:
+        counts, boxes, t, n = run(frames, fps, stride, adaptive=not args.fixed)
+        error = np.abs(counts - ref_counts)
+        iou = np.mean([mean_best_iou(r, p) for r, p in zip(ref_boxes, boxes)])
+        print(
+            f"stride={stride:<2d} inference={t:7.2f}s speedup={ref_time / max(t, 1e-9):5.2f}x "
+            f"keyframes={n:5d} count_mae={error.mean():.3f} count_exact={np.mean(error == 0):6.1%} "
+            f"max_err={error.max()} box_iou={iou:.3f}"
+        )
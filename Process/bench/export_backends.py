@@ -0,0 +1,83 @@
+"""
+검출 백엔드 내보내기 + 결과 일치 확인 + 속도 비교.
+
+.pt 모델을 ONNX / OpenVINO 로 내보낸 뒤, 샘플 프레임에서 PyTorch 결과와
+사람 수 / 박스 IoU 를 비교하고 백엔드별 초당 프레임 수를 측정한다.
+
+사용법 (Process 디렉터리에서 실행):
+    python bench/export_backends.py sample.mp4 --model yolo11n.pt --backends onnx openvino
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backends import BACKENDS, export_model
+from bench_stride_replay import load_frames, mean_best_iou
+from detector import Detector
+from recognition_config import PERSON_CLASS_ID
+
+
+def detect_all(detector, frames, imgsz):
+    """프레임별 사람 박스 (추적기 없이 검출만 비교)"""
+    boxes = []
+    for frame in frames:
+        result = detector.model.predict(frame, **detector.predict_args(imgsz=imgsz))[0]
+        det = result.boxes.cpu().numpy()
+        boxes.append(det.xyxy[det.cls.astype(int) == PERSON_CLASS_ID])
+    return boxes
+
+
+def measure_fps(detector, frames, imgsz, warmup=5):
+    for frame in frames[:warmup]:
+        detector.track(frame)
+    start = time.perf_counter()
+    for frame in frames:
+        detector.track(frame)
+    return len(frames) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--model", default="yolo11n.pt")
+    parser.add_argument("--backends", nargs="+", default=["onnx", "openvino"])
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--min-iou", type=float, default=0.95, help="일치 판정 기준 평균 IoU")
+    args = parser.parse_args()
+
+    frames, _ = load_frames(args.video, args.frames)
+    print(f"{len(frames)} frames, imgsz={args.imgsz}")
+
+    reference = Detector(args.model, backend="torch", imgsz=args.imgsz)
+    ref_boxes = detect_all(reference, frames, args.imgsz)
+    ref_fps = measure_fps(reference, frames, args.imgsz)
+    print(f"{'torch':<9s} fps={ref_fps:6.1f} (reference)")
+
+    failed = False
+    for backend in args.backends:
+        if BACKENDS.get(backend) is None:
+            print(f"{backend}: skipped (not an export backend)")
+            continue
+        path = export_model(args.model, backend, imgsz=args.imgsz)
+        detector = Detector(path, backend=backend, imgsz=args.imgsz)
+        boxes = detect_all(detector, frames, args.imgsz)
+
+        count_error = np.array([abs(len(a) - len(b)) for a, b in zip(ref_boxes, boxes)])
+        iou = np.mean([mean_best_iou(a, b) for a, b in zip(ref_boxes, boxes)])
+        fps = measure_fps(detector, frames, args.imgsz)
+        ok = count_error.max() == 0 and iou >= args.min_iou
+        failed |= not ok
+        print(
+            f"{backend:<9s} fps={fps:6.1f} speedup={fps / ref_fps:5.2f}x "
+            f"count_exact={np.mean(count_error == 0):6.1%} max_err={count_error.max()} "
+            f"box_iou={iou:.3f} parity={'OK' if ok else 'MISMATCH'} ({path})"
+        )
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,138 @@
+from collections import deque
+
+import numpy as np
+
+from recognition_config import COUNT_HIST_SIZE, COUNT_ID_BITS, THRESHOLD_WINDOW
+
+
+class CountStats:
+    """
+    로그 주기 동안의 인원 수 통계 (고정 메모리).
+
+    - 인원 수는 다음 관측까지 유지된 시간으로 가중한 히스토그램에 누적한다.
+      움직임 필터 / 목표 fps 로 추론 간격이 들쭉날쭉해도 평균 / p95 가 시간 기준으로 맞는다.
+    - 구간에 나타난 추적 ID 수는 고정 크기 비트맵의 선형 계수(linear counting)로 추정한다.
+      ID 가 비트맵 크기보다 충분히 적으면 정확한 값과 같다.
+    """
+
+    def __init__(self, hist_size=COUNT_HIST_SIZE, id_bits=COUNT_ID_BITS):
+        self.hist = np.zeros(hist_size, np.float64)  # 인원 수별 누적 시간(초)
+        self.ids = np.zeros(id_bits, bool)
+        self.last_count = 0
+        self.reset(None)
+
+    def reset(self, now):
+        """새 구간 시작. 직전 관측값은 새 구간으로 이어진다."""
+        self.hist[:] = 0
+        self.ids[:] = False
+        self.max = self.last_count
+        self.samples = 0
+        self.start = now
+        self.last_time = now
+
+    def _accumulate(self, now):
+        if self.last_time is not None and now > self.last_time:
+            self.hist[min(self.last_count, len(self.hist) - 1)] += now - self.last_time
+        self.last_time = now
+
+    def observe(self, now, count, track_ids=None):
+        """추론 1회 결과. track_ids 는 추적 ID 배열 (사람만)"""
+        if self.start is None:
+            self.start = now
+        self._accumulate(now)
+        self.last_count = count
+        self.max = max(self.max, count)
+        self.samples += 1
+        if track_ids is not None and len(track_ids):
+            self.ids[np.asarray(track_ids, np.int64) % len(self.ids)] = True
+
+    def distinct_ids(self):
+        m = len(self.ids)
+        zeros = m - int(self.ids.sum())
+        if zeros == 0:
+            return m  # 비트맵 포화 (하한값)
+        return int(round(-m * np.log(zeros / m)))
+
+    def summary(self, now):
+        """구간 통계 dict (max, mean, p95, ids, samples, seconds)"""
+        self._accumulate(now)
+        total = self.hist.sum()
+        if total > 0:
+            counts = np.arange(len(self.hist))
+            mean = float((counts * self.hist).sum() / total)
+            p95 = int(np.searchsorted(np.cumsum(self.hist), 0.95 * total))
+        else:
+            mean, p95 = float(self.last_count), self.last_count
+        return {
+            "max": self.max,
+            "mean": round(mean, 2),
+            "p95": p95,
+            "ids": self.distinct_ids(),
+            "samples": self.samples,
+            "seconds": round(now - self.start, 1) if self.start is not None else 0.0,
+        }
+
+
+def rule_threshold(rule):
+    """모드 규칙의 카메라 1대 기준 인원 제한 (이 값을 넘으면 경보). 해당 없으면 None"""
+    if rule.get("mode_type") == "Secure":
+        return 0
+    if rule.get("mode_type") == "Running" and rule.get("people_cnt") is not None:
+        return int(rule["people_cnt"])
+    return None
+
+
+class ThresholdMonitor:
+    """
+    main 이 내려보낸 모드 규칙 기준 즉시 경보 판단.
+
+    규칙마다 최근 window 회 추론 인원 수의 중앙값을 제한과 비교하고, 어느 규칙이든 넘거나
+    모두 다시 내려오는 순간에만 update() 가 새 상태(True / False)를 돌려준다.
+    한 프레임짜리 오검출로는 경보하지 않는다.
+    구역(zone_id)이 지정된 규칙은 이 카메라에 그 구역이 있을 때만 구역 인원 수로 판단한다.
+    Running 모드는 전체 인원 제한이므로 카메라 1대가 제한을 넘는 경우만 여기서 잡고,
+    여러 카메라 합계는 main 의 주기 로그 처리에서 판단한다.
+    """
+
+    def __init__(self, window=THRESHOLD_WINDOW):
+        self.window = window
+        self.rules = []  # [rule, threshold, 최근 인원 수 deque]
+        self.rule = None  # 마지막 상태 변화를 일으킨 규칙
+        self.threshold = None
+        self.over = False
+        self.smoothed = 0
+
+    def set_rules(self, rules, zone_ids=()):
+        """이 카메라에 해당하는 규칙만 적용한다. 규칙이 바뀌면 상태를 초기화한다."""
+        self.rules = []
+        for rule in rules:
+            threshold = rule_threshold(rule)
+            zone_id = rule.get("zone_id")
+            if threshold is None or (zone_id and zone_id not in zone_ids):
+                continue
+            self.rules.append([rule, threshold, deque(maxlen=self.window)])
+        self.rule, self.threshold = None, None
+        self.over = False
+
+    def update(self, count, zone_counts=None):
+        """count: 화면 전체 인원 수, zone_counts: 구역별 인원 수 {zone_id: count}"""
+        if not self.rules:
+            return None
+        triggered = None
+        for entry in self.rules:
+            rule, threshold, counts = entry
+            zone_id = rule.get("zone_id")
+            counts.append((zone_counts or {}).get(zone_id, 0) if zone_id else count)
+            smoothed = int(np.median(counts))
+            if len(counts) == counts.maxlen and smoothed > threshold and triggered is None:
+                triggered = (rule, threshold, smoothed)
+        over = triggered is not None
+        if over == self.over:
+            return None
+        self.over = over
+        if over:
+            self.rule, self.threshold, self.smoothed = triggered
+        else:
+            counts = next(e[2] for e in self.rules if e[0] is self.rule) if self.rule else ()
+            self.smoothed = int(np.median(counts)) if len(counts) else 0
+        return over
@@ -0,0 +1,75 @@
+import logging
+import os
+
+import cv2 as cv
+import psutil
+
+from recognition_config import CPU_RESERVE_CORES, CPU_THREADS_PER_WORKER, CPU_PIN_WORKERS
+
+# 라이브러리가 로드될 때 스레드 풀 크기로 읽는 환경 변수 (torch 의 OpenMP, numpy 의 BLAS 등)
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def usable_cores():
+    """이 프로세스가 쓸 수 있는 논리 코어 번호 목록"""
+    try:
+        return sorted(psutil.Process().cpu_affinity())
+    except (AttributeError, psutil.Error):  # cpu_affinity 를 지원하지 않는 OS
+        return list(range(os.cpu_count() or 1))
+
+
+def plan_cpu_budget(
+    workers,
+    cores=None,
+    reserve=CPU_RESERVE_CORES,
+    threads=CPU_THREADS_PER_WORKER,
+    pin=CPU_PIN_WORKERS,
+):
+    """
+    모델을 돌리는 워커 프로세스 workers 개에 코어를 나눈다.
+
+    워커마다 torch / OpenCV 가 전체 코어 수만큼 스레드를 만들면 카메라 N대에서
+    N x 코어 수의 스레드가 경쟁하므로, 앞쪽 reserve 개 코어는 main 과 캡처 / 인코딩 스레드 몫으로 남기고
+    나머지를 워커 수로 나눈 만큼만 쓰게 한다 (threads 를 지정하면 그 값).
+    pin 이면 워커마다 연속된 코어 묶음을 배정한다 (워커가 코어보다 많으면 돌아가며 공유).
+    반환: [{"threads": n, "cores": [코어 번호, ...] 또는 None}, ...] (워커 순서)
+    """
+    cores = list(cores) if cores is not None else usable_cores()
+    usable = cores[reserve:] or cores
+    per_worker = threads or max(1, len(usable) // max(workers, 1))
+    plan = []
+    for worker_idx in range(workers):
+        pinned = None
+        if pin:
+            start = worker_idx * per_worker
+            pinned = sorted({usable[(start + k) % len(usable)] for k in range(per_worker)})
+        plan.append({"threads": per_worker, "cores": pinned})
+    return plan
+
+
+def apply_cpu_budget(budget, label, torch_threads=True):
+    """
+    워커 프로세스 안에서 모델을 로드하기 전에 호출한다.
+    torch_threads 가 거짓이면 (모델을 로드하지 않는 프로세스) torch 를 불러오지 않는다.
+    """
+    threads = budget["threads"]
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    cv.setNumThreads(threads)
+    if torch_threads:
+        import torch
+
+        torch.set_num_threads(threads)
+    if budget.get("cores"):
+        try:
+            psutil.Process().cpu_affinity(budget["cores"])
+        except (AttributeError, psutil.Error, ValueError) as e:
+            logging.warning(f"[{label}] Failed to pin to cores {budget['cores']}: {e}")
+    logging.info(
+        f"[{label}] CPU budget: threads={threads}, cores={budget.get('cores') or 'all'}"
+    )
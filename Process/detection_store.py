@@ -0,0 +1,241 @@
+"""
+카메라별 / 날짜별 검출 결과 저장소 (추가 전용, 메모리 맵 열 구조).
+
+추론할 때마다 검출 결과를 고정 길이 레코드로 파일 끝에 붙이고, 조회는 np.memmap 으로 연다.
+영상을 디코딩하지 않고 "14:03:22 에 화면에 누가 있었나", "5명 이상이 있었던 프레임" 같은 질문을
+시간 인덱스 이진 탐색과 numpy 마스크로 답한다.
+인식 모듈(플랫 import)과 Flask 앱(Process.detection_store) 양쪽에서 쓰도록 설정 모듈에 의존하지 않는다.
+
+파일 배치: <folder>/cam_<id>/<YYYY-MM-DD>.det  검출 1건당 1행 (DET_DTYPE)
+           <folder>/cam_<id>/<YYYY-MM-DD>.idx  추론 프레임당 1행 (FRAME_DTYPE, 시간순 = 시간 인덱스)
+프레임 행은 검출 행을 먼저 기록한 뒤 기록하므로, 읽는 쪽은 항상 완성된 검출 행만 가리킨다.
+
+사용법 (Process 디렉터리에서 실행):
+    python detection_store.py 1 2026-10-18 --at 14:03:22
+    python detection_store.py 1 2026-10-18 --min-persons 5
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+DET_DTYPE = np.dtype(
+    [
+        ("t", "<f8"),  # 캡처 시각 (epoch 초)
+        ("track_id", "<i4"),
+        ("cls", "<i2"),
+        ("x1", "<f4"),
+        ("y1", "<f4"),
+        ("x2", "<f4"),
+        ("y2", "<f4"),
+        ("conf", "<f4"),
+    ]
+)
+FRAME_DTYPE = np.dtype(
+    [
+        ("t", "<f8"),
+        ("start", "<i8"),  # .det 파일의 첫 검출 행 번호
+        ("count", "<i4"),  # 검출 수
+        ("persons", "<i4"),  # 사람 수
+    ]
+)
+FLUSH_INTERVAL = 2.0  # 초
+
+
+def store_dir(folder, camera_id):
+    return Path(folder) / f"cam_{camera_id}"
+
+
+def day_paths(folder, camera_id, day):
+    base = store_dir(folder, camera_id) / day.strftime("%Y-%m-%d")
+    return base.with_suffix(".det"), base.with_suffix(".idx")
+
+
+def purge_old(folder, camera_id, retention_days, today=None):
+    """retention_days 보다 오래된 날짜 파일 삭제. 삭제한 파일 수 반환"""
+    today = today or datetime.now().date()
+    oldest = today - timedelta(days=retention_days)
+    removed = 0
+    directory = store_dir(folder, camera_id)
+    if not directory.is_dir():
+        return 0
+    for path in directory.iterdir():
+        if path.suffix not in (".det", ".idx"):
+            continue
+        try:
+            day = datetime.strptime(path.stem, "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        if day < oldest:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                logging.error(f"Failed to remove old detection file {path}: {e}")
+    return removed
+
+
+class DetectionStoreWriter:
+    """
+    카메라 1대의 검출 결과 기록. append(frame_time, dets) 를 추론할 때마다 호출한다.
+    날짜가 바뀌면 새 파일로 넘어가고, retention_days 가 지난 파일을 지운다.
+    """
+
+    def __init__(self, folder, camera_id, person_class_id, retention_days=30):
+        self.folder = folder
+        self.camera_id = camera_id
+        self.person_class_id = person_class_id
+        self.retention_days = retention_days
+        os.makedirs(store_dir(folder, camera_id), exist_ok=True)
+        self.day = None
+        self._det_file = None
+        self._idx_file = None
+        self._rows = 0
+        self._last_flush = time.time()
+
+    def _rotate(self, day):
+        self.close()
+        det_path, idx_path = day_paths(self.folder, self.camera_id, day)
+        self._det_file = open(det_path, "ab")
+        self._idx_file = open(idx_path, "ab")
+        # 비정상 종료로 끝부분이 잘린 레코드는 건너뛰고 다음 행 번호부터 기록
+        self._rows = det_path.stat().st_size // DET_DTYPE.itemsize
+        self._det_file.truncate(self._rows * DET_DTYPE.itemsize)
+        self._idx_file.truncate(
+            idx_path.stat().st_size // FRAME_DTYPE.itemsize * FRAME_DTYPE.itemsize
+        )
+        self.day = day
+        if self.retention_days:
+            removed = purge_old(self.folder, self.camera_id, self.retention_days, day)
+            if removed:
+                logging.info(
+                    f"[Cam {self.camera_id}] Removed {removed} detection store files older than {self.retention_days} days."
+                )
+
+    def append(self, frame_time, dets):
+        """검출 배열 (N x 7: x1, y1, x2, y2, track_id, conf, cls) 1프레임 기록"""
+        day = datetime.fromtimestamp(frame_time).date()
+        if day != self.day:
+            self._rotate(day)
+
+        n = len(dets)
+        classes = dets[:, 6].astype(np.int16)
+        if n:
+            rows = np.empty(n, DET_DTYPE)
+            rows["t"] = frame_time
+            rows["track_id"] = dets[:, 4]
+            rows["cls"] = classes
+            for i, name in enumerate(("x1", "y1", "x2", "y2")):
+                rows[name] = dets[:, i]
+            rows["conf"] = dets[:, 5]
+            self._det_file.write(rows.tobytes())
+
+        frame = np.empty(1, FRAME_DTYPE)
+        frame["t"] = frame_time
+        frame["start"] = self._rows
+        frame["count"] = n
+        frame["persons"] = (
+            int((classes == self.person_class_id).sum()) if self.person_class_id is not None else 0
+        )
+        self._idx_file.write(frame.tobytes())
+        self._rows += n
+
+        if time.time() - self._last_flush >= FLUSH_INTERVAL:
+            self._det_file.flush()  # 프레임 행보다 검출 행을 먼저 내보낸다
+            self._idx_file.flush()
+            self._last_flush = time.time()
+
+    def close(self):
+        for f in (self._det_file, self._idx_file):
+            if f is not None and not f.closed:
+                f.close()
+
+
+def _memmap(path, dtype):
+    if not path.exists():
+        return np.zeros(0, dtype)
+    count = path.stat().st_size // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class DetectionDay:
+    """
+    하루치 검출 결과 조회 (읽기 전용 메모리 맵).
+    frames 는 시간순 프레임 행, detections 는 검출 행 배열이다.
+    """
+
+    def __init__(self, folder, camera_id, day):
+        det_path, idx_path = day_paths(folder, camera_id, day)
+        self.detections = _memmap(det_path, DET_DTYPE)
+        frames = _memmap(idx_path, FRAME_DTYPE)
+        # 검출 파일보다 먼저 디스크에 내려간 프레임 행은 제외
+        complete = frames["start"] + frames["count"] <= len(self.detections)
+        self.frames = frames if complete.all() else frames[complete]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame_detections(self, i):
+        """i 번째 프레임의 검출 행"""
+        frame = self.frames[i]
+        start = int(frame["start"])
+        return self.detections[start : start + int(frame["count"])]
+
+    def at(self, t, tolerance=1.0):
+        """시각 t 에 화면에 있던 검출 (t 이전 마지막 추론 프레임, tolerance 초 이내)"""
+        i = int(np.searchsorted(self.frames["t"], t, side="right")) - 1
+        if i < 0 or t - self.frames["t"][i] > tolerance:
+            return np.zeros(0, DET_DTYPE)
+        return self.frame_detections(i)
+
+    def between(self, t0, t1):
+        """t0 <= t < t1 구간의 프레임 행"""
+        times = self.frames["t"]
+        return self.frames[np.searchsorted(times, t0) : np.searchsorted(times, t1)]
+
+    def frames_with(self, min_persons):
+        """사람이 min_persons 명 이상인 프레임 행"""
+        return self.frames[self.frames["persons"] >= min_persons]
+
+    def track_ids(self, t0, t1):
+        """t0 <= t < t1 구간에 나타난 추적 ID"""
+        frames = self.between(t0, t1)
+        if not len(frames):
+            return np.zeros(0, np.int32)
+        start = int(frames["start"][0])
+        end = int(frames["start"][-1] + frames["count"][-1])
+        return np.unique(self.detections["track_id"][start:end])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("camera_id", type=int)
+    parser.add_argument("day", help="YYYY-MM-DD")
+    parser.add_argument("--folder", default=str(Path(__file__).parent.parent / "dt_store"))
+    parser.add_argument("--at", help="HH:MM:SS 시각에 화면에 있던 검출")
+    parser.add_argument("--min-persons", type=int, help="사람 수가 N 명 이상인 프레임")
+    args = parser.parse_args()
+
+    day = datetime.strptime(args.day, "%Y-%m-%d").date()
+    store = DetectionDay(args.folder, args.camera_id, day)
+    print(f"{len(store)} frames, {len(store.detections)} detections")
+    if args.at:
+        t = datetime.combine(day, datetime.strptime(args.at, "%H:%M:%S").time()).timestamp()
+        for row in store.at(t):
+            print(
+                f"  id={row['track_id']} cls={row['cls']} conf={row['conf']:.2f} "
+                f"box=({row['x1']:.0f}, {row['y1']:.0f}, {row['x2']:.0f}, {row['y2']:.0f})"
+            )
+    if args.min_persons is not None:
+        frames = store.frames_with(args.min_persons)
+        print(f"{len(frames)} frames with >= {args.min_persons} persons")
+        for frame in frames[:50]:
+            print(f"  {datetime.fromtimestamp(frame['t']):%H:%M:%S.%f} persons={frame['persons']}")
@@ -0,0 +1,5 @@
+import numpy as np
+
+# 검출 결과 배열 컬럼 (N x 7, float32): x1, y1, x2, y2, track_id, conf, cls
+DET_COLUMNS = 7
+EMPTY_DETECTIONS = np.zeros((0, DET_COLUMNS), dtype=np.float32)
@@ -0,0 +1,147 @@
+import logging
+
+import numpy as np
+from ultralytics import YOLO
+from ultralytics.trackers.track import TRACKER_MAP
+from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
+
+from detections import DET_COLUMNS, EMPTY_DETECTIONS
+from backends import resolve_model
+from recognition_config import (
+    MODEL_PATH,
+    DETECT_CONF,
+    TRACKER_CONFIG,
+    DETECT_BACKEND,
+    DETECTOR_IMPL,
+)
+
+
+def new_tracker(tracker_config=TRACKER_CONFIG, frame_rate=30):
+    """ultralytics model.track 과 같은 설정으로 추적기 생성"""
+    cfg = IterableSimpleNamespace(**yaml_load(check_yaml(tracker_config)))
+    return TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=frame_rate)
+
+
+def create_detector(impl=DETECTOR_IMPL, **kwargs):
+    """설정된 구현으로 검출기 생성. "fast" 는 PyTorch 모델에서만 사용 가능하다."""
+    if impl == "fast":
+        from fast_detector import FastDetector
+
+        try:
+            return FastDetector(**kwargs)
+        except ValueError as e:
+            logging.warning(f"{e}. Using ultralytics predictor instead.")
+            # 이미 불러온 모델을 그대로 사용 (다시 로드하지 않는다)
+            return Detector(model=getattr(e, "model", None), **kwargs)
+    return Detector(**kwargs)
+
+
+class Detector:
+    """
+    YOLO 검출 + 카메라별 추적기 상태 관리.
+
+    모델은 하나만 로드하고, 추적기는 카메라 ID마다 따로 유지하므로
+    여러 카메라의 프레임을 한 번의 배치 추론으로 처리할 수 있다.
+    backend 에 따라 같은 모델을 PyTorch / ONNX Runtime / OpenVINO 로 실행하며,
+    추적과 후처리는 백엔드와 무관하게 동일하다.
+    """
+
+    def __init__(
+        self,
+        model_path=MODEL_PATH,
+        conf=DETECT_CONF,
+        imgsz=None,
+        classes=None,
+        tracker_config=TRACKER_CONFIG,
+        backend=DETECT_BACKEND,
+        model=None,
+    ):
+        # model: 이미 불러온 모델 (없으면 model_path 에서 불러온다)
+        self.backend = backend
+        self.model = model if model is not None else self._load(model_path)
+        self.model_path = model_path
+        self.conf = conf
+        self.imgsz = imgsz
+        self.classes = classes
+        self.tracker_config = tracker_config
+        self.trackers = {}
+
+    def _load(self, model_path):
+        path = resolve_model(model_path, self.backend)
+        logging.info(f"Loading detector model {path} ({self.backend})")
+        return YOLO(path, task="detect")
+
+    @property
+    def names(self):
+        return self.model.names
+
+    def class_id(self, name):
+        for k, v in self.model.names.items():
+            if v == name:
+                return k
+        return None
+
+    def load_model(self, model_path):
+        """configure(model=...) 에 넘길 모델을 미리 불러온다 (다른 스레드에서 호출 가능)"""
+        return self._load(model_path)
+
+    def configure(self, model_path=None, imgsz=None, model=None):
+        """
+        모델 / 입력 크기 변경. 모델이 바뀌면 추적기 상태는 초기화된다.
+        model 은 load_model 로 미리 불러온 모델 (없으면 여기서 불러온다)
+        """
+        if model_path and model_path != self.model_path:
+            self.model = model if model is not None else self._load(model_path)
+            self.model_path = model_path
+            self.trackers.clear()
+        self.imgsz = imgsz
+
+    def track(self, frame, camera_idx=0):
+        """단일 프레임 추적. 결과는 검출 배열 (N x DET_COLUMNS)"""
+        return self.track_batch([camera_idx], [frame])[0]
+
+    def predict_args(self, conf=None, imgsz=None, classes=None):
+        """model.predict 인자. 지정하지 않은 값은 생성 시 설정을 사용한다."""
+        args = {"conf": self.conf if conf is None else conf, "verbose": False}
+        imgsz = imgsz or self.imgsz
+        if imgsz:
+            args["imgsz"] = imgsz
+        classes = self.classes if classes is None else classes
+        if classes is not None:
+            args["classes"] = list(classes)  # 클래스 필터는 모델(NMS) 단계에서 적용
+        return args
+
+    def track_batch(self, camera_ids, frames, conf=None, imgsz=None, classes=None):
+        """여러 카메라의 프레임을 한 번에 추론하고, 카메라별 추적기로 ID를 부여한다."""
+        results = self.model.predict(
+            frames, **self.predict_args(conf, imgsz, classes)
+        )
+        return [
+            self._update_tracker(camera_idx, result)
+            for camera_idx, result in zip(camera_ids, results)
+        ]
+
+    def reset(self, camera_idx):
+        """카메라 재연결 시 추적기 상태 초기화"""
+        self.trackers.pop(camera_idx, None)
+
+    def _tracker(self, camera_idx):
+        tracker = self.trackers.get(camera_idx)
+        if tracker is None:
+            tracker = self.trackers[camera_idx] = new_tracker(self.tracker_config)
+            logging.info(f"[Cam {camera_idx}] Tracker created.")
+        return tracker
+
+    def _update_tracker(self, camera_idx, result):
+        tracker = self._tracker(camera_idx)
+
+        # model.track(persist=True) 의 후처리와 동일: 검출이 없으면 추적기를 갱신하지 않는다
+        det = result.boxes.cpu().numpy()
+        if len(det) == 0:
+            return EMPTY_DETECTIONS
+        tracks = tracker.update(det, result.orig_img)
+        if len(tracks) == 0:
+            return EMPTY_DETECTIONS
+        # tracks: x1, y1, x2, y2, track_id, conf, cls, idx
+        return tracks[:, :DET_COLUMNS].astype(np.float32)
@@ -0,0 +1,141 @@
+import logging
+
+import cv2 as cv
+import numpy as np
+import torch
+import torchvision
+from ultralytics.engine.results import Boxes
+
+from detector import Detector
+from detections import EMPTY_DETECTIONS, DET_COLUMNS
+from recognition_config import (
+    PERSON_CLASS_ID,
+    FAST_IMGSZ,
+    FAST_IOU,
+    FAST_MAX_DET,
+    FAST_THREADS,
+)
+
+
+class FastPathUnsupported(ValueError):
+    """경량 경로를 쓸 수 없는 모델. 호출 쪽이 다시 불러오지 않도록 불러온 모델을 담는다."""
+
+    def __init__(self, message, model):
+        super().__init__(message)
+        self.model = model
+
+
+class FastDetector(Detector):
+    """
+    단일 클래스 / 단일 프레임 전용 경량 추론 경로. Detector 와 같은 인터페이스.
+
+    ultralytics predictor 를 거치지 않고 PyTorch 모듈을 직접 호출한다.
+    - letterbox / 색 변환 / 입력 텐서 버퍼를 미리 할당해 재사용
+    - torch.inference_mode 에서 실행
+    - 한 클래스의 점수만 보고 NMS 후 결과를 미리 할당한 numpy 배열에 바로 기록
+    추적기 갱신과 결과 배열 형식은 Detector 와 동일하다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if FAST_THREADS:
+            torch.set_num_threads(FAST_THREADS)
+        self._boxes = np.empty((FAST_MAX_DET, 6), np.float32)  # x1, y1, x2, y2, conf, cls
+        self._prepare()
+
+    def _prepare(self):
+        """모델 / 입력 크기가 바뀔 때마다 네트워크와 버퍼 준비"""
+        net = self.model.model
+        if not isinstance(net, torch.nn.Module):
+            raise FastPathUnsupported(
+                f"FastDetector requires a PyTorch model: {self.model_path}", self.model
+            )
+        self.net = net.fuse(verbose=False).eval() if hasattr(net, "fuse") else net.eval()
+        stride = int(max(self.net.stride)) if hasattr(self.net, "stride") else 32
+        size = self.imgsz or FAST_IMGSZ
+        self.size = max(stride, size // stride * stride)
+        self._canvas = np.full((self.size, self.size, 3), 114, np.uint8)
+        self._rgb = np.empty_like(self._canvas)
+        self._input = torch.empty((1, 3, self.size, self.size), dtype=torch.float32)
+        self._resized = {}  # (w, h) -> 리사이즈 버퍼
+        self._letterbox = None  # (원본 크기, 비율, 여백)
+        logging.info(f"FastDetector ready: imgsz={self.size}, threads={torch.get_num_threads()}")
+
+    def configure(self, model_path=None, imgsz=None, model=None):
+        old = (self.model_path, self.imgsz)
+        super().configure(model_path, imgsz, model)
+        if (self.model_path, self.imgsz) != old:
+            self._prepare()
+
+    def _target_class(self, classes):
+        classes = self.classes if classes is None else classes
+        return int(classes[0]) if classes else PERSON_CLASS_ID
+
+    def _fill_input(self, frame):
+        """letterbox 결과를 미리 할당한 입력 텐서에 기록"""
+        h, w = frame.shape[:2]
+        if self._letterbox is None or self._letterbox[0] != (h, w):
+            r = min(self.size / h, self.size / w)
+            nw, nh = round(w * r), round(h * r)
+            left, top = (self.size - nw) // 2, (self.size - nh) // 2
+            self._canvas.fill(114)
+            self._letterbox = ((h, w), r, (left, top), (nw, nh))
+            self._resized[(nw, nh)] = np.empty((nh, nw, 3), np.uint8)
+        _, r, (left, top), (nw, nh) = self._letterbox
+
+        resized = self._resized[(nw, nh)]
+        cv.resize(frame, (nw, nh), dst=resized, interpolation=cv.INTER_LINEAR)
+        self._canvas[top : top + nh, left : left + nw] = resized
+        cv.cvtColor(self._canvas, cv.COLOR_BGR2RGB, dst=self._rgb)
+        self._input[0].copy_(torch.from_numpy(self._rgb).permute(2, 0, 1))
+        self._input.mul_(1 / 255.0)
+
+    def _detect(self, frame, conf, cls_id):
+        """단일 프레임 검출 -> self._boxes 앞쪽 n 행"""
+        self._fill_input(frame)
+        with torch.inference_mode():
+            preds = self.net(self._input)
+            preds = preds[0] if isinstance(preds, (tuple, list)) else preds
+            # preds: 1 x (4 + nc) x anchors, 박스는 입력 이미지 기준 cx, cy, w, h
+            scores = preds[0, 4 + cls_id]
+            keep = scores > conf
+            if not keep.any():
+                return 0
+            scores = scores[keep]
+            xywh = preds[0, :4, keep].T
+            xyxy = torch.cat((xywh[:, :2] - xywh[:, 2:] / 2, xywh[:, :2] + xywh[:, 2:] / 2), 1)
+            idx = torchvision.ops.nms(xyxy, scores, FAST_IOU)[:FAST_MAX_DET]
+            n = len(idx)
+            out = self._boxes[:n]
+            out[:, :4] = xyxy[idx].numpy()
+            out[:, 4] = scores[idx].numpy()
+        out[:, 5] = cls_id
+
+        # 입력 좌표 -> 원본 프레임 좌표
+        (h, w), r, (left, top), _ = self._letterbox
+        out[:, 0:4:2] -= left
+        out[:, 1:4:2] -= top
+        out[:, :4] /= r
+        np.clip(out[:, 0:4:2], 0, w, out=out[:, 0:4:2])
+        np.clip(out[:, 1:4:2], 0, h, out=out[:, 1:4:2])
+        return n
+
+    def track_batch(self, camera_ids, frames, conf=None, imgsz=None, classes=None):
+        if imgsz and imgsz != self.imgsz:
+            self.configure(imgsz=imgsz)
+        conf = self.conf if conf is None else conf
+        cls_id = self._target_class(classes)
+        results = []
+        for camera_idx, frame in zip(camera_ids, frames):
+            n = self._detect(frame, conf, cls_id)
+            results.append(self._track(camera_idx, frame, n))
+        return results
+
+    def _track(self, camera_idx, frame, n):
+        tracker = self._tracker(camera_idx)
+        if n == 0:
+            return EMPTY_DETECTIONS
+        tracks = tracker.update(Boxes(self._boxes[:n], frame.shape[:2]), frame)
+        if len(tracks) == 0:
+            return EMPTY_DETECTIONS
+        return tracks[:, :DET_COLUMNS].astype(np.float32)
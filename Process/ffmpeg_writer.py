@@ -0,0 +1,202 @@
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+
+import numpy as np
+
+# 조각(fragmented) MP4: 녹화 도중 프로세스가 죽어도 이미 기록된 부분은 재생 가능
+FRAGMENTED_MP4 = "+frag_keyframe+empty_moov+default_base_moof"
+MAX_GAP_SECONDS = 10  # 이보다 긴 공백은 복제로 채우지 않는다
+
+
+def segment_args(segment_seconds, align_to_clock):
+    """segment muxer 옵션. 완료된 세그먼트는 stdout 으로 csv 목록을 받는다."""
+    args = [
+        "-f", "segment",
+        "-segment_time", str(segment_seconds),
+        "-segment_format", "mp4",
+        "-segment_format_options", f"movflags={FRAGMENTED_MP4}",
+        "-reset_timestamps", "1",
+        "-strftime", "1",
+        "-segment_list", "pipe:1",
+        "-segment_list_type", "csv",
+    ]
+    if align_to_clock:
+        args += ["-segment_atclocktime", "1"]  # 자정 기준 segment_seconds 배수 시각에 전환
+    return args
+
+
+class _SegmentList:
+    """ffmpeg segment_list (csv: 파일명,시작,끝) 에서 완료된 세그먼트 수집"""
+
+    def _start_segment_reader(self):
+        self._finished = queue.Queue()
+        self._reader = threading.Thread(target=self._read_segments, daemon=True)
+        self._reader.start()
+
+    def _read_segments(self):
+        directory = os.path.dirname(self.path)
+        for line in self.proc.stdout:
+            name = line.decode(errors="replace").strip().split(",")[0]
+            if name:
+                self._finished.put(os.path.join(directory, name))
+
+    def pop_finished(self):
+        """완료된 세그먼트 파일 경로 목록 (완료 순서)"""
+        paths = []
+        while True:
+            try:
+                paths.append(self._finished.get_nowait())
+            except queue.Empty:
+                return paths
+
+    def isOpened(self):
+        return self.proc.poll() is None
+
+    def _wait(self, timeout):
+        try:
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            logging.error(f"ffmpeg did not finish in {timeout}s, killing: {self.path}")
+            self.proc.kill()
+            self.proc.wait()
+        if self._reader is not None:
+            self._reader.join(timeout=5)
+
+
+class FFmpegWriter(_SegmentList):
+    """
+    ffmpeg 하위 프로세스 녹화기. cv.VideoWriter 와 같은 write / release / isOpened 인터페이스.
+
+    BGR 원본 프레임을 파이프로 넘기고 인코딩은 ffmpeg 프로세스에서 처리한다.
+    타임스탬프는 두 가지 방식 중 하나로 맞춘다.
+    - wallclock=True: 프레임이 파이프에 들어온 실제 시각 (실시간으로 쓰는 경우)
+    - wallclock=False: write(frame, frame_time) 의 캡처 시각 기준으로 fps 에 맞춰
+      프레임을 복제 / 생략한다 (프리롤처럼 몰아서 쓰는 경우)
+    어느 쪽이든 카메라 fps 가 틀리거나 프레임이 빠져도 재생 시간은 실제와 같다.
+
+    segment_seconds 를 주면 path 는 strftime 패턴(예: "cam1_%Y%m%d_%H%M%S.mp4")이며,
+    파이프를 닫지 않고 segment_seconds 마다 새 파일로 넘어간다.
+    완료된 세그먼트 경로는 pop_finished() 로 가져간다.
+    """
+
+    def __init__(
+        self,
+        path,
+        width,
+        height,
+        fps=None,
+        preset="veryfast",
+        crf=23,
+        segment_seconds=None,
+        align_to_clock=False,
+        wallclock=True,
+        keyframe_interval=2,
+        ffmpeg="ffmpeg",
+    ):
+        if shutil.which(ffmpeg) is None:
+            raise RuntimeError(f"ffmpeg executable not found: {ffmpeg}")
+        self.path = path
+        self.frame_shape = (height, width, 3)
+        self.segment_seconds = segment_seconds
+        self.fps = fps or 30
+        self.wallclock = wallclock
+        self._first_time = None
+        self._written = 0
+
+        cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y"]
+        cmd += ["-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}"]
+        if wallclock:
+            cmd += ["-use_wallclock_as_timestamps", "1"]
+        else:
+            cmd += ["-framerate", str(self.fps)]
+        cmd += ["-i", "pipe:0"]
+        cmd += ["-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-pix_fmt", "yuv420p"]
+        cmd += ["-fps_mode", "vfr" if wallclock else "cfr"]
+        # 세그먼트 경계가 키프레임에 맞도록 일정 간격으로 키프레임 강제
+        cmd += ["-force_key_frames", f"expr:gte(t,n_forced*{keyframe_interval})"]
+
+        if segment_seconds:
+            cmd += segment_args(segment_seconds, align_to_clock)
+        else:
+            cmd += ["-f", "mp4", "-movflags", FRAGMENTED_MP4]
+        cmd.append(path)
+
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE if segment_seconds else subprocess.DEVNULL,
+        )
+        self._reader = None
+        self._finished = queue.Queue()
+        if segment_seconds:
+            self._start_segment_reader()
+
+    def write(self, frame, frame_time=None):
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} != {self.frame_shape}")
+        data = np.ascontiguousarray(frame).data
+        repeat = 1
+        if not self.wallclock and frame_time is not None:
+            if self._first_time is None:
+                self._first_time = frame_time
+            # 캡처 시각에 해당하는 프레임 번호까지 채운다 (늦으면 복제, 이르면 생략)
+            target = round((frame_time - self._first_time) * self.fps) + 1
+            if target - self._written > self.fps * MAX_GAP_SECONDS:
+                # 긴 공백은 채우지 않고 기준 시각을 옮긴다
+                self._first_time = frame_time - self._written / self.fps
+                target = self._written + 1
+            repeat = target - self._written
+        for _ in range(max(repeat, 0)):
+            self.proc.stdin.write(data)
+            self._written += 1
+
+    def release(self, timeout=30):
+        """파이프를 닫고 마지막 파일(세그먼트)이 완성될 때까지 대기"""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self._wait(timeout)
+
+
+class StreamCopyRecorder(_SegmentList):
+    """
+    원본 스트림 그대로 저장 (디코딩 / 재인코딩 없음).
+
+    카메라가 보내는 H.264 패킷을 ffmpeg 가 그대로(-c copy) 세그먼트 MP4 로 리먹싱한다.
+    align_to_clock 이면 세그먼트 경계가 벽시계 기준 segment_seconds 배수에 맞춰진다
+    (예: 600초 -> 매시 00분, 10분, 20분 ...). 스트림 복사는 키프레임에서만 자를 수 있으므로
+    실제 경계는 카메라 GOP 간격만큼 늦어질 수 있다.
+    path 는 strftime 패턴, 완료된 세그먼트는 pop_finished() 로 가져간다.
+    """
+
+    def __init__(self, url, path, segment_seconds=600, align_to_clock=True, ffmpeg="ffmpeg"):
+        if shutil.which(ffmpeg) is None:
+            raise RuntimeError(f"ffmpeg executable not found: {ffmpeg}")
+        self.path = path
+        cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y"]
+        if str(url).startswith("rtsp"):
+            cmd += ["-rtsp_transport", "tcp"]
+        cmd += ["-i", str(url)]
+        # 영상만 저장 (G.711 등 MP4 에 넣을 수 없는 카메라 오디오 제외)
+        cmd += ["-map", "0:v:0", "-an", "-c", "copy"]
+        cmd += segment_args(segment_seconds, align_to_clock)
+        cmd.append(path)
+
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        self._start_segment_reader()
+
+    def release(self, timeout=30):
+        """ffmpeg 에 종료('q')를 보내고 마지막 세그먼트가 완성될 때까지 대기"""
+        try:
+            self.proc.stdin.write(b"q")
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self._wait(timeout)
@@ -0,0 +1,185 @@
+"""
+카메라 프레임 릴레이 공유 메모리 규약.
+
+릴레이 서비스(relay.py)가 카메라마다 연결 1개 / 디코딩 1회로 받은 프레임을
+공유 메모리 링(slots 개)에 쓰고, 인식 모듈 / 원본 녹화 / 라이브 화면 / 상태 확인이
+RelaySubscriber 로 같은 프레임을 읽는다.
+인식 모듈(플랫 import)과 Flask 앱(Process.frame_relay) 양쪽에서 쓰므로 설정 모듈에 의존하지 않는다.
+
+메모리 배치
+    header    int64[8]     : MAGIC, width, height, slots, latest_seq, heartbeat_ns, fps*1000, connected
+    slot_seq  int64[slots] : 각 슬롯에 들어 있는 프레임 번호 (쓰는 중이면 -1)
+    slot_time f8[slots]    : 캡처 시각 (time.time())
+    frames    u8[slots, height, width, 3]
+"""
+
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAGIC = 0x52454C41  # "RELA"
+HEADER = 8
+H_MAGIC, H_WIDTH, H_HEIGHT, H_SLOTS, H_SEQ, H_HEARTBEAT, H_FPS, H_CONNECTED = range(HEADER)
+
+# cv2 CAP_PROP_* 값 (VideoCapture 대체용)
+CAP_PROP_FRAME_WIDTH = 3
+CAP_PROP_FRAME_HEIGHT = 4
+CAP_PROP_FPS = 5
+
+
+def relay_name(camera_id):
+    return f"relay_cam_{camera_id}"
+
+
+def _layout(buf, width, height, slots):
+    """공유 메모리 버퍼 위의 header / slot_seq / slot_time / frames 뷰"""
+    header = np.ndarray((HEADER,), np.int64, buf, 0)
+    offset = HEADER * 8
+    slot_seq = np.ndarray((slots,), np.int64, buf, offset)
+    offset += slots * 8
+    slot_time = np.ndarray((slots,), np.float64, buf, offset)
+    offset += slots * 8
+    frames = np.ndarray((slots, height, width, 3), np.uint8, buf, offset)
+    return header, slot_seq, slot_time, frames
+
+
+def _size(width, height, slots):
+    return HEADER * 8 + slots * 16 + slots * height * width * 3
+
+
+class RelayPublisher:
+    """릴레이 서비스 쪽. 카메라 1대의 공유 메모리 링을 소유한다."""
+
+    def __init__(self, camera_id, width, height, fps=0, slots=4):
+        name = relay_name(camera_id)
+        try:
+            self.shm = shared_memory.SharedMemory(
+                name=name, create=True, size=_size(width, height, slots)
+            )
+        except FileExistsError:
+            # 이전 릴레이가 비정상 종료하며 남긴 메모리
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(
+                name=name, create=True, size=_size(width, height, slots)
+            )
+        self.header, self.slot_seq, self.slot_time, self.frames = _layout(
+            self.shm.buf, width, height, slots
+        )
+        self.slot_seq[:] = -1
+        self.header[:] = [MAGIC, width, height, slots, -1, time.time_ns(), int(fps * 1000), 1]
+        self.shape = (height, width, 3)
+        self.slots = slots
+        self.seq = -1
+
+    def publish(self, frame, frame_time):
+        """디코딩된 프레임 1장을 다음 슬롯에 기록 (seqlock: 쓰는 동안 slot_seq = -1)"""
+        self.seq += 1
+        slot = self.seq % self.slots
+        self.slot_seq[slot] = -1
+        self.frames[slot] = frame
+        self.slot_time[slot] = frame_time
+        self.slot_seq[slot] = self.seq
+        self.header[H_SEQ] = self.seq
+        self.header[H_HEARTBEAT] = time.time_ns()
+
+    def set_connected(self, connected):
+        self.header[H_CONNECTED] = int(connected)
+        self.header[H_HEARTBEAT] = time.time_ns()
+
+    def close(self):
+        self.header[H_CONNECTED] = 0
+        del self.header, self.slot_seq, self.slot_time, self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+class RelaySubscriber:
+    """
+    소비자 쪽. cv.VideoCapture 대신 쓸 수 있도록 read / isOpened / get / release 를 제공한다.
+
+    read() 는 새 프레임을 기다렸다가 사본을 돌려주고(오래 보관하는 소비자용),
+    view() 는 복사 없이 공유 메모리 슬롯을 그대로 돌려준다(바로 인코딩하고 버리는 소비자용).
+    """
+
+    def __init__(self, camera_id, timeout=10.0, stale_after=5.0):
+        self.camera_id = camera_id
+        self.stale_after = stale_after
+        self.shm = None
+        self.last_seq = -1
+        deadline = time.time() + timeout
+        while True:
+            try:
+                self.shm = shared_memory.SharedMemory(name=relay_name(camera_id))
+                break
+            except FileNotFoundError:
+                if time.time() >= deadline:
+                    return
+                time.sleep(0.2)
+        if os.name != "nt":
+            # 공유 메모리는 릴레이가 소유한다. 소비자 종료 시 unlink 되지 않도록 추적 해제
+            from multiprocessing import resource_tracker
+
+            try:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            except Exception:
+                pass
+        header = np.ndarray((HEADER,), np.int64, self.shm.buf, 0)
+        width, height, slots = (int(v) for v in header[H_WIDTH : H_SLOTS + 1])
+        self.header, self.slot_seq, self.slot_time, self.frames = _layout(
+            self.shm.buf, width, height, slots
+        )
+        self.slots = slots
+
+    def isOpened(self):
+        """릴레이가 카메라에 연결되어 있고 최근에 프레임을 받았는지"""
+        if self.shm is None or self.header[H_MAGIC] != MAGIC:
+            return False
+        age = (time.time_ns() - int(self.header[H_HEARTBEAT])) / 1e9
+        return bool(self.header[H_CONNECTED]) and age < self.stale_after
+
+    def get(self, prop):
+        if self.shm is None:
+            return 0
+        if prop == CAP_PROP_FRAME_WIDTH:
+            return float(self.header[H_WIDTH])
+        if prop == CAP_PROP_FRAME_HEIGHT:
+            return float(self.header[H_HEIGHT])
+        if prop == CAP_PROP_FPS:
+            return self.header[H_FPS] / 1000.0
+        return 0
+
+    def view(self):
+        """최신 프레임 (seq, 캡처 시각, 공유 메모리 뷰). 아직 없으면 None"""
+        seq = int(self.header[H_SEQ])
+        if seq < 0:
+            return None
+        slot = seq % self.slots
+        return seq, float(self.slot_time[slot]), self.frames[slot]
+
+    def is_current(self, seq):
+        """view() 로 받은 슬롯이 아직 덮어써지지 않았는지"""
+        return int(self.slot_seq[seq % self.slots]) == seq
+
+    def read(self):
+        """다음 새 프레임의 사본 (ret, frame). 릴레이가 끊기면 (False, None)"""
+        while self.isOpened():
+            seq = int(self.header[H_SEQ])
+            if seq > self.last_seq:
+                slot = seq % self.slots
+                frame = self.frames[slot].copy()
+                if int(self.slot_seq[slot]) == seq:  # 복사하는 동안 덮어써지지 않았음
+                    self.last_seq = seq
+                    return True, frame
+                continue
+            time.sleep(0.002)
+        return False, None
+
+    def release(self):
+        if self.shm is not None:
+            del self.header, self.slot_seq, self.slot_time, self.frames
+            self.shm.close()
+            self.shm = None
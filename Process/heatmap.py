@@ -0,0 +1,105 @@
+"""
+카메라별 점유 히트맵.
+
+인식 모듈이 추론할 때마다 사람 발 위치를 저해상도 격자(기본 64 x 36)에 누적하고,
+시간이 지나면 반감기(half_life)에 따라 감쇠시킨다. 녹화 영상을 다시 분석하지 않고
+"사람이 주로 머무는 곳"을 볼 수 있다.
+인식 모듈(플랫 import)과 Flask 앱(Process.heatmap) 양쪽에서 쓰므로 설정 모듈에 의존하지 않는다.
+
+파일 배치: <folder>/cam_<id>.npz      grid (float32, 높이 x 너비), updated (epoch 초)
+           <folder>/cam_<id>.jpg      저장 시점의 카메라 화면 (히트맵 배경)
+"""
+
+import os
+import time
+from pathlib import Path
+
+import cv2 as cv
+import numpy as np
+
+SNAPSHOT_WIDTH = 640
+
+
+def heatmap_path(folder, camera_id):
+    return Path(folder) / f"cam_{camera_id}.npz"
+
+
+def snapshot_path(folder, camera_id):
+    return Path(folder) / f"cam_{camera_id}.jpg"
+
+
+class OccupancyHeatmap:
+    def __init__(self, width=64, height=36, half_life=3600.0):
+        self.grid = np.zeros((height, width), np.float32)
+        self.half_life = half_life
+        self.updated = None
+
+    def decay(self, now):
+        if self.updated is not None and now > self.updated and self.half_life:
+            self.grid *= np.float32(0.5 ** ((now - self.updated) / self.half_life))
+        self.updated = now
+
+    def add(self, frame_shape, dets, frame_time, person_class_id):
+        """추론 1회 결과의 사람 발 위치(박스 아래 가운데)를 격자에 누적"""
+        self.decay(frame_time)
+        persons = dets[dets[:, 6].astype(int) == person_class_id]
+        if not len(persons):
+            return
+        frame_h, frame_w = frame_shape[:2]
+        grid_h, grid_w = self.grid.shape
+        gx = ((persons[:, 0] + persons[:, 2]) * (0.5 * grid_w / frame_w)).astype(np.int32)
+        gy = (persons[:, 3] * (grid_h / frame_h)).astype(np.int32)
+        np.add.at(
+            self.grid,
+            (np.clip(gy, 0, grid_h - 1), np.clip(gx, 0, grid_w - 1)),
+            np.float32(1.0),
+        )
+
+    def save(self, folder, camera_id, frame=None):
+        """격자(와 배경 화면)를 파일로 저장. 쓰는 도중 읽히지 않도록 임시 파일로 쓴 뒤 교체한다."""
+        os.makedirs(folder, exist_ok=True)
+        path = heatmap_path(folder, camera_id)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, grid=self.grid, updated=np.float64(self.updated or time.time()))
+        os.replace(tmp, path)
+        if frame is not None:
+            h, w = frame.shape[:2]
+            small = cv.resize(frame, (SNAPSHOT_WIDTH, h * SNAPSHOT_WIDTH // w))
+            ok, jpg = cv.imencode(".jpg", small, [cv.IMWRITE_JPEG_QUALITY, 80])
+            if ok:
+                tmp = snapshot_path(folder, camera_id).with_suffix(".tmp")
+                tmp.write_bytes(jpg.tobytes())
+                os.replace(tmp, snapshot_path(folder, camera_id))
+
+    def load(self, folder, camera_id):
+        """저장된 격자 이어서 누적 (크기가 다르면 무시). 불러왔으면 True"""
+        path = heatmap_path(folder, camera_id)
+        if not path.exists():
+            return False
+        grid, updated = load_heatmap(path)
+        if grid.shape != self.grid.shape:
+            return False
+        self.grid[:] = grid
+        self.updated = updated
+        return True
+
+
+def load_heatmap(path):
+    with np.load(path) as data:
+        return data["grid"].astype(np.float32), float(data["updated"])
+
+
+def render_heatmap(grid, background=None, alpha=0.5, size=(SNAPSHOT_WIDTH, 360)):
+    """격자를 컬러맵으로 그려 배경 화면 위에 겹친 BGR 이미지"""
+    if background is None:
+        background = np.zeros((size[1], size[0], 3), np.uint8)
+    h, w = background.shape[:2]
+    peak = float(grid.max())
+    norm = grid / peak if peak > 0 else grid
+    heat = cv.resize(norm.astype(np.float32), (w, h), interpolation=cv.INTER_CUBIC)
+    heat = np.clip(heat, 0, 1)
+    colored = cv.applyColorMap((heat * 255).astype(np.uint8), cv.COLORMAP_JET)
+    # 값이 있는 곳만 진하게 겹친다
+    weight = (np.sqrt(heat) * alpha)[..., None]
+    return (background * (1 - weight) + colored * weight).astype(np.uint8)
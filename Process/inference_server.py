@@ -0,0 +1,333 @@
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from recognition_config import (
+    MODEL_PATH,
+    DETECT_CONF,
+    INFERENCE_WORKERS,
+    INFERENCE_BATCH_SIZE,
+    INFERENCE_BATCH_TIMEOUT,
+    INFERENCE_RESPONSE_TIMEOUT,
+)
+
+
+def _attach_shared_memory(name):
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name != "nt":
+        # 공유 메모리는 카메라 프로세스가 소유한다. 워커 종료 시 unlink 되지 않도록 추적 해제
+        from multiprocessing import resource_tracker
+
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+def inference_worker(worker_idx, request_q, response_qs, model_path, conf, cpu_budget=None):
+    """
+    추론 워커 프로세스.
+
+    request_q 에서 (camera_idx, seq, shm_name, shape, options) 요청을 모아 배치로 추론하고,
+    결과 (seq, detections) 를 카메라별 response_qs[camera_idx] 로 돌려준다.
+    options 는 카메라 검출 프로필 (model_path, imgsz, conf, classes) 이며,
+    같은 options 끼리 묶어서 추론한다.
+    같은 카메라는 항상 같은 워커로 오므로 추적기 상태는 워커 안에서 유지된다.
+    cpu_budget: 워커 스레드 수 / 코어 고정 (cpu_budget.plan_cpu_budget), 모델 로드 전에 적용
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    if cpu_budget is not None:
+        from cpu_budget import apply_cpu_budget
+
+        apply_cpu_budget(cpu_budget, f"Worker {worker_idx}")
+
+    from detector import create_detector
+    detectors = {}  # model_path -> Detector
+
+    def get_detector(path):
+        if path not in detectors:
+            detectors[path] = create_detector(model_path=path, conf=conf)
+            logging.info(f"[Worker {worker_idx}] YOLO model loaded successfully: {path}")
+        return detectors[path]
+
+    try:
+        get_detector(model_path)
+    except Exception as e:
+        logging.error(f"[Worker {worker_idx}] Failed to load YOLO model: {e}")
+        return
+
+    buffers = {}  # camera_idx -> (shm_name, shm)
+    camera_models = {}  # camera_idx -> 마지막으로 사용한 model_path
+    running = True
+
+    while running:
+        try:
+            item = request_q.get(timeout=1.0)
+        except queue.Empty:
+            continue
+        if item is None:
+            break
+
+        # 배치 수집: 첫 요청 이후 INFERENCE_BATCH_TIMEOUT 동안 추가 요청을 모은다
+        batch = [item]
+        deadline = time.time() + INFERENCE_BATCH_TIMEOUT
+        while len(batch) < INFERENCE_BATCH_SIZE:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                item = request_q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                running = False
+                break
+            batch.append(item)
+
+        groups = {}  # options -> [(camera_idx, seq, frame)]
+        # 교체된 공유 메모리. 같은 배치의 이전 요청 프레임이 아직 참조하므로 배치가 끝난 뒤 닫는다
+        replaced = []
+        for camera_idx, seq, shm_name, shape, options in batch:
+            try:
+                cached = buffers.get(camera_idx)
+                if cached is None or cached[0] != shm_name:
+                    if cached is not None:
+                        replaced.append(cached[1])
+                        # 카메라 프로세스 재시작 / 시간 초과 후 새 버퍼
+                        for detector in detectors.values():
+                            detector.reset(camera_idx)
+                    cached = (shm_name, _attach_shared_memory(shm_name))
+                    buffers[camera_idx] = cached
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=cached[1].buf)
+            except (FileNotFoundError, BufferError) as e:
+                logging.warning(
+                    f"[Worker {worker_idx}] Shared memory for Cam {camera_idx} is unavailable ({e}). Skipping request."
+                )
+                buffers.pop(camera_idx, None)
+                continue
+            groups.setdefault(options, []).append((camera_idx, seq, frame))
+
+        for options, items in groups.items():
+            path, imgsz, det_conf, classes = options
+            camera_ids = [item[0] for item in items]
+            try:
+                detector = get_detector(path)
+                for camera_idx in camera_ids:
+                    # 모델이 바뀐 카메라는 이전 모델 쪽 추적기 상태를 버린다
+                    previous = camera_models.get(camera_idx)
+                    if previous is not None and previous != path and previous in detectors:
+                        detectors[previous].reset(camera_idx)
+                    camera_models[camera_idx] = path
+                results = detector.track_batch(
+                    camera_ids,
+                    [item[2] for item in items],
+                    conf=det_conf,
+                    imgsz=imgsz,
+                    classes=classes,
+                )
+            except Exception as e:
+                logging.error(f"[Worker {worker_idx}] Error during batch inference: {e}")
+                traceback.print_exc()
+                continue
+
+            for (camera_idx, seq, _), dets in zip(items, results):
+                try:
+                    response_qs[camera_idx].put((seq, dets), block=False)
+                except Exception as e:
+                    logging.error(
+                        f"[Worker {worker_idx}] Failed to send result to Cam {camera_idx}: {e}"
+                    )
+
+        # 프레임 뷰를 모두 놓은 뒤 교체된 공유 메모리를 닫는다
+        groups = items = frame = _ = None
+        for shm in replaced:
+            try:
+                shm.close()
+            except BufferError as e:
+                logging.warning(f"[Worker {worker_idx}] Could not close replaced shared memory: {e}")
+
+    for _, shm in buffers.values():
+        shm.close()
+    logging.info(f"[Worker {worker_idx}] Inference worker finished.")
+
+
+class InferenceServer:
+    """
+    공유 배치 추론 서버 (메인 프로세스에서 생성).
+
+    카메라 프로세스는 모델을 로드하지 않고 InferenceClient 로 프레임을 보낸다.
+    카메라는 camera_idx % workers 로 워커에 고정 배정된다.
+    """
+
+    def __init__(
+        self,
+        camera_ids,
+        workers=INFERENCE_WORKERS,
+        model_path=MODEL_PATH,
+        conf=DETECT_CONF,
+        cpu_budgets=None,
+    ):
+        self.model_path = model_path
+        self.conf = conf
+        self.cpu_budgets = cpu_budgets or [None] * workers
+        self.request_qs = [multiprocessing.Queue() for _ in range(workers)]
+        self.response_qs = {cid: multiprocessing.Queue() for cid in camera_ids}
+        self.processes = [None] * workers
+
+    def _spawn(self, worker_idx):
+        process = multiprocessing.Process(
+            target=inference_worker,
+            args=(
+                worker_idx,
+                self.request_qs[worker_idx],
+                self.response_qs,
+                self.model_path,
+                self.conf,
+                self.cpu_budgets[worker_idx],
+            ),
+            daemon=True,
+        )
+        process.start()
+        self.processes[worker_idx] = process
+
+    def start(self):
+        for worker_idx in range(len(self.processes)):
+            self._spawn(worker_idx)
+        logging.info(f"Inference server started with {len(self.processes)} workers.")
+
+    def queues_for(self, camera_idx):
+        """카메라 프로세스에 넘겨줄 (요청 큐, 응답 큐)"""
+        return (
+            self.request_qs[camera_idx % len(self.request_qs)],
+            self.response_qs[camera_idx],
+        )
+
+    def check_workers(self):
+        """종료된 워커 재시작"""
+        for worker_idx, process in enumerate(self.processes):
+            if process is not None and not process.is_alive():
+                logging.info(
+                    f"Inference worker {worker_idx} has terminated. try to reload."
+                )
+                self._spawn(worker_idx)
+
+    def stop(self, timeout=10):
+        for request_q in self.request_qs:
+            request_q.put(None)
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        logging.info("Inference server stopped.")
+
+
+class InferenceClient:
+    """
+    카메라 프로세스 쪽 추론 클라이언트. Detector.track 과 같은 방식으로 사용한다.
+
+    프레임은 카메라별 공유 메모리에 복사해 두고 요청 큐에는 이름만 보낸다.
+    요청은 카메라당 하나씩만 보내므로 응답을 받기 전에는 버퍼를 덮어쓰지 않는다.
+    응답이 시간 초과된 경우 다음 요청 전에 늦은 응답이 왔는지 확인하고, 아직이면
+    워커가 이전 프레임을 읽는 중일 수 있으므로 새 공유 메모리를 할당한다.
+    """
+
+    def __init__(
+        self,
+        camera_idx,
+        request_q,
+        response_q,
+        model_path=MODEL_PATH,
+        imgsz=None,
+        conf=DETECT_CONF,
+        classes=None,
+        timeout=INFERENCE_RESPONSE_TIMEOUT,
+    ):
+        self.camera_idx = camera_idx
+        self.options = (
+            model_path,
+            imgsz,
+            conf,
+            tuple(classes) if classes is not None else None,
+        )
+        self.request_q = request_q
+        self.response_q = response_q
+        self.timeout = timeout
+        self.shm = None
+        self.buffer = None
+        self.seq = 0
+        self.stale_seq = None  # 응답을 받지 못하고 시간 초과된 요청
+
+    def configure(self, model_path=None, imgsz=None):
+        """모델 / 입력 크기 변경. 다음 요청부터 적용된다."""
+        _, _, conf, classes = self.options
+        self.options = (model_path or self.options[0], imgsz, conf, classes)
+
+    def _ensure_buffer(self, frame):
+        if self.buffer is None or self.buffer.shape != frame.shape:
+            self.close()
+            self.shm = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+            self.buffer = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    def _stale_answered(self):
+        """시간 초과된 요청의 응답이 이미 도착했는지 (도착한 늦은 응답은 버린다)"""
+        while True:
+            try:
+                seq, _ = self.response_q.get_nowait()
+            except queue.Empty:
+                return False
+            if seq >= self.stale_seq:
+                return True
+
+    def track(self, frame):
+        if self.stale_seq is not None:
+            if not self._stale_answered():
+                logging.warning(
+                    f"[Cam {self.camera_idx}] Inference request {self.stale_seq} still pending. "
+                    "Switching to a new shared memory buffer."
+                )
+                self.close()
+            self.stale_seq = None
+        self._ensure_buffer(frame)
+        np.copyto(self.buffer, frame)
+        self.seq += 1
+        self.request_q.put(
+            (self.camera_idx, self.seq, self.shm.name, frame.shape, self.options)
+        )
+
+        deadline = time.time() + self.timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.stale_seq = self.seq
+                raise TimeoutError(
+                    f"No inference result within {self.timeout}s (seq {self.seq})"
+                )
+            try:
+                seq, dets = self.response_q.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if seq == self.seq:
+                return dets
+            # 시간 초과된 이전 요청의 늦은 응답은 버린다
+
+    def close(self):
+        if self.shm is not None:
+            self.buffer = None
+            self.shm.close()
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = None
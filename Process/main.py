@@ -6,12 +6,181 @@ import time
 import socket
 import threading
 import json
+import multiprocessing
+from datetime import datetime
 
 from dbconfig import dbconnect
-from ProcessVideo import ProcessVideo
+from ProcessVideo import ProcessVideo, SNAPSHOT_FOLDER
+from inference_server import InferenceServer
+from recognition_config import (
+    INFERENCE_MODE,
+    HEADLESS,
+    VIDEO_INSERT_INTERVAL,
+    RULES_REFRESH_INTERVAL,
+    SNAPSHOT_ALERT_WAIT,
+    INFERENCE_WORKERS,
+    CPU_BUDGET,
+)
+from profiles import load_profile
+from zones import load_zones
+from cpu_budget import plan_cpu_budget
 from send_email import send_html_email
 from email_config import EMAIL_RECEIVER
 
+def create_camera_process(
+    row, q, inference_server=None, profile=None, zones=None, cpu_budget=None
+):
+    """cams 테이블 행과 검출 프로필 / 구역 / CPU 예산으로 카메라 프로세스와 녹화 제어 파이프 생성"""
+    camera_id = int(row["id"])
+
+    # 부모-자식 파이프 생성
+    parent_pipe, child_pipe = multiprocessing.Pipe() # 녹화 메세지 전송을 위한 파이프
+
+    # 프로세스 생성
+    infer_queues = inference_server.queues_for(camera_id) if inference_server else None
+    process = multiprocessing.Process(
+        target=ProcessVideo,
+        args=(row["cam_url"], camera_id, q, child_pipe, infer_queues),
+        kwargs={
+            "headless": HEADLESS or bool(row.get("headless")),
+            "profile": profile,
+            "sub_url": row.get("sub_url") or None,
+            "zones": zones,
+            "cpu_budget": cpu_budget,
+        },
+        daemon=True,  # 데몬 프로세스로 설정
+    )
+    return process, parent_pipe
+
+
+def insert_videos(conn, cur, rows):
+    """카메라 프로세스가 보낸 videos 행 일괄 저장. 실패하면 다음 주기에 다시 시도한다."""
+    if not rows:
+        return True
+    sql_video = "INSERT INTO videos (camera_id, camera_name, recorded_date, recorded_time, video_path, is_dt, rend_date, rend_time) VALUES (%(camera_id)s, %(camera_name)s, %(recorded_date)s, %(recorded_time)s, %(video_path)s, %(is_dt)s, %(rend_date)s, %(rend_time)s)"
+    try:
+        cur.executemany(sql_video, rows)
+        conn.commit()
+        logging.info(f"Inserted {len(rows)} video rows.")
+        return True
+    except pymysql.Error as e:
+        logging.error(f"Database error while inserting videos: {e}")
+        conn.rollback()
+        return False
+
+
+def broadcast(ProcessDic, ppipes, message):
+    """살아 있는 모든 카메라 프로세스에 제어 메시지 전송. 고장난 파이프는 제거한다."""
+    for cid in list(ProcessDic):
+        if cid not in ppipes or not ProcessDic[cid].is_alive():
+            continue
+        try:
+            ppipes[cid].send(message)
+            logging.debug(f"Sent '{message}' to pipe for cam_id {cid}")  # 디버그 로그
+        except (BrokenPipeError, EOFError):
+            logging.warning(f"Pipe for Cam ID {cid} seems broken. Removing.")
+            ppipes[cid].close()
+            del ppipes[cid]  # 고장난 파이프 제거
+        except Exception as e:
+            logging.error(f"Error sending message to pipe for Cam ID {cid}: {e}")
+
+
+def load_active_rules(cur):
+    """카메라 프로세스에 내려보낼 현재 활성 모드 규칙"""
+    cur.execute(
+        "SELECT id, mode_type, people_cnt, zone_id FROM mode_schedule WHERE end_time >= NOW() AND start_time <= NOW()"
+    )
+    return [
+        {
+            "id": row["id"],
+            "mode_type": row["mode_type"],
+            "people_cnt": row["people_cnt"],
+            "zone_id": row["zone_id"],
+        }
+        for row in cur.fetchall()
+    ]
+
+
+def zone_total(batch, zone_id):
+    """배치의 카메라 로그에서 구역 인원 수 (구역은 카메라 1대에 속한다)"""
+    total = 0
+    for item in batch:
+        stats = item[3] if len(item) > 3 else {}
+        total += stats.get("zones", {}).get(zone_id, [0])[0]
+    return total
+
+
+def insert_mode_detected(conn, cur, mode_type, people_cnt_limit, mode_id, log_timestamp):
+    """감지 시작: Mode_Detected 기록. 새 행 idx 반환 (알림 메일은 스냅샷을 모은 뒤 send_alert)"""
+    sql_mode_detected = "INSERT INTO Mode_Detected (mode_type, person_reserved, detected_time, mode_schedule_id) VALUES (%s, %s, %s, %s)"
+    cur.execute(
+        sql_mode_detected,
+        (
+            mode_type,
+            (people_cnt_limit if mode_type == "Running" else 0),
+            log_timestamp,
+            mode_id,
+        ),
+    )
+    conn.commit()
+    return cur.lastrowid
+
+
+def request_snapshots(ProcessDic, ppipes, md_idx, mode_type, log_timestamp):
+    """카메라 프로세스에 이벤트 스냅샷 요청. 스냅샷이 모이면 보낼 알림 반환"""
+    info = {"timestamp": str(log_timestamp)}
+
+    if mode_type == "Running":
+        info["event"] = "Person Limit Exceeded"
+    elif mode_type == "Secure":
+        info["event"] = "Person Detected during Secure Mode"
+
+    broadcast(ProcessDic, ppipes, ("SNAPSHOT", md_idx))
+    return {
+        "md_idx": md_idx,
+        "info": info,
+        "waiting": {cid for cid in ppipes if cid in ProcessDic and ProcessDic[cid].is_alive()},
+        "snapshots": [],
+        "deadline": time.time() + SNAPSHOT_ALERT_WAIT,
+    }
+
+
+def send_alert(alert):
+    """알림 메일 전송 (받은 스냅샷 첨부)"""
+    send_html_email(alert["info"], to_email=EMAIL_RECEIVER, attachments=alert["snapshots"])
+
+
+def insert_snapshot(conn, cur, camera_id, md_idx, path):
+    """카메라 프로세스가 저장한 이벤트 스냅샷을 mode_detected 행에 연결"""
+    sql_snapshot = "INSERT INTO mode_snapshots (md_idx, camera_id, path, created_at) VALUES (%s, %s, %s, %s)"
+    try:
+        cur.execute(sql_snapshot, (md_idx, camera_id, path, datetime.now()))
+        conn.commit()
+    except pymysql.Error as e:
+        logging.error(f"Database error while saving snapshot for Cam {camera_id}: {e}")
+        conn.rollback()
+
+
+def upsert_heatmap(conn, cur, camera_id, data):
+    """카메라 프로세스가 보낸 점유 히트맵 격자 저장 (카메라당 1행)"""
+    sql_heatmap = "INSERT INTO heatmaps (camera_id, width, height, data, updated_at) VALUES (%s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE width = VALUES(width), height = VALUES(height), data = VALUES(data), updated_at = VALUES(updated_at)"
+    try:
+        cur.execute(
+            sql_heatmap,
+            (
+                camera_id,
+                data["width"],
+                data["height"],
+                data["grid"],
+                datetime.fromtimestamp(data["updated"]),
+            ),
+        )
+        conn.commit()
+    except pymysql.Error as e:
+        logging.error(f"Database error while saving heatmap for Cam {camera_id}: {e}")
+        conn.rollback()
+
+
 def status_listener():
     """인식 모듈 상태 확인 리스너 (추가됨)"""
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -35,6 +204,27 @@ def status_listener():
     logging.info("Status listener stopped.")
 
 
+def metrics_listener():
+    """카메라별 처리 메트릭 (추론 fps, 추론 생략 비율 등) 확인 리스너"""
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.settimeout(1.0)
+    server_socket.bind(("localhost", 8003))
+    server_socket.listen(1)
+    logging.info("Metrics listener started on port 8003.")
+    global main_loop_active
+    global metrics
+
+    while main_loop_active:
+        try:
+            conn, addr = server_socket.accept()
+            with conn:
+                conn.sendall(json.dumps(metrics).encode("utf-8"))
+        except socket.timeout:
+            continue
+    server_socket.close()
+    logging.info("Metrics listener stopped.")
+
+
 def shutdown_listener():
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.bind(("localhost", 8001))
@@ -52,7 +242,6 @@ def shutdown_listener():
 
 
 if __name__ == "__main__":
-    import multiprocessing
     from queue import Full, Empty
 
     logging.info("Main process started.")
@@ -88,8 +277,35 @@ if __name__ == "__main__":
     ppipes = {}
     global status
     status = {}
+    global metrics
+    metrics = {}
+
+    # CPU 스레드 예산: 모델을 돌리는 프로세스 (카메라 프로세스 또는 추론 워커) 끼리 코어를 나눈다.
+    # 추론 서버 모드의 카메라 프로세스는 캡처 / 인코딩만 하므로 1스레드
+    camera_budgets = [None] * len(camera_list)
+    worker_budgets = None
+    if CPU_BUDGET:
+        if INFERENCE_MODE == "server":
+            worker_budgets = plan_cpu_budget(INFERENCE_WORKERS)
+            camera_budgets = [{"threads": 1, "cores": None}] * len(camera_list)
+        else:
+            camera_budgets = plan_cpu_budget(len(camera_list))
+        logging.info(
+            f"CPU budget: {(worker_budgets or camera_budgets)[0]['threads']} threads per "
+            f"{'inference worker' if worker_budgets else 'camera process'}"
+        )
+
+    # 공유 추론 서버 (INFERENCE_MODE = "server")
+    inference_server = None
+    if INFERENCE_MODE == "server":
+        inference_server = InferenceServer(
+            [int(row["id"]) for row in camera_list if "id" in row],
+            cpu_budgets=worker_budgets,
+        )
+        inference_server.start()
 
-    for row in camera_list:
+    camera_budget_by_id = {}  # 재시작하는 카메라 프로세스도 같은 예산 사용
+    for row, cpu_budget in zip(camera_list, camera_budgets):
         if "id" not in row or "cam_url" not in row:
             logging.warning(
                 f"Skipping camera entry due to missing 'id' or 'cam_url': {row}"
@@ -97,16 +313,10 @@ if __name__ == "__main__":
             continue
 
         camera_id = int(row["id"])
-        camera_url = row["cam_url"]
-
-        # 부모-자식 파이프 생성
-        parent_pipe, child_pipe = multiprocessing.Pipe() # 녹화 메세지 전송을 위한 파이프
-
-        # 프로세스 생성
-        process = multiprocessing.Process(
-            target=ProcessVideo,
-            args=(camera_url, camera_id, q, child_pipe),
-            daemon=True,  # 데몬 프로세스로 설정
+        profile = load_profile(cur, row.get("profile_id"))
+        camera_budget_by_id[camera_id] = cpu_budget
+        process, parent_pipe = create_camera_process(
+            row, q, inference_server, profile, load_zones(cur, camera_id), cpu_budget
         )
 
         ProcessDic[camera_id] = process
@@ -132,6 +342,15 @@ if __name__ == "__main__":
     md_idx = 0
     max_person_detected = 0
     log_timestamp = None
+    pending_videos = []  # 카메라 프로세스가 보낸 videos 행 (일괄 저장 대기)
+    # 즉시 경보: 카메라 프로세스에 내려보낸 규칙과 제한을 넘은 상태인 카메라
+    current_rules = None
+    over_cams = set()
+    rules_timestamp = 0.0
+    alert_latencies = []  # 프레임 캡처 -> REC ON 전송 지연 (초), 최근 100건
+    pending_alert = None  # 스냅샷을 기다리는 알림 메일
+    latest_counts = {}  # 카메라별 최신 인원 수 (주기 로그 / 조기 전송)
+    video_timestamp = time.time()
     thr_timestamp = time.time()
     pipe_timestamp = time.time()
 
@@ -143,6 +362,9 @@ if __name__ == "__main__":
 
     shutdown_thread = threading.Thread(target=shutdown_listener, daemon=True)
     shutdown_thread.start()
+
+    metrics_thread = threading.Thread(target=metrics_listener, daemon=True)
+    metrics_thread.start()
     
     main_loop_active = True
     
@@ -165,6 +387,12 @@ if __name__ == "__main__":
                     target=shutdown_listener, daemon=True
                 )
                 shutdown_thread.start()
+
+            # 스레드 상태 확인 (metrics)
+            if not metrics_thread.is_alive():
+                logging.info("Metrics Listener Thread is not alive. try to restart...")
+                metrics_thread = threading.Thread(target=metrics_listener, daemon=True)
+                metrics_thread.start()
         except Exception as e:
             traceback.print_exc(e)
             
@@ -181,10 +409,47 @@ if __name__ == "__main__":
         except Exception as e:
             traceback.print_exc(e)
         
+        try:
+            # 활성 모드 규칙이 바뀌면 카메라 프로세스에 전달
+            if time.time() - rules_timestamp >= RULES_REFRESH_INTERVAL:
+                rules_timestamp = time.time()
+                rules = load_active_rules(cur)
+                conn.commit()  # 다음 조회에서 새 스케줄이 보이도록 트랜잭션 종료
+                if rules != current_rules:
+                    logging.info(f"Active mode rules changed: {rules}")
+                    current_rules = rules
+                    over_cams.clear()
+                    broadcast(ProcessDic, ppipes, ("RULES", current_rules))
+        except Exception:
+            traceback.print_exc()
+
+        try:
+            # 스냅샷을 다 받지 못해도 대기 시간이 지나면 알림 전송
+            if pending_alert is not None and time.time() >= pending_alert["deadline"]:
+                logging.info(
+                    f"Sending alert for Mode_Detected {pending_alert['md_idx']} "
+                    f"without snapshots from cams {sorted(pending_alert['waiting'])}"
+                )
+                send_alert(pending_alert)
+                pending_alert = None
+        except Exception:
+            traceback.print_exc()
+
+        try:
+            # 녹화 영상 행 일괄 저장
+            if pending_videos and time.time() - video_timestamp >= VIDEO_INSERT_INTERVAL:
+                video_timestamp = time.time()
+                if insert_videos(conn, cur, pending_videos):
+                    pending_videos = []
+        except Exception:
+            traceback.print_exc()
+
         try:            
             # 자식 프로세스 상태 확인 (모든 자식 프로세스가 종료되었는지)
             if math.trunc(time.time() - thr_timestamp) == 60:
                 thr_timestamp = time.time()
+                if inference_server:
+                    inference_server.check_workers()
                 if not any(ProcessDic[cid].is_alive() for cid in ProcessDic):
                     logging.info("All child processes have terminated. Exiting main loop.")
                     main_loop_active = False
@@ -199,21 +464,22 @@ if __name__ == "__main__":
                             )
                             cur.execute("SELECT * FROM cams where id=%s", (cid))
                             camera = cur.fetchall()
-                            camera_url = camera[0]["cam_url"]
-
-                            # 부모-자식 파이프 생성
-                            parent_pipe, child_pipe = multiprocessing.Pipe() # 녹화 메세지 전송을 위한 파이프
-
-                            # 프로세스 생성
-                            process = multiprocessing.Process(
-                                target=ProcessVideo,
-                                args=(camera_url, cid, q, child_pipe),
-                                daemon=True,  # 데몬 프로세스로 설정
+                            profile = load_profile(cur, camera[0].get("profile_id"))
+                            process, parent_pipe = create_camera_process(
+                                camera[0],
+                                q,
+                                inference_server,
+                                profile,
+                                load_zones(cur, cid),
+                                camera_budget_by_id.get(cid),
                             )
-                            
+
                             ProcessDic[cid] = process
                             ppipes[cid] = parent_pipe  # 카메라 ID를 키로 부모 파이프 저장
                             ProcessDic[cid].start()
+                            over_cams.discard(cid)
+                            if current_rules is not None:
+                                parent_pipe.send(("RULES", current_rules))
                             time.sleep(0.1)
         except Exception as e:
             traceback.print_exc(e)
@@ -225,11 +491,86 @@ if __name__ == "__main__":
                 if pd[1] == "Status":
                     status[pd[0]] = pd[2]
                     continue
+                if pd[1] == "Metrics":
+                    metrics[pd[0]] = pd[2]
+                    continue
+                if pd[1] == "Video":
+                    pending_videos.append(pd[2])
+                    continue
+                if pd[1] == "Count":
+                    # 조기 전송된 인원 수: 배치 합계에는 넣지 않고 카메라별 최신 값만 갱신
+                    latest_counts[pd[0]] = pd[2]["count"]
+                    if should_record:
+                        max_person_detected = max(
+                            max_person_detected, sum(latest_counts.values())
+                        )
+                    continue
+                if pd[1] == "Heatmap":
+                    upsert_heatmap(conn, cur, pd[0], pd[2])
+                    continue
+                if pd[1] == "Snapshot":
+                    shot = pd[2]
+                    if shot["path"]:
+                        insert_snapshot(conn, cur, pd[0], shot["md_idx"], shot["path"])
+                    if pending_alert is not None and pending_alert["md_idx"] == shot["md_idx"]:
+                        pending_alert["waiting"].discard(pd[0])
+                        if shot["path"]:
+                            pending_alert["snapshots"].append(str(SNAPSHOT_FOLDER / shot["path"]))
+                        if not pending_alert["waiting"]:
+                            send_alert(pending_alert)
+                            pending_alert = None
+                    continue
+                if pd[1] == "Threshold":
+                    event = pd[2]
+                    if event["over"]:
+                        over_cams.add(pd[0])
+                    else:
+                        over_cams.discard(pd[0])
+                    rule = next(
+                        (r for r in current_rules or [] if r["id"] == event["mode_id"]),
+                        None,
+                    )
+                    # 주기 로그를 기다리지 않고 바로 녹화 시작 (해제는 주기 로그 처리에서 판단)
+                    if event["over"] and not should_record and rule is not None:
+                        should_record = True
+                        log_timestamp = datetime.now()
+                        current_mode_schedule_id = rule["id"]
+                        broadcast(ProcessDic, ppipes, "REC ON")
+                        latency = time.time() - event["frame_time"]
+                        alert_latencies = (alert_latencies + [latency])[-100:]
+                        metrics["alert"] = {
+                            "last_ms": round(latency * 1000),
+                            "mean_ms": round(sum(alert_latencies) / len(alert_latencies) * 1000),
+                            "max_ms": round(max(alert_latencies) * 1000),
+                            "count": len(alert_latencies),
+                        }
+                        logging.warning(
+                            f"[{log_timestamp}] Cam {pd[0]} crossed {rule['mode_type']} limit "
+                            f"(count {event['count']} > {event['limit']}, Mode ID: {rule['id']}). "
+                            f"Frame -> REC ON {latency * 1000:.0f}ms"
+                        )
+                        max_person_detected = event["count"]
+                        md_idx = insert_mode_detected(
+                            conn,
+                            cur,
+                            rule["mode_type"],
+                            rule["people_cnt"],
+                            rule["id"],
+                            log_timestamp,
+                        )
+                        if pending_alert is not None:
+                            send_alert(pending_alert)
+                        pending_alert = request_snapshots(
+                            ProcessDic, ppipes, md_idx, rule["mode_type"], log_timestamp
+                        )
+                    continue
                 # logging.debug(f"Received data from queue: {pd}") # 디버깅 시 주석 해제
             except Empty:  # 큐가 비어있으면 잠시 대기 후 다시 시도
                 time.sleep(0.1)  # CPU 사용률 감소
                 continue
 
+            latest_counts[pd[0]] = pd[1]
+
             # 데이터 처리 로직 (3초 단위 배치)
             if not cflag:  # 첫 데이터 도착
                 cflag = True
@@ -269,17 +610,28 @@ if __name__ == "__main__":
                             plog_idx = cur.lastrowid
                             # logging.info(f"Inserted into Place_Logs: Total={total_persons}, Time={log_timestamp}, ID={plog_idx}")
 
-                            # 2. Camera_Logs 저장
-                            sql_camera_log = "INSERT INTO Camera_Logs (camera_idx, dp_cnt, detected_time, plog_idx) VALUES (%s, %s, %s, %s)"
-                            log_entries = [
-                                (
-                                    item[0],
-                                    item[1],
-                                    item[2].strftime("%Y-%m-%d %H:%M:%S"),
-                                    plog_idx,
+                            # 2. Camera_Logs 저장 (구간 통계: 최대 / 평균 / p95 / 추적 ID 수)
+                            sql_camera_log = "INSERT INTO Camera_Logs (camera_idx, dp_cnt, detected_time, plog_idx, dp_max, dp_mean, dp_p95, dp_ids, dp_zones) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+                            log_entries = []
+                            for item in current_batch:
+                                stats = item[3] if len(item) > 3 else {}
+                                log_entries.append(
+                                    (
+                                        item[0],
+                                        item[1],
+                                        item[2].strftime("%Y-%m-%d %H:%M:%S"),
+                                        plog_idx,
+                                        stats.get("max"),
+                                        stats.get("mean"),
+                                        stats.get("p95"),
+                                        stats.get("ids"),
+                                        (
+                                            json.dumps({k: stats[k] for k in ("zones", "lines")})
+                                            if "zones" in stats
+                                            else None
+                                        ),
+                                    )
                                 )
-                                for item in current_batch
-                            ]
                             cur.executemany(
                                 sql_camera_log, log_entries
                             )  # executemany 사용
@@ -296,7 +648,8 @@ if __name__ == "__main__":
                             record_flag_before = should_record
                             should_record = False  # 녹화 시작 플래그
                             
-                            if len(active_modes) == 0 or (current_mode_schedule_id != active_modes[0].get("id","N/A")):
+                            # 감지를 시작한 스케줄이 더 이상 활성 상태가 아니면 모드 종료로 본다
+                            if current_mode_schedule_id not in [m.get("id") for m in active_modes]:
                                 if record_flag_before == True: # 모드가 끝날 때 녹화중이었다면 DB 업데이트 및 녹화 종료
                                     logging.info(f"Update Mode_detected dend_time={log_timestamp} and max_person_detected = {max_person_detected}")
                                     sql_mode_detected = "UPDATE mode_detected set dend_time = %s, max_person_detected = %s where idx = %s"
@@ -312,23 +665,7 @@ if __name__ == "__main__":
                                     
                                     # 녹화 제어 메시지 전송
                                     # should_record 플래그를 기반으로 모든 활성 카메라 프로세스에 메시지 전송
-                                    message_to_send = "REC OFF"
-                                        
-                                    for cid in ProcessDic:
-                                        if ProcessDic[cid].is_alive():  # 간단히 모든 활성 프로세스에 전송
-                                            try:
-                                                ppipes[cid].send(message_to_send)
-                                                logging.debug(f"Sent '{message_to_send}' to pipe for cam_id {cid}") # 디버그 로그
-                                            except (BrokenPipeError, EOFError):
-                                                logging.warning(
-                                                    f"Pipe for Cam ID {cid} seems broken. Removing."
-                                                )
-                                                ppipes[cid].close()
-                                                del ppipes[cid]  # 고장난 파이프 제거
-                                            except Exception as e:
-                                                logging.error(
-                                                    f"Error sending message to pipe for Cam ID {cid}: {e}"
-                                                )
+                                    broadcast(ProcessDic, ppipes, "REC OFF")
                                 if active_modes:
                                     current_mode_schedule_id = active_modes[0].get("id","N/A")
                                 else:
@@ -343,56 +680,48 @@ if __name__ == "__main__":
                                         "people_cnt"
                                     )  # Running 모드용
                                     mode_id = mode.get("id", "N/A")  # 로그용
+                                    # 구역이 지정된 모드는 그 구역 안의 인원 수로 판단
+                                    detected = (
+                                        zone_total(current_batch, mode["zone_id"])
+                                        if mode.get("zone_id")
+                                        else total_persons
+                                    )
 
                                     logging.debug(
-                                        f"Active mode check: Type={mode_type}, Limit={people_cnt_limit}, Total Detected={total_persons}"
+                                        f"Active mode check: Type={mode_type}, Limit={people_cnt_limit}, Zone={mode.get('zone_id')}, Detected={detected}"
                                     )
 
                                     if (
                                         mode_type == "Running"
                                         and people_cnt_limit is not None
                                     ):
-                                        if total_persons > people_cnt_limit:
+                                        if detected > people_cnt_limit:
                                             logging.warning(
-                                                f"[{log_timestamp}] Person detected during Running mode! Detected: {total_persons}, Limit: {people_cnt_limit} (Mode ID: {mode_id})"
+                                                f"[{log_timestamp}] Person detected during Running mode! Detected: {detected}, Limit: {people_cnt_limit} (Mode ID: {mode_id})"
                                             )
                                             should_record = True
                                     elif mode_type == "Secure":
-                                        if total_persons > 0:
+                                        if detected > 0:
                                             logging.warning(
-                                                f"[{log_timestamp}] Person detected during Secure mode! Detected: {total_persons} (Mode ID: {mode_id})"
+                                                f"[{log_timestamp}] Person detected during Secure mode! Detected: {detected} (Mode ID: {mode_id})"
                                             )
                                             should_record = True
 
                                     if total_persons > max_person_detected:
                                         max_person_detected = total_persons
 
+                                # 카메라가 보낸 즉시 경보가 아직 해제되지 않았으면 녹화 유지
+                                if over_cams:
+                                    should_record = True
+
                                 if should_record != record_flag_before:
                                     # 녹화 제어 메시지 전송
                                     # should_record 플래그를 기반으로 모든 활성 카메라 프로세스에 메시지 전송
-                                    message_to_send = (
-                                        "REC ON" if should_record else "REC OFF"
+                                    broadcast(
+                                        ProcessDic,
+                                        ppipes,
+                                        "REC ON" if should_record else "REC OFF",
                                     )
-
-                                    for cid in ProcessDic:
-                                        if ProcessDic[
-                                            cid
-                                        ].is_alive():  # 간단히 모든 활성 프로세스에 전송
-                                            try:
-                                                ppipes[cid].send(message_to_send)
-                                                logging.debug(
-                                                    f"Sent '{message_to_send}' to pipe for cam_id {cid}"
-                                                )  # 디버그 로그
-                                            except (BrokenPipeError, EOFError):
-                                                logging.warning(
-                                                    f"Pipe for Cam ID {cid} seems broken. Removing."
-                                                )
-                                                ppipes[cid].close()
-                                                del ppipes[cid]  # 고장난 파이프 제거
-                                            except Exception as e:
-                                                logging.error(
-                                                    f"Error sending message to pipe for Cam ID {cid}: {e}"
-                                                )
                                     # 녹화 종료: mode_detected 테이블 업데이트
                                     if (
                                         should_record == False
@@ -418,34 +747,23 @@ if __name__ == "__main__":
                                     ):
                                         # Mode_Detected 테이블에 기록
                                         max_person_detected = total_persons  # 현재 인원으로 최대 감지 인원 초기화
-                                        sql_mode_detected = "INSERT INTO Mode_Detected (mode_type, person_reserved, detected_time, mode_schedule_id) VALUES (%s, %s, %s, %s)"
-                                        cur.execute(
-                                            sql_mode_detected,
-                                            (
-                                                mode_type,
-                                                (
-                                                    people_cnt_limit
-                                                    if mode_type == "Running"
-                                                    else 0
-                                                ),
-                                                log_timestamp,
-                                                mode_id,
-                                            ),
+                                        md_idx = insert_mode_detected(
+                                            conn,
+                                            cur,
+                                            mode_type,
+                                            people_cnt_limit,
+                                            mode_id,
+                                            log_timestamp,
+                                        )
+                                        if pending_alert is not None:
+                                            send_alert(pending_alert)
+                                        pending_alert = request_snapshots(
+                                            ProcessDic,
+                                            ppipes,
+                                            md_idx,
+                                            mode_type,
+                                            log_timestamp,
                                         )
-                                        conn.commit()
-                                        md_idx = cur.lastrowid
-
-                                        # SEND EMAIL
-                                        info = {"timestamp": str(log_timestamp)}
-
-                                        if mode_type == "Running":
-                                            info["event"] = "Person Limit Exceeded"
-                                        elif mode_type == "Secure":
-                                            info["event"] = (
-                                                "Person Detected during Secure Mode"
-                                            )
-
-                                        send_html_email(info, to_email=EMAIL_RECEIVER)
 
                             else:  # 활성화된 모드가 없을 때
                                 logging.debug(
@@ -498,10 +816,31 @@ if __name__ == "__main__":
         except Exception as e:
             logging.error(f"Error joining process {ProcessDic[cid].pid}: {e}")
 
+    if inference_server:
+        inference_server.stop()
+
     # 스레드가 종료될 때 까지 대기
     logging.info("Waiting for status thread to terminate...")
     status_thread.join()
 
+    # 종료 중인 카메라 프로세스가 보낸 videos 행까지 저장
+    while True:
+        try:
+            pd = q.get(timeout=0.5)
+        except Empty:
+            break
+        if pd[1] == "Video":
+            pending_videos.append(pd[2])
+        elif pd[1] == "Heatmap":
+            upsert_heatmap(conn, cur, pd[0], pd[2])
+        elif pd[1] == "Snapshot" and pd[2]["path"]:
+            insert_snapshot(conn, cur, pd[0], pd[2]["md_idx"], pd[2]["path"])
+            if pending_alert is not None and pending_alert["md_idx"] == pd[2]["md_idx"]:
+                pending_alert["snapshots"].append(str(SNAPSHOT_FOLDER / pd[2]["path"]))
+    insert_videos(conn, cur, pending_videos)
+    if pending_alert is not None:
+        send_alert(pending_alert)
+
     q.close()
     q.join_thread()
 
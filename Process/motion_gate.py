@@ -0,0 +1,65 @@
+import cv2 as cv
+
+from recognition_config import (
+    MOTION_WIDTH,
+    MOTION_PIXEL_THRESHOLD,
+    MOTION_MIN_AREA,
+    MOTION_REFRESH_INTERVAL,
+)
+
+
+class MotionGate:
+    """
+    추론 전 움직임 필터.
+
+    축소한 흑백 프레임을 마지막으로 추론한 프레임과 비교해서 변화가 없으면
+    추론을 건너뛴다. 천천히 변하는 장면도 누적 차이로 잡히도록 기준 프레임은
+    추론할 때만 갱신하고, refresh_interval 마다 강제로 추론해 추적기를 유지한다.
+    """
+
+    def __init__(
+        self,
+        width=MOTION_WIDTH,
+        pixel_threshold=MOTION_PIXEL_THRESHOLD,
+        min_area=MOTION_MIN_AREA,
+        refresh_interval=MOTION_REFRESH_INTERVAL,
+    ):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.refresh_interval = refresh_interval
+        self.reference = None
+        self.last_inference_time = 0.0
+        self.checked = 0
+        self.skipped = 0
+
+    def _prepare(self, frame):
+        h, w = frame.shape[:2]
+        small = cv.resize(
+            frame, (self.width, max(1, h * self.width // w)), interpolation=cv.INTER_AREA
+        )
+        gray = cv.cvtColor(small, cv.COLOR_BGR2GRAY)
+        return cv.GaussianBlur(gray, (5, 5), 0)
+
+    def should_infer(self, frame, now):
+        """이번 프레임에 추론이 필요한지 판단"""
+        self.checked += 1
+        gray = self._prepare(frame)
+
+        if self.reference is not None and now - self.last_inference_time < self.refresh_interval:
+            diff = cv.absdiff(gray, self.reference)
+            _, mask = cv.threshold(diff, self.pixel_threshold, 255, cv.THRESH_BINARY)
+            if cv.countNonZero(mask) < self.min_area * mask.size:
+                self.skipped += 1
+                return False
+
+        self.reference = gray
+        self.last_inference_time = now
+        return True
+
+    def pop_skip_ratio(self):
+        """마지막 호출 이후 건너뛴 비율을 반환하고 카운터를 초기화한다."""
+        ratio = self.skipped / self.checked if self.checked else 0.0
+        self.checked = 0
+        self.skipped = 0
+        return ratio
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import cv2 as cv
+import numpy as np
+
+# 추적 ID 별 박스 색상 (BGR). ID 를 팔레트 크기로 나눈 나머지로 고르므로 메모리가 늘지 않는다.
+PALETTE = np.array(
+    [
+        (56, 56, 255), (151, 157, 255), (31, 112, 255), (29, 178, 255),
+        (49, 210, 207), (10, 249, 72), (23, 204, 146), (134, 219, 61),
+        (52, 147, 26), (187, 212, 0), (168, 153, 44), (255, 194, 0),
+        (147, 69, 52), (255, 115, 100), (236, 24, 0), (255, 56, 132),
+        (133, 0, 82), (255, 56, 203), (200, 149, 255), (199, 55, 255),
+    ],
+    dtype=np.uint8,
+)
+_PALETTE_COLORS = [tuple(int(c) for c in color) for color in PALETTE]  # cv 그리기 함수용 튜플
+
+
+def track_color(track_id):
+    """추적 ID 의 고정 색상 (B, G, R)"""
+    return _PALETTE_COLORS[int(track_id) % len(_PALETTE_COLORS)]
+
+
+class TextSprite:
+    """
+    글자를 미리 그려 둔 작은 이미지. 같은 글자는 다시 그리지 않고 프레임에 복사만 한다.
+    검은 배경 위에 그린 뒤 글자 픽셀만 마스크로 골라 cv.copyTo 로 붙인다.
+    """
+
+    def __init__(self, text, scale, color, thickness, line_type=cv.LINE_8):
+        (w, h), baseline = cv.getTextSize(text, cv.FONT_HERSHEY_SIMPLEX, scale, thickness)
+        pad = thickness
+        self.baseline = h + pad  # putText 기준점(왼쪽 아래) 까지의 높이
+        self.image = np.zeros((h + baseline + pad * 2, w + pad * 2, 3), np.uint8)
+        cv.putText(
+            self.image, text, (pad, self.baseline), cv.FONT_HERSHEY_SIMPLEX,
+            scale, color, thickness, line_type,
+        )
+        self.mask = self.image.any(axis=2).astype(np.uint8)
+
+    def blit(self, frame, x, y):
+        """putText 와 같은 기준점 (x, y: 글자 왼쪽 아래) 에 붙인다. 프레임 밖은 잘라낸다."""
+        top = y - self.baseline
+        h, w = self.mask.shape
+        fh, fw = frame.shape[:2]
+        x1, y1 = max(x, 0), max(top, 0)
+        x2, y2 = min(x + w, fw), min(top + h, fh)
+        if x1 >= x2 or y1 >= y2:
+            return
+        sx, sy = x1 - x, y1 - top
+        cv.copyTo(
+            self.image[sy : sy + y2 - y1, sx : sx + x2 - x1],
+            self.mask[sy : sy + y2 - y1, sx : sx + x2 - x1],
+            frame[y1:y2, x1:x2],
+        )
+
+
+class OverlayRenderer:
+    """
+    녹화 / 화면 출력용 오버레이 (박스, ID / 신뢰도, 현재 시간, 인원 수).
+
+    - 시간 표시는 초가 바뀔 때만, 인원 수 표시는 값이 바뀔 때만 스프라이트를 다시 그린다
+      (LINE_AA 글자는 putText 가 비싸다).
+    - 박스와 박스 레이블은 크기가 작아 스프라이트를 붙이는 비용이 더 크므로 바로 그린다.
+    """
+
+    def __init__(self, person_class_id):
+        self.person_class_id = person_class_id
+        self._time_key = None
+        self._time_sprite = None
+        self._count_key = None
+        self._count_sprite = None
+
+    def draw_boxes(self, frame, dets):
+        if self.person_class_id is None or not len(dets):
+            return
+        persons = dets[dets[:, 6].astype(np.int32) == self.person_class_id]
+        for x1, y1, x2, y2, track_id, confidence in persons[:, :6].tolist():
+            x1, y1, track_id = int(x1), int(y1), int(track_id)
+            color = _PALETTE_COLORS[track_id % len(_PALETTE_COLORS)]
+            cv.rectangle(frame, (x1, y1), (int(x2), int(y2)), color, 2)
+            cv.putText(
+                frame, f"ID: {track_id} {confidence:.2f}", (x1, y1 - 10),
+                cv.FONT_HERSHEY_SIMPLEX, 0.5, color, 2,
+            )
+
+    def render(self, frame, dets, person_count, frame_time=None):
+        """프레임에 오버레이를 그려서 돌려준다 (제자리 수정). frame_time 은 캡처 시각."""
+        self.draw_boxes(frame, dets)
+
+        # 현재 시간 (초 단위로 바뀔 때만 다시 그린다)
+        second = int(frame_time if frame_time is not None else datetime.now().timestamp())
+        if second != self._time_key:
+            self._time_key = second
+            self._time_sprite = TextSprite(
+                datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S"),
+                1, (255, 255, 255), 2, cv.LINE_AA,
+            )
+        self._time_sprite.blit(frame, 10, 30)
+
+        # 인원 수 (값이 바뀔 때만 다시 그린다)
+        if person_count != self._count_key:
+            self._count_key = person_count
+            self._count_sprite = TextSprite(
+                f"Persons: {person_count}", 0.8, (0, 255, 0), 2, cv.LINE_AA
+            )
+        self._count_sprite.blit(frame, 10, frame.shape[0] - 10)
+        return frame
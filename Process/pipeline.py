@@ -0,0 +1,251 @@
+import logging
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class LatestFrame:
+    """
+    최신 프레임 1장만 보관하는 슬롯 (캡처 -> 추론).
+
+    추론이 늦어지면 이전 프레임은 덮어써서 버리므로
+    추론은 항상 가장 최근 프레임으로 수행된다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        with self._cond:
+            if self._item is None:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+
+class FrameRing:
+    """고정 크기 링 버퍼 (캡처 -> 인코딩). 가득 차면 가장 오래된 프레임을 버린다."""
+
+    def __init__(self, maxlen):
+        self._cond = threading.Condition()
+        self._buf = deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._buf) == self._buf.maxlen:
+                self.dropped += 1
+            self._buf.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._buf:
+                self._cond.wait(timeout)
+            return self._buf.popleft() if self._buf else None
+
+    def clear(self):
+        with self._cond:
+            self._buf.clear()
+
+
+class PreRollBuffer:
+    """
+    녹화 프리롤 버퍼. 최근 seconds 초의 프레임을 JPEG 로 압축해 보관한다.
+
+    보관 시간과 전체 바이트 수 둘 다로 제한하므로 카메라당 메모리는
+    max_bytes 를 넘지 않는다.
+    """
+
+    def __init__(self, seconds, max_bytes, quality=80):
+        self.seconds = seconds
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._buf = deque()  # (frame_time, jpeg bytes)
+        self.nbytes = 0
+
+    def put(self, frame_time, frame):
+        import cv2 as cv
+
+        ok, jpeg = cv.imencode(
+            ".jpg", frame, [int(cv.IMWRITE_JPEG_QUALITY), self.quality]
+        )
+        if not ok:
+            return
+        with self._lock:
+            self._buf.append((frame_time, jpeg))
+            self.nbytes += jpeg.nbytes
+            while self._buf and (
+                self.nbytes > self.max_bytes
+                or frame_time - self._buf[0][0] > self.seconds
+            ):
+                self.nbytes -= self._buf.popleft()[1].nbytes
+
+    def drain(self):
+        """보관 중인 프레임을 시간 순서대로 꺼내고 버퍼를 비운다."""
+        with self._lock:
+            items, self._buf = self._buf, deque()
+            self.nbytes = 0
+        return items
+
+    def __len__(self):
+        return len(self._buf)
+
+
+class CaptureThread(threading.Thread):
+    """
+    카메라 캡처 스테이지. (frame_no, timestamp, frame) 을 모든 출력으로 전달한다.
+    프레임 읽기에 실패하면 종료하고 stopped 이벤트를 설정한다.
+    stream 은 메인 / 서브스트림을 나눠 읽을 때 로그에서 구분하기 위한 이름이다.
+    """
+
+    def __init__(self, cap, camera_idx, outputs, stop_event, stream="main"):
+        super().__init__(daemon=True, name=f"capture-{camera_idx}-{stream}")
+        self.cap = cap
+        self.camera_idx = camera_idx
+        self.outputs = outputs
+        self.stop_event = stop_event
+        self.stream = stream
+        self.frames = 0
+        self.shape = None  # 마지막으로 읽은 프레임 크기 (h, w, c)
+
+    def run(self):
+        while not self.stop_event.is_set() and self.cap.isOpened():
+            ret, frame = self.cap.read()
+            if not ret:
+                logging.warning(
+                    f"[Cam {self.camera_idx}] Failed to read frame from {self.stream} stream or stream ended."
+                )
+                break
+            self.frames += 1
+            self.shape = frame.shape
+            item = (self.frames, time.time(), frame)
+            for output in self.outputs:
+                output.put(item)
+        self.stop_event.set()
+
+
+class EncoderThread(threading.Thread):
+    """
+    인코딩/출력 스테이지. 링 버퍼의 모든 프레임을 추론 속도와 무관하게 처리한다.
+
+    render(frame, frame_time) 으로 오버레이를 그린 뒤 show 가 참이면 화면에 출력하고,
+    open() 으로 writer 가 설정되어 있으면 녹화 파일에 쓴다.
+    preroll 이 있으면 녹화 중이 아닐 때의 프레임을 보관했다가 녹화 시작 시 먼저 쓴다.
+    화면 출력이 없으면 프리롤 프레임에는 오버레이를 그리지 않는다 (대기 중 CPU 사용 최소화).
+    """
+
+    def __init__(self, ring, camera_idx, render, stop_event, show=True, preroll=None):
+        super().__init__(daemon=True, name=f"encoder-{camera_idx}")
+        self.ring = ring
+        self.camera_idx = camera_idx
+        self.render = render
+        self.stop_event = stop_event
+        self.show = show
+        self.preroll = preroll
+        self._lock = threading.Lock()
+        self._writer = None
+        self._timestamped = False
+        self._flush_preroll = False
+
+    @property
+    def is_recording(self):
+        return self._writer is not None
+
+    def open(self, writer):
+        """
+        녹화 시작. writer 는 write()/release() 를 제공하는 객체.
+        FFmpegWriter 처럼 write(frame, frame_time) 을 받는 writer 에는 캡처 시각도 넘긴다.
+        """
+        with self._lock:
+            self._writer = writer
+            self._timestamped = hasattr(writer, "frame_shape")  # FFmpegWriter
+            self._flush_preroll = self.preroll is not None
+
+    def close(self):
+        """녹화 종료. 남은 쓰기가 끝난 뒤 writer 를 해제한다."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.release()
+        return writer is not None
+
+    def _write(self, frame, frame_time):
+        if self._timestamped:
+            self._writer.write(frame, frame_time)
+        else:
+            self._writer.write(frame)
+
+    def _write_preroll(self):
+        import cv2 as cv
+
+        items = self.preroll.drain()
+        for frame_time, jpeg in items:
+            self._write(cv.imdecode(jpeg, cv.IMREAD_COLOR), frame_time)
+        if items:
+            logging.info(
+                f"[Cam {self.camera_idx}] Wrote {len(items)} pre-roll frames "
+                f"({items[-1][0] - items[0][0]:.1f}s)."
+            )
+
+    def run(self):
+        import cv2 as cv
+
+        window = f"Person Tracking - Cam {self.camera_idx}"  # 창 제목에 카메라 ID 추가
+        while not self.stop_event.is_set():
+            item = self.ring.get(timeout=0.5)
+            if item is None:
+                continue
+            _, frame_time, frame = item
+            if not self.show and self._writer is None:
+                # 화면에도 녹화에도 나가지 않는 프레임은 오버레이를 그리지 않는다.
+                # 프리롤에는 원본 프레임을 보관한다 (녹화 앞부분은 박스 없이 기록됨)
+                if self.preroll is not None:
+                    self.preroll.put(frame_time, frame)
+                continue
+            try:
+                frame = self.render(frame.copy(), frame_time)
+            except Exception as e:
+                logging.error(f"[Cam {self.camera_idx}] Error rendering overlay: {e}")
+                traceback.print_exc()
+
+            with self._lock:
+                if self._writer is None and self.preroll is not None:
+                    self.preroll.put(frame_time, frame)
+                if self._writer is not None:
+                    try:
+                        if self._flush_preroll:
+                            self._flush_preroll = False
+                            self._write_preroll()
+                        self._write(frame, frame_time)
+                    except Exception as e:
+                        logging.error(
+                            f"[Cam {self.camera_idx}] Error writing frame to video file: {e}"
+                        )
+                        # 녹화 중단
+                        self._writer.release()
+                        self._writer = None
+
+            if self.show:
+                cv.imshow(window, frame)
+                # 종료 키 처리 ('q')
+                key = cv.waitKey(1) & 0xFF
+                if key == ord("q"):
+                    logging.info(
+                        f"[Cam {self.camera_idx}] 'q' key pressed. Exiting loop."
+                    )
+                    self.stop_event.set()
+
+        if self.show:
+            cv.destroyAllWindows()
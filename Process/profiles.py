@@ -0,0 +1,95 @@
+import logging
+
+from recognition_config import MODEL_PATH, DETECT_CONF, STRIDE
+
+# 프로필이 없는 카메라의 기본값 (기존 하드코딩 값과 동일)
+DEFAULT_PROFILE = {
+    "model_path": MODEL_PATH,
+    "imgsz": None,  # None 이면 모델 기본 입력 크기
+    "conf": DETECT_CONF,
+    "classes": None,  # None 이면 전체 클래스
+    "target_fps": None,  # None 이면 가능한 최대 속도로 추론
+    "roi": None,  # (x1, y1, x2, y2) 0~1 비율 좌표
+    "stride": STRIDE,  # N 프레임마다 추론
+    "latency_budget_ms": None,  # 설정 시 자동 튜닝으로 지연 시간 예산 유지
+}
+
+
+def _parse_list(text, cast):
+    if text is None or str(text).strip() == "":
+        return None
+    return [cast(v) for v in str(text).split(",") if v.strip() != ""]
+
+
+def parse_profile(row):
+    """detection_profiles 행(DictCursor)을 프로필 딕셔너리로 변환"""
+    profile = dict(DEFAULT_PROFILE)
+    if not row:
+        return profile
+
+    if row.get("model_path"):
+        profile["model_path"] = row["model_path"]
+    if row.get("imgsz"):
+        profile["imgsz"] = int(row["imgsz"])
+    if row.get("conf") is not None:
+        profile["conf"] = float(row["conf"])
+    if row.get("target_fps"):
+        profile["target_fps"] = float(row["target_fps"])
+    if row.get("stride"):
+        profile["stride"] = max(1, int(row["stride"]))
+    if row.get("latency_budget_ms"):
+        profile["latency_budget_ms"] = int(row["latency_budget_ms"])
+    try:
+        classes = _parse_list(row.get("classes"), int)
+        if classes:
+            profile["classes"] = classes
+        roi = _parse_list(row.get("roi"), float)
+        if roi:
+            x1, y1, x2, y2 = roi
+            if 0 <= x1 < x2 <= 1 and 0 <= y1 < y2 <= 1:
+                profile["roi"] = (x1, y1, x2, y2)
+            else:
+                logging.warning(f"Ignoring invalid ROI in detection profile: {roi}")
+    except ValueError as e:
+        logging.warning(f"Invalid detection profile {row.get('id')}: {e}")
+    return profile
+
+
+def load_profile(cur, profile_id):
+    """카메라에 연결된 검출 프로필 조회. 없으면 기본 프로필"""
+    if not profile_id:
+        return dict(DEFAULT_PROFILE)
+    try:
+        cur.execute("SELECT * FROM detection_profiles WHERE id=%s", (profile_id,))
+        return parse_profile(cur.fetchone())
+    except Exception as e:
+        logging.error(f"Failed to load detection profile {profile_id}: {e}")
+        return dict(DEFAULT_PROFILE)
+
+
+def crop_roi(frame, roi):
+    """ROI 영역을 잘라낸 뷰와 전체 프레임 기준 오프셋 (x, y) 반환"""
+    if roi is None:
+        return frame, (0, 0)
+    h, w = frame.shape[:2]
+    x1, y1 = int(roi[0] * w), int(roi[1] * h)
+    x2, y2 = int(roi[2] * w), int(roi[3] * h)
+    return frame[y1:y2, x1:x2], (x1, y1)
+
+
+def offset_detections(dets, offset):
+    """ROI 기준 박스 좌표를 전체 프레임 좌표로 변환 (제자리 수정)"""
+    ox, oy = offset
+    if (ox or oy) and len(dets):
+        dets[:, [0, 2]] += ox
+        dets[:, [1, 3]] += oy
+    return dets
+
+
+def scale_detections(dets, scale):
+    """서브스트림 기준 박스 좌표를 메인 스트림 해상도로 변환 (제자리 수정)"""
+    sx, sy = scale
+    if (sx != 1.0 or sy != 1.0) and len(dets):
+        dets[:, 0:4:2] *= sx
+        dets[:, 1:4:2] *= sy
+    return dets
@@ -0,0 +1,138 @@
+"""
+검출 모델 INT8 양자화 (ONNX Runtime 정적 양자화).
+
+우리 녹화 영상에서 고르게 뽑은 프레임으로 보정(calibration)한 뒤
+yolo11n_int8.onnx 처럼 INT8 ONNX 모델을 만든다. 만든 모델은 검출 프로필의
+model_path 로 지정하면 ProcessVideo / 추론 서버에서 바로 사용된다.
+Secure 모드 카메라에 적용하기 전에 bench/bench_int8.py 로 인원 수 오차를 확인할 것.
+
+사용법 (Process 디렉터리에서 실행, onnx / onnxruntime 패키지 필요):
+    python quantize.py ../apps/videos --model yolo11n.pt --samples 300
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import cv2 as cv
+import numpy as np
+
+from backends import export_model
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv")
+
+
+def int8_path(model_path):
+    path = Path(model_path)
+    return str(path.with_name(path.stem + "_int8.onnx"))
+
+
+def find_videos(paths):
+    """파일 / 디렉터리 목록에서 영상 파일 경로 수집"""
+    videos = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            videos.extend(sorted(f for f in p.rglob("*") if f.suffix.lower() in VIDEO_EXTENSIONS))
+        elif p.suffix.lower() in VIDEO_EXTENSIONS:
+            videos.append(p)
+    return videos
+
+
+def sample_frames(videos, count):
+    """여러 영상에서 전체 길이에 고르게 분포하도록 count 장을 뽑는다."""
+    per_video = max(1, count // max(len(videos), 1))
+    frames = []
+    for video in videos:
+        cap = cv.VideoCapture(str(video))
+        total = int(cap.get(cv.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            cap.release()
+            continue
+        for idx in np.linspace(0, total - 1, min(per_video, total)).astype(int):
+            cap.set(cv.CAP_PROP_POS_FRAMES, int(idx))
+            ret, frame = cap.read()
+            if ret:
+                frames.append(frame)
+        cap.release()
+    return frames[:count]
+
+
+def preprocess(frame, imgsz):
+    """ultralytics 와 같은 letterbox 전처리 -> 1 x 3 x imgsz x imgsz float32"""
+    h, w = frame.shape[:2]
+    r = min(imgsz / h, imgsz / w)
+    nh, nw = round(h * r), round(w * r)
+    resized = cv.resize(frame, (nw, nh), interpolation=cv.INTER_LINEAR)
+    canvas = np.full((imgsz, imgsz, 3), 114, np.uint8)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    canvas[top : top + nh, left : left + nw] = resized
+    blob = canvas[:, :, ::-1].transpose(2, 0, 1)[None]  # BGR -> RGB, HWC -> NCHW
+    return np.ascontiguousarray(blob, dtype=np.float32) / 255.0
+
+
+def quantize_model(model_path, videos, imgsz=640, samples=300, per_channel=True):
+    """녹화 프레임으로 보정한 INT8 ONNX 모델을 만들고 경로를 반환한다."""
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self, frames, input_name):
+            self.frames = iter(frames)
+            self.input_name = input_name
+
+        def get_next(self):
+            frame = next(self.frames, None)
+            if frame is None:
+                return None
+            return {self.input_name: preprocess(frame, imgsz)}
+
+    frames = sample_frames(videos, samples)
+    if not frames:
+        raise ValueError("No calibration frames found in the given recordings.")
+    logging.info(f"Calibrating with {len(frames)} frames from {len(videos)} recordings")
+
+    fp32_path = export_model(model_path, "onnx", imgsz=imgsz)
+    output_path = int8_path(model_path)
+    fp32 = onnx.load(fp32_path)
+    reader = FrameReader(frames, fp32.graph.input[0].name)
+    quantize_static(
+        fp32_path,
+        output_path,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=per_channel,
+    )
+
+    # ultralytics 가 클래스 이름 / stride 를 읽을 수 있도록 메타데이터 복사
+    quantized = onnx.load(output_path)
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(fp32.metadata_props)
+    onnx.save(quantized, output_path)
+    logging.info(f"INT8 model saved: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recordings", nargs="+", help="보정용 녹화 영상 파일 또는 디렉터리")
+    parser.add_argument("--model", default="yolo11n.pt")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--samples", type=int, default=300)
+    parser.add_argument("--per-tensor", action="store_true", help="채널별 대신 텐서 단위 가중치 양자화")
+    args = parser.parse_args()
+
+    quantize_model(
+        args.model,
+        find_videos(args.recordings),
+        imgsz=args.imgsz,
+        samples=args.samples,
+        per_channel=not args.per_tensor,
+    )
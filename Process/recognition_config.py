@@ -0,0 +1,140 @@
+# 인식 모듈 실행 설정
+
+# 모델 / 추적 설정
+MODEL_PATH = "yolo11n.pt"
+DETECT_CONF = 0.3
+TRACKER_CONFIG = "botsort.yaml"  # model.track 기본 추적기와 동일
+PERSON_CLASS_ID = 0  # COCO 'person'
+
+# 검출 백엔드: "torch" (PyTorch) / "onnx" (ONNX Runtime) / "openvino" (OpenVINO IR)
+# onnx / openvino 는 해당 런타임 패키지가 설치되어 있어야 한다.
+DETECT_BACKEND = "torch"
+BACKEND_AUTO_EXPORT = True  # 내보낸 모델이 없으면 시작 시 .pt 에서 자동으로 내보낸다
+
+# 추론 구현: "ultralytics" (model.predict) / "fast" (단일 클래스 경량 경로, torch 백엔드 전용)
+DETECTOR_IMPL = "ultralytics"
+FAST_IMGSZ = 640  # 프로필에 입력 크기가 없을 때 사용
+FAST_IOU = 0.7  # NMS IoU 임계값 (ultralytics 기본값과 동일)
+FAST_MAX_DET = 300
+FAST_THREADS = 0  # torch 스레드 수 (0 이면 기본값)
+
+# 화면 출력 (cv.imshow) 없이 실행. True 이면 모든 카메라에 적용되고,
+# False 이면 cams.headless 가 설정된 카메라만 headless 로 실행한다.
+HEADLESS = False
+
+# 추론 방식
+# "process" : 카메라 프로세스마다 모델을 로드하여 직접 추론 (기존 방식)
+# "server"  : 공유 추론 서버가 여러 카메라의 프레임을 배치로 묶어 추론
+INFERENCE_MODE = "process"
+
+# 추론 서버 설정 (INFERENCE_MODE = "server")
+INFERENCE_WORKERS = 2  # 추론 워커 프로세스 수 (워커마다 모델 1개)
+INFERENCE_BATCH_SIZE = 8  # 한 번에 묶는 최대 프레임 수
+INFERENCE_BATCH_TIMEOUT = 0.01  # 배치를 채우기 위해 기다리는 최대 시간(초)
+INFERENCE_RESPONSE_TIMEOUT = 5.0  # 카메라 프로세스가 결과를 기다리는 최대 시간(초)
+
+# 파이프라인 설정
+RECORD_RING_SIZE = 60  # 캡처 -> 인코딩 링 버퍼 크기 (프레임)
+
+# 카메라 릴레이 (relay.py): 카메라당 연결 / 디코딩 1회, 프레임은 공유 메모리로 공유
+RELAY = False  # True 이면 카메라에 직접 접속하지 않고 릴레이에서 프레임을 받는다
+RELAY_SLOTS = 4  # 카메라당 공유 메모리 프레임 슬롯 수
+RELAY_CONNECT_TIMEOUT = 10  # 릴레이 공유 메모리가 생길 때까지 기다리는 시간(초)
+RELAY_RETRY_MAX = 30  # 카메라 재접속 최대 대기(초)
+RELAY_RELOAD_INTERVAL = 60  # cams 테이블 재조회 주기(초)
+
+# 녹화기: "opencv" (cv.VideoWriter, avc1) / "ffmpeg" (ffmpeg 하위 프로세스, libx264 조각 MP4)
+RECORDER = "opencv"
+FFMPEG_PRESET = "veryfast"  # libx264 preset (ultrafast ~ veryslow)
+FFMPEG_CRF = 23  # 화질 (낮을수록 고화질 / 큰 파일)
+RECORD_FALLBACK_FPS = 15  # 카메라가 fps 를 알려주지 않을 때 (ffmpeg 녹화기)
+
+# 감지 녹화 방식
+# "video"  : 박스를 그린 영상을 따로 인코딩해서 업로드 (videos.is_dt = 1)
+# "sidecar": 영상은 만들지 않고 검출 결과만 사이드카 파일(sidecar.py)로 기록한다.
+#            원본 녹화 재생 화면에서 브라우저가 박스를 그린다. (원본 녹화가 켜져 있어야 함)
+ANNOTATION_MODE = "video"
+
+# 녹화 프리롤: REC ON 이전 N초 프레임을 JPEG 로 압축해 메모리에 보관하고
+# 녹화 시작 시 파일 앞부분에 먼저 기록한다. 0 이면 사용하지 않는다.
+# 켜면 녹화 중이 아닐 때도 모든 프레임을 JPEG 로 인코딩하므로 카메라마다 CPU 를 상시 사용한다.
+PREROLL_SECONDS = 0
+PREROLL_MAX_MB = 64  # 카메라당 최대 메모리 (초과 시 오래된 프레임부터 버림)
+PREROLL_JPEG_QUALITY = 80
+
+# 움직임 필터 (정적인 장면에서는 추론 생략)
+MOTION_GATE = False  # True 이면 장면 변화가 없을 때 이전 인원 수를 유지 (기존 배포의 동작이 바뀌므로 선택 사항)
+MOTION_WIDTH = 160  # 비교용 축소 프레임 너비 (px)
+MOTION_PIXEL_THRESHOLD = 25  # 픽셀 밝기 차이 임계값 (0~255)
+MOTION_MIN_AREA = 0.002  # 변화 픽셀 비율이 이 값 이상이면 움직임으로 판단
+MOTION_REFRESH_INTERVAL = 1.0  # 변화가 없어도 이 간격(초)마다 추론하여 추적기 유지
+
+# 간격 추론 (N 프레임마다 추론, 중간 프레임은 박스 보간)
+STRIDE = 1  # 기본 추론 간격 (1 = 매 프레임). 카메라별 값은 검출 프로필에서 설정
+STRIDE_CROWD_COUNT = 5  # 이 인원 이상이면 간격을 절반으로
+STRIDE_FAST_SPEED = 1.0  # 박스가 초당 자기 높이 이상 움직이면 매 프레임 추론
+STRIDE_MAX_EXTRAPOLATION = 1.0  # 보간으로 박스를 예측하는 최대 시간(초)
+
+# 자동 튜닝 (검출 프로필에 지연 시간 예산이 있는 카메라만)
+# 단계 0 이 가장 무겁고 정확한 설정. 지연이 예산을 넘으면 다음 단계로 내려간다.
+AUTOTUNE_LADDER = [
+    {"model_path": "yolo11s.pt", "imgsz": 640, "target_fps": None},
+    {"model_path": "yolo11n.pt", "imgsz": 640, "target_fps": None},
+    {"model_path": "yolo11n.pt", "imgsz": 480, "target_fps": 10},
+    {"model_path": "yolo11n.pt", "imgsz": 320, "target_fps": 5},
+    {"model_path": "yolo11n.pt", "imgsz": 320, "target_fps": 2},
+]
+AUTOTUNE_START_LEVEL = 1  # 프로필이 단계에 없을 때: 프로필 설정 다음에 이어 붙일 첫 단계
+AUTOTUNE_INTERVAL = 5  # 조정 판단 주기(초)
+AUTOTUNE_WINDOW = 50  # 지연 시간 측정 표본 수
+AUTOTUNE_COOLDOWN = 15  # 단계 변경 후 다음 변경까지 최소 시간(초)
+AUTOTUNE_UP_RATIO = 0.5  # p90 이 예산의 이 비율 미만이면 한 단계 올린다
+AUTOTUNE_CPU_HIGH = 90  # CPU 사용률(%)이 이보다 높으면 한 단계 내린다
+AUTOTUNE_CPU_LOW = 60  # 한 단계 올리려면 CPU 사용률이 이보다 낮아야 한다
+# CPU 사용률은 시스템 전체 값이라 모든 카메라가 같은 값을 본다. 카메라들이 한꺼번에 단계를 바꾸지 않도록
+# CPU 만으로 판단할 때는 연속 N 회 조건을 만족해야 하고, 변경 후 대기 시간에 카메라별 무작위 지연을 더한다.
+AUTOTUNE_CPU_PATIENCE = 3
+AUTOTUNE_COOLDOWN_JITTER = 0.5  # 대기 시간 x (1 + 0 ~ 이 값)
+
+# 녹화 파일 업로드 (카메라 프로세스 안의 백그라운드 스레드)
+UPLOAD_WORKERS = 2  # 카메라당 업로드 스레드 수
+UPLOAD_RETRIES = 3  # 업로드 실패 시 재시도 횟수 (끝내 실패하면 로컬 파일 보존)
+UPLOAD_RETRY_DELAY = 5  # 재시도 대기 시간(초), 시도마다 늘어남
+UPLOAD_EXIT_TIMEOUT = 8  # 프로세스 종료 시 남은 업로드 대기 시간(초), main 의 종료 대기(10초)보다 짧게
+VIDEO_INSERT_INTERVAL = 5  # main: videos 행을 모아서 저장하는 주기(초)
+
+# 인원 수 통계 (count_stats.py): 로그 주기 동안의 최대 / 평균 / p95 / 추적 ID 수
+COUNT_HIST_SIZE = 256  # 히스토그램 칸 수 (이 이상 인원은 마지막 칸에 누적)
+COUNT_ID_BITS = 4096  # 추적 ID 수 추정용 비트맵 크기
+COUNT_EARLY_DELTA = 3  # 마지막 전송 값보다 이만큼 변하면 주기 로그와 별도로 "Count" 메시지를 바로 전송 (0 이면 사용 안 함)
+COUNT_EARLY_MIN_INTERVAL = 5  # 조기 전송 최소 간격(초)
+
+# 즉시 경보: main 이 현재 모드 규칙(Secure / Running 인원 제한)을 카메라 프로세스에 내려보내고,
+# 카메라 프로세스는 최근 추론 THRESHOLD_WINDOW 회의 중앙값이 제한을 넘는 순간 바로 알린다.
+THRESHOLD_WINDOW = 3
+RULES_REFRESH_INTERVAL = 5  # main: mode_schedule 확인 주기(초)
+
+# 구역 / 통과선 (zones.py): 이 시간(초) 안에 다시 보인 추적 ID 만 통과선 통과로 판단
+ZONE_TRACK_TTL = 2.0
+
+# 검출 결과 저장소 (detection_store.py): 추론 결과를 카메라 / 날짜별 파일에 모두 기록
+DETECTION_STORE = False  # True 이면 모든 추론 결과를 디스크에 기록 (카메라당 하루 수십~수백 MB)
+DETECTION_STORE_RETENTION_DAYS = 30  # 이보다 오래된 날짜 파일은 삭제 (0 이면 보관)
+
+# 점유 히트맵 (heatmap.py): 사람 발 위치를 저해상도 격자에 누적, 반감기로 감쇠
+HEATMAP = False  # True 이면 HEATMAP_SAVE_INTERVAL 마다 파일과 heatmaps 테이블에 저장
+HEATMAP_SIZE = (64, 36)  # 격자 (너비, 높이)
+HEATMAP_HALF_LIFE = 3600  # 누적값이 절반으로 줄어드는 시간(초)
+HEATMAP_SAVE_INTERVAL = 300  # 파일 / DB 저장 주기(초)
+
+# 감지 이벤트 스냅샷 (snapshots.py): 모드 감지 시작 시 카메라마다 박스를 그린 JPEG 1장
+SNAPSHOT_WORKERS = 1  # 카메라당 인코딩 스레드 수
+SNAPSHOT_JPEG_QUALITY = 85
+SNAPSHOT_ALERT_WAIT = 3  # main: 알림 메일에 첨부할 스냅샷을 기다리는 최대 시간(초)
+
+# CPU 스레드 예산 (cpu_budget.py): main 이 코어 수 / 카메라(추론 워커) 수로 워커별 스레드 수를 정해
+# 모델 로드 전에 적용한다. 워커마다 라이브러리 기본값(전체 코어 수)으로 스레드를 만드는 과다 구독 방지
+CPU_BUDGET = True
+CPU_RESERVE_CORES = 1  # main / 캡처 / 인코딩 몫으로 남겨 둘 코어 수
+CPU_THREADS_PER_WORKER = 0  # 0 이면 (코어 수 - 예약) / 워커 수
+CPU_PIN_WORKERS = False  # True 이면 워커마다 코어 묶음에 고정 (affinity)
@@ -0,0 +1,134 @@
+"""
+카메라 릴레이 서비스.
+
+카메라마다 RTSP 연결 1개 / 디코딩 1회만 유지하고, 디코딩한 프레임을 공유 메모리
+(frame_relay.RelayPublisher)로 내보낸다. 인식 모듈(RELAY = True), 원본 녹화 / 라이브 화면 /
+상태 확인(Flask USE_RELAY = True)은 카메라에 직접 접속하지 않고 릴레이를 구독한다.
+서브스트림(cams.sub_url)이 있는 카메라는 "<id>_sub" 이름으로 서브스트림도 함께 릴레이한다.
+
+사용법 (Process 디렉터리에서 인식 모듈보다 먼저 실행):
+    python relay.py
+"""
+
+import logging
+import multiprocessing
+import signal
+import time
+
+import cv2 as cv
+import pymysql
+
+from dbconfig import dbconnect
+from frame_relay import RelayPublisher
+from recognition_config import RELAY_SLOTS, RELAY_RETRY_MAX, RELAY_RELOAD_INTERVAL
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+
+def relay_camera(camera_id, camera_url, stop_event):
+    """
+    카메라 1대 릴레이 프로세스. 연결이 끊기면 점점 길게 기다리며 재접속한다.
+    stop_event 는 이 릴레이 전용이다 (서비스가 릴레이마다 따로 만든다).
+    """
+    # 서비스의 시그널 핸들러를 물려받지 않는다. Ctrl+C 는 서비스가 stop_event 로 전달하고,
+    # SIGTERM 은 이 프로세스만 종료한다.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    publisher = None
+    retry = 1
+    while not stop_event.is_set():
+        cap = cv.VideoCapture(camera_url)
+        if not cap.isOpened():
+            logging.warning(f"[Relay {camera_id}] Cannot open {camera_url}, retry in {retry}s")
+            if publisher is not None:
+                publisher.set_connected(False)
+            stop_event.wait(retry)
+            retry = min(retry * 2, RELAY_RETRY_MAX)
+            continue
+
+        retry = 1
+        fps = cap.get(cv.CAP_PROP_FPS)
+        logging.info(f"[Relay {camera_id}] Connected ({fps:.1f}fps)")
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                logging.warning(f"[Relay {camera_id}] Failed to read frame, reconnecting.")
+                break
+            if publisher is None or publisher.shape != frame.shape:
+                if publisher is not None:
+                    publisher.close()  # 해상도 변경: 구독자는 끊김으로 보고 다시 연결한다
+                h, w = frame.shape[:2]
+                publisher = RelayPublisher(camera_id, w, h, fps, RELAY_SLOTS)
+                logging.info(f"[Relay {camera_id}] Publishing {w}x{h} x {RELAY_SLOTS} slots")
+            publisher.publish(frame, time.time())
+        cap.release()
+        if publisher is not None:
+            publisher.set_connected(False)
+
+    if publisher is not None:
+        publisher.close()
+    logging.info(f"[Relay {camera_id}] Stopped.")
+
+
+def load_cameras():
+    """릴레이 이름 -> 스트림 주소 (메인: id, 서브스트림: "<id>_sub")"""
+    conn = dbconnect()
+    try:
+        cur = conn.cursor(pymysql.cursors.DictCursor)
+        cur.execute("SELECT id, cam_url, sub_url FROM cams")
+        streams = {}
+        for row in cur.fetchall():
+            streams[int(row["id"])] = row["cam_url"]
+            if row["sub_url"]:
+                streams[f"{row['id']}_sub"] = row["sub_url"]
+        return streams
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    stop_event = multiprocessing.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    relays = {}  # camera_id -> (url, Process, 릴레이 전용 stop Event)
+    while not stop_event.is_set():
+        try:
+            cameras = load_cameras()
+        except Exception as e:
+            logging.error(f"Failed to load cameras: {e}")
+            cameras = {cid: relay[0] for cid, relay in relays.items()}
+
+        # 삭제되었거나 URL 이 바뀐 카메라 중지
+        for cid in list(relays):
+            url, proc, relay_stop = relays[cid]
+            if cameras.get(cid) != url:
+                relay_stop.set()  # 이 릴레이만 중지 (공유 메모리 정리 후 종료)
+            elif proc.is_alive():
+                continue
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()  # 남은 공유 메모리는 새 릴레이가 정리한다
+                proc.join(timeout=5)
+            del relays[cid]
+
+        # 새 카메라 / 죽은 릴레이 시작
+        for cid, url in cameras.items():
+            if cid not in relays:
+                relay_stop = multiprocessing.Event()
+                proc = multiprocessing.Process(
+                    target=relay_camera, args=(cid, url, relay_stop), daemon=True
+                )
+                proc.start()
+                relays[cid] = (url, proc, relay_stop)
+                logging.info(f"[Relay {cid}] Started for {url}")
+
+        stop_event.wait(RELAY_RELOAD_INTERVAL)
+
+    for _, _, relay_stop in relays.values():
+        relay_stop.set()
+    for _, proc, _ in relays.values():
+        proc.join(timeout=5)
+    logging.info("Relay service stopped.")
@@ -13,13 +13,16 @@ s3client = boto3.client(
 
 
 def upload_file(file_name, key):
+    """업로드 성공 여부 반환"""
     try:
         s3client.upload_file(file_name, BUCKET, key)
         print(f"S3 버킷 '{BUCKET}'에 {file_name}를 {key}로 업로드했습니다.")
+        return True
     except FileNotFoundError:
         print(f"Error: 파일 '{file_name}'을 찾을 수 없습니다.")
     except Exception as e:
         print(f"S3 업로드 오류: {e}")
+    return False
 
 
 def download_file(key, file_name):
@@ -1,6 +1,8 @@
 import smtplib  # Import for email functionality
 from email.mime.text import MIMEText  # Import for email message creation
 from email.mime.multipart import MIMEMultipart
+from email.mime.image import MIMEImage
+import os
 from email_config import EMAIL_PASSWORD, EMAIL_RECEIVER, EMAIL_SENDER
 
 import traceback, logging
@@ -23,7 +25,8 @@ def send_email(subject, body):
         traceback.print_exc()
 
 
-def send_html_email(info, to_email):
+def send_html_email(info, to_email, attachments=None):
+    # attachments: 첨부할 이미지 파일 경로 목록 (감지 이벤트 스냅샷)
 
     # HTML 템플릿에 데이터 삽입
     html_template = open("./email_template.html", "r", encoding="utf-8").read()
@@ -32,11 +35,20 @@ def send_html_email(info, to_email):
     )
 
     # 이메일 구성
-    msg = MIMEMultipart("alternative")
+    msg = MIMEMultipart("mixed" if attachments else "alternative")
     msg["Subject"] = f"[경고] {info['event']} - {info['timestamp']}"
     msg["From"] = EMAIL_SENDER
     msg["To"] = to_email
     msg.attach(MIMEText(html_content, "html"))
+    for path in attachments or []:
+        try:
+            with open(path, "rb") as f:
+                image = MIMEImage(f.read(), _subtype="jpeg")
+        except OSError as e:
+            logging.error(f"Failed to attach snapshot {path}: {e}")
+            continue
+        image.add_header("Content-Disposition", "attachment", filename=os.path.basename(path))
+        msg.attach(image)
 
     try:
         with smtplib.SMTP("smtp.gmail.com", 587) as server:
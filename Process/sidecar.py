@@ -0,0 +1,98 @@
+"""
+검출 메타데이터 사이드카.
+
+주석(박스)을 그린 영상을 따로 인코딩하지 않고, 추론 결과만 작은 JSON Lines 파일로 기록한다.
+원본 녹화(Flask 원본 녹화기)를 재생할 때 play_video 페이지가 이 파일을 읽어 박스를 직접 그린다.
+인식 모듈(플랫 import)과 Flask 앱(Process.sidecar) 양쪽에서 쓰므로 설정 모듈에 의존하지 않는다.
+
+파일 배치: <folder>/cam_<id>/<YYYY-MM-DD>/<id>_<YYYYmmdd_HHMMSS>.jsonl (기록 시작 시각)
+    첫 줄  {"camera_id": 1, "width": 1920, "height": 1080, "start": 1700000000.0}
+    이후   [캡처 시각(epoch 초), [[x1, y1, x2, y2, track_id, conf, cls], ...]]
+좌표는 녹화(메인 스트림) 해상도 기준 정수, conf 는 소수 둘째 자리까지.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+FLUSH_INTERVAL = 2.0  # 초. 프로세스가 죽어도 이만큼만 잃는다
+
+
+def sidecar_dir(folder, camera_id, day):
+    return Path(folder) / f"cam_{camera_id}" / day.strftime("%Y-%m-%d")
+
+
+def sidecar_path(folder, camera_id, start_time):
+    start = datetime.fromtimestamp(start_time)
+    name = f"{camera_id}_{start.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    return sidecar_dir(folder, camera_id, start) / name
+
+
+def encode_detections(dets):
+    """검출 배열 (N x 7) -> 사이드카 행 목록"""
+    return [
+        [int(x1), int(y1), int(x2), int(y2), int(tid), round(float(conf), 2), int(cls)]
+        for x1, y1, x2, y2, tid, conf, cls in dets.tolist()
+    ]
+
+
+class SidecarWriter:
+    """녹화 1건의 검출 사이드카 파일. 추론할 때마다 write(frame_time, dets) 를 호출한다."""
+
+    def __init__(self, folder, camera_id, width, height, start_time=None):
+        start_time = start_time or time.time()
+        self.path = sidecar_path(folder, camera_id, start_time)
+        os.makedirs(self.path.parent, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        header = {"camera_id": camera_id, "width": width, "height": height, "start": start_time}
+        self._file.write(json.dumps(header) + "\n")
+        self._last_flush = time.time()
+        self.records = 0
+
+    def write(self, frame_time, dets):
+        line = [round(frame_time, 3), encode_detections(dets)]
+        self._file.write(json.dumps(line, separators=(",", ":")) + "\n")
+        self.records += 1
+        if time.time() - self._last_flush >= FLUSH_INTERVAL:
+            self._file.flush()
+            self._last_flush = time.time()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def load_detections(folder, camera_id, start, end):
+    """
+    start ~ end (datetime) 구간의 사이드카 기록.
+    반환: (frame_size (width, height) 또는 None, [[start 기준 초, 검출 행 목록], ...])
+    """
+    start_ts, end_ts = start.timestamp(), end.timestamp()
+    frame_size = None
+    frames = []
+    day = (start - timedelta(days=1)).date()  # 자정 전에 시작한 기록 포함
+    while day <= end.date():
+        directory = sidecar_dir(folder, camera_id, day)
+        day += timedelta(days=1)
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.glob("*.jsonl")):
+            with open(path, encoding="utf-8") as f:
+                try:
+                    header = json.loads(f.readline())
+                except ValueError:
+                    continue
+                if header.get("start", 0) > end_ts:
+                    continue
+                for line in f:
+                    try:
+                        frame_time, rows = json.loads(line)
+                    except ValueError:
+                        break  # 기록 도중 종료된 마지막 줄
+                    if start_ts <= frame_time <= end_ts:
+                        frame_size = frame_size or (header["width"], header["height"])
+                        frames.append([round(frame_time - start_ts, 3), rows])
+    frames.sort(key=lambda item: item[0])
+    return frame_size, frames
@@ -0,0 +1,64 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2 as cv
+
+from overlay import OverlayRenderer
+from recognition_config import SNAPSHOT_WORKERS, SNAPSHOT_JPEG_QUALITY
+
+
+def snapshot_name(camera_idx, md_idx, frame_time):
+    """SNAPSHOT_FOLDER 기준 상대 경로: cam_<id>/<YYYY-MM-DD>/md<idx>_cam<id>_<HHMMSS>.jpg"""
+    t = datetime.fromtimestamp(frame_time)
+    return f"cam_{camera_idx}/{t:%Y-%m-%d}/md{md_idx}_cam{camera_idx}_{t:%H%M%S}.jpg"
+
+
+class SnapshotWriter:
+    """
+    감지 이벤트 스냅샷 (박스를 그린 JPEG).
+
+    프레임 루프는 submit() 으로 프레임 사본과 검출 결과만 넘기고,
+    오버레이 그리기 / JPEG 인코딩 / 파일 쓰기는 작은 스레드 풀에서 한다.
+    저장이 끝나면 on_saved(md_idx, 상대 경로) 를 호출한다 (실패하면 경로는 None).
+    """
+
+    def __init__(self, camera_idx, folder, person_class_id, on_saved, workers=SNAPSHOT_WORKERS):
+        self.camera_idx = camera_idx
+        self.folder = folder
+        self.person_class_id = person_class_id
+        self.on_saved = on_saved
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"snapshot-{camera_idx}"
+        )
+        self._local = threading.local()  # 스레드별 오버레이 (스프라이트 캐시는 스레드 안전하지 않다)
+
+    def submit(self, md_idx, frame, dets, person_count, frame_time):
+        """frame 은 호출 쪽에서 복사한 것을 넘긴다 (인코더가 같은 프레임에 오버레이를 그린다)"""
+        self._pool.submit(self._write, md_idx, frame, dets, person_count, frame_time)
+
+    def _write(self, md_idx, frame, dets, person_count, frame_time):
+        name = None
+        try:
+            overlay = getattr(self._local, "overlay", None)
+            if overlay is None:
+                overlay = self._local.overlay = OverlayRenderer(self.person_class_id)
+            overlay.render(frame, dets, person_count, frame_time)
+            ok, jpeg = cv.imencode(".jpg", frame, [cv.IMWRITE_JPEG_QUALITY, SNAPSHOT_JPEG_QUALITY])
+            if not ok:
+                raise RuntimeError("JPEG encoding failed")
+            name = snapshot_name(self.camera_idx, md_idx, frame_time)
+            path = os.path.join(self.folder, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(jpeg.tobytes())
+            logging.info(f"[Cam {self.camera_idx}] Saved event snapshot: {path}")
+        except Exception as e:
+            logging.error(f"[Cam {self.camera_idx}] Failed to save event snapshot: {e}")
+            name = None
+        self.on_saved(md_idx, name)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,91 @@
+import numpy as np
+
+from detections import EMPTY_DETECTIONS
+from recognition_config import (
+    STRIDE_CROWD_COUNT,
+    STRIDE_FAST_SPEED,
+    STRIDE_MAX_EXTRAPOLATION,
+)
+
+
+class BoxInterpolator:
+    """
+    키프레임 사이 박스 보간.
+
+    키프레임(추론 결과)마다 track_id 별 박스 속도를 추정해 두고,
+    중간 프레임에서는 마지막 박스를 속도만큼 이동시킨 예측 박스를 돌려준다.
+    update() 는 추론 스레드, predict() 는 인코더 스레드에서 호출되므로
+    상태는 튜플 하나로 통째로 교체한다.
+    """
+
+    def __init__(self, smoothing=0.5, max_extrapolation=STRIDE_MAX_EXTRAPOLATION):
+        self.smoothing = smoothing
+        self.max_extrapolation = max_extrapolation
+        self._state = (EMPTY_DETECTIONS, np.zeros((0, 4), np.float32), 0.0)
+        self.speed = 0.0  # 가장 빠른 박스의 이동 속도 (박스 높이 / 초)
+
+    def update(self, dets, t):
+        prev_dets, prev_vel, prev_t = self._state
+        velocity = np.zeros((len(dets), 4), np.float32)
+        dt = t - prev_t
+        if len(dets) and len(prev_dets) and dt > 0:
+            prev_index = {int(tid): i for i, tid in enumerate(prev_dets[:, 4])}
+            for i, tid in enumerate(dets[:, 4]):
+                j = prev_index.get(int(tid))
+                if j is None:
+                    continue
+                v = (dets[i, :4] - prev_dets[j, :4]) / dt
+                velocity[i] = self.smoothing * v + (1 - self.smoothing) * prev_vel[j]
+
+        if len(dets):
+            heights = np.maximum(dets[:, 3] - dets[:, 1], 1.0)
+            center_speed = np.hypot(
+                (velocity[:, 0] + velocity[:, 2]) / 2, (velocity[:, 1] + velocity[:, 3]) / 2
+            )
+            self.speed = float((center_speed / heights).max())
+        else:
+            self.speed = 0.0
+        self._state = (dets, velocity, t)
+
+    def predict(self, t):
+        """시각 t 의 예측 검출 배열"""
+        dets, velocity, base_t = self._state
+        if not len(dets):
+            return dets
+        dt = min(max(t - base_t, 0.0), self.max_extrapolation)
+        if dt == 0.0:
+            return dets
+        predicted = dets.copy()
+        predicted[:, :4] += velocity * dt
+        return predicted
+
+
+class StrideController:
+    """
+    추론 간격(N 프레임마다 1회) 결정.
+
+    사람이 많거나 움직임이 빠르면 간격을 줄여 보간 오차를 줄인다.
+    """
+
+    def __init__(self, stride, crowd_count=STRIDE_CROWD_COUNT, fast_speed=STRIDE_FAST_SPEED):
+        self.base_stride = max(1, int(stride))
+        self.crowd_count = crowd_count
+        self.fast_speed = fast_speed
+        self.stride = self.base_stride
+        self.frames_since_keyframe = self.base_stride  # 첫 프레임은 항상 키프레임
+
+    def is_keyframe(self):
+        self.frames_since_keyframe += 1
+        if self.frames_since_keyframe >= self.stride:
+            self.frames_since_keyframe = 0
+            return True
+        return False
+
+    def adapt(self, person_count, speed):
+        stride = self.base_stride
+        if person_count >= self.crowd_count:
+            stride = max(1, stride // 2)
+        if speed >= self.fast_speed:
+            stride = 1
+        self.stride = stride
+        return stride
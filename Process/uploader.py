@@ -0,0 +1,88 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+import s3client
+from recognition_config import UPLOAD_WORKERS, UPLOAD_RETRIES, UPLOAD_RETRY_DELAY
+
+
+class Uploader:
+    """
+    녹화 파일 백그라운드 업로드.
+
+    프레임 루프는 submit() 으로 완료된 파일을 넘기기만 하고,
+    워커 스레드가 S3 업로드 -> 로컬 파일 삭제 -> report(row) 를 처리한다.
+    report 는 videos 테이블 행을 메인 프로세스로 전달하는 콜백이다.
+    업로드에 끝내 실패한 파일은 로컬에 남겨 둔다.
+    """
+
+    def __init__(self, camera_idx, report, workers=UPLOAD_WORKERS):
+        self.camera_idx = camera_idx
+        self.report = report
+        self._jobs = queue.Queue()
+        self._threads = [
+            threading.Thread(
+                target=self._run, daemon=True, name=f"uploader-{camera_idx}-{i}"
+            )
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, local_path, s3_path, row):
+        self._jobs.put((local_path, s3_path, row))
+        logging.info(
+            f"[Cam {self.camera_idx}] Queued upload {local_path} (pending {self._jobs.qsize()})"
+        )
+
+    @property
+    def pending(self):
+        return self._jobs.unfinished_tasks
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                break
+            try:
+                self._upload(*job)
+            except Exception as e:
+                logging.error(f"[Cam {self.camera_idx}] Upload worker error: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def _upload(self, local_path, s3_path, row):
+        for attempt in range(1, UPLOAD_RETRIES + 1):
+            if s3client.upload_file(local_path, s3_path):
+                break
+            logging.warning(
+                f"[Cam {self.camera_idx}] Upload failed ({attempt}/{UPLOAD_RETRIES}): {local_path}"
+            )
+            time.sleep(UPLOAD_RETRY_DELAY * attempt)
+        else:
+            logging.error(
+                f"[Cam {self.camera_idx}] Giving up upload, file kept locally: {local_path}"
+            )
+            return
+
+        try:
+            os.remove(local_path)
+            logging.info(f"로컬 파일 {local_path} 삭제완료")
+        except OSError:
+            logging.error(f"로컬 파일 {local_path} 삭제실패")
+        self.report(row)
+
+    def close(self, timeout=None):
+        """남은 업로드를 마치고 워커 종료. timeout 초 안에 끝나지 않으면 포기한다."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        deadline = None if timeout is None else time.time() + timeout
+        for t in self._threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.time()))
+        if self.pending:
+            logging.warning(
+                f"[Cam {self.camera_idx}] {self.pending} uploads still pending at exit."
+            )
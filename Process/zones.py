@@ -0,0 +1,150 @@
+import logging
+
+import cv2 as cv
+import numpy as np
+
+from recognition_config import ZONE_TRACK_TTL
+
+MAX_ZONES = 32  # 마스크 1픽셀의 비트 수 (구역끼리 겹칠 수 있다)
+
+
+def parse_points(text):
+    """"x1,y1,x2,y2,..." (0~1 비율) -> (N, 2) 배열. 형식이 틀리면 None"""
+    try:
+        values = [float(v) for v in str(text or "").split(",") if v.strip() != ""]
+    except ValueError:
+        return None
+    if len(values) < 4 or len(values) % 2 or not all(0 <= v <= 1 for v in values):
+        return None
+    return np.array(values, np.float64).reshape(-1, 2)
+
+
+def load_zones(cur, camera_id):
+    """카메라의 구역(다각형) / 통과선 목록. 형식이 틀린 항목은 건너뛴다."""
+    try:
+        cur.execute(
+            "SELECT id, name, kind, points FROM zones WHERE camera_id=%s ORDER BY id",
+            (camera_id,),
+        )
+        rows = cur.fetchall()
+    except Exception as e:
+        logging.error(f"Failed to load zones for camera {camera_id}: {e}")
+        return []
+    zones = []
+    for row in rows:
+        points = parse_points(row["points"])
+        kind = row.get("kind") or "zone"
+        if points is None or (kind == "zone" and len(points) < 3) or (kind == "line" and len(points) != 2):
+            logging.warning(f"Ignoring invalid {kind} {row['id']} ({row['name']}): {row['points']}")
+            continue
+        zones.append({"id": int(row["id"]), "name": row["name"], "kind": kind, "points": points})
+    return zones
+
+
+class ZoneCounter:
+    """
+    구역별 인원 수 / 통과선 통과 수.
+
+    구역 다각형은 추론 해상도에서 한 번만 비트 마스크(픽셀마다 구역 비트)로 그려 두고,
+    프레임마다 사람 박스의 발 위치(아래 가운데)로 마스크를 조회한다.
+    통과선은 추적 ID 별 직전 발 위치와 현재 발 위치를 잇는 선분이 통과선과 교차하는지로 센다.
+    통과선의 A -> B 방향 기준 오른쪽에서 왼쪽으로 넘어가면 "in", 반대는 "out" 이다.
+    """
+
+    def __init__(self, zones, person_class_id, track_ttl=ZONE_TRACK_TTL):
+        self.zones = [z for z in zones if z["kind"] == "zone"][:MAX_ZONES]
+        self.lines = [z for z in zones if z["kind"] == "line"]
+        self.person_class_id = person_class_id
+        self.track_ttl = track_ttl
+        self.shape = None
+        self.mask = None
+        self._segments = None  # (L, 2, 2) 통과선 픽셀 좌표
+        self._feet = {}  # track_id -> (x, y, time)
+        self.counts = {z["id"]: 0 for z in self.zones}
+        self.max = dict(self.counts)
+        self.crossings = {line["id"]: [0, 0] for line in self.lines}
+
+    def __bool__(self):
+        return bool(self.zones or self.lines)
+
+    def _build(self, height, width):
+        scale = np.array([width, height], np.float64)
+        self.mask = np.zeros((height, width), np.uint32)
+        layer = np.zeros((height, width), np.uint8)
+        for bit, zone in enumerate(self.zones):
+            layer[:] = 0
+            cv.fillPoly(layer, [np.round(zone["points"] * scale).astype(np.int32)], 1)
+            self.mask |= layer.astype(np.uint32) << np.uint32(bit)
+        if self.lines:
+            self._segments = np.stack([line["points"] * scale for line in self.lines])
+        self.shape = (height, width)
+
+    def update(self, frame_shape, dets, frame_time):
+        """추론 1회 결과 (dets 는 추론 프레임 좌표). 구역별 현재 인원 수 dict 반환"""
+        height, width = frame_shape[:2]
+        if self.shape != (height, width):
+            self._build(height, width)
+        persons = dets[dets[:, 6].astype(int) == self.person_class_id]
+        feet_x = (persons[:, 0] + persons[:, 2]) / 2
+        feet_y = persons[:, 3]
+
+        if self.zones:
+            xi = np.clip(feet_x.astype(np.int32), 0, width - 1)
+            yi = np.clip(feet_y.astype(np.int32) - 1, 0, height - 1)
+            bits = self.mask[yi, xi]
+            inside = (bits[:, None] >> np.arange(len(self.zones), dtype=np.uint32)) & 1
+            for zone, count in zip(self.zones, inside.sum(axis=0).tolist()):
+                self.counts[zone["id"]] = count
+                self.max[zone["id"]] = max(self.max[zone["id"]], count)
+
+        if self.lines:
+            self._count_crossings(persons[:, 4].astype(np.int64), feet_x, feet_y, frame_time)
+        return self.counts
+
+    def _count_crossings(self, track_ids, feet_x, feet_y, frame_time):
+        prev = []
+        current = []
+        for tid, x, y in zip(track_ids.tolist(), feet_x.tolist(), feet_y.tolist()):
+            last = self._feet.get(tid)
+            if last is not None and frame_time - last[2] <= self.track_ttl:
+                prev.append(last[:2])
+                current.append((x, y))
+            self._feet[tid] = (x, y, frame_time)
+        # 오래 보이지 않은 추적 ID 정리 (메모리 상한)
+        if len(self._feet) > 4 * max(len(track_ids), 16):
+            self._feet = {
+                tid: v for tid, v in self._feet.items() if frame_time - v[2] <= self.track_ttl
+            }
+        if not prev:
+            return
+
+        p0 = np.array(prev)[:, None, :]  # (K, 1, 2)
+        p1 = np.array(current)[:, None, :]
+        a = self._segments[None, :, 0, :]  # (1, L, 2)
+        b = self._segments[None, :, 1, :]
+
+        def cross(u, v):
+            return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+        side0 = cross(b - a, p0 - a)  # (K, L)
+        side1 = cross(b - a, p1 - a)
+        straddle = cross(p1 - p0, a - p0) * cross(p1 - p0, b - p0) < 0
+        crossed = (side0 * side1 < 0) & straddle
+        entered = (crossed & (side0 > 0)).sum(axis=0)
+        exited = (crossed & (side0 < 0)).sum(axis=0)
+        for line, n_in, n_out in zip(self.lines, entered.tolist(), exited.tolist()):
+            self.crossings[line["id"]][0] += n_in
+            self.crossings[line["id"]][1] += n_out
+
+    def summary(self):
+        """로그 주기 통계: {"zones": {id: [현재, 최대]}, "lines": {id: [in, out]}}"""
+        return {
+            "zones": {zid: [self.counts[zid], self.max[zid]] for zid in self.counts},
+            "lines": {lid: list(c) for lid, c in self.crossings.items()},
+        }
+
+    def reset(self):
+        """새 로그 주기 시작"""
+        self.max = dict(self.counts)
+        for c in self.crossings.values():
+            c[0] = c[1] = 0
@@ -13,14 +13,107 @@ import random
 
 from S3upload.s3client import upload_file
 from S3upload.s3_config import BUCKET
+from Process.ffmpeg_writer import FFmpegWriter, StreamCopyRecorder
+from Process.frame_relay import RelaySubscriber
 
 camera_streams: dict[int, Thread] = {}
 
 
+def finish_segment(camera, local_path, s3_file_path, start_time, reason):
+    """녹화가 끝난 파일 업로드 -> 로컬 삭제 -> Videos 행 저장"""
+    upload_file(
+        local_path,
+        s3_file_path,
+    )
+    current_app.logger.info(
+        f"{local_path} -> s3://{BUCKET}/{s3_file_path} 저장 완료({reason})"
+    )
+    time.sleep(1)
+    os.remove(local_path)
+    current_app.logger.info(f"로컬 파일 {local_path} 삭제완료")
+    new_video = Videos(
+        camera_id=camera.id,
+        camera_name=camera.cam_name,
+        video_path=s3_file_path,
+        recorded_date=start_time.strftime("%Y-%m-%d"),
+        recorded_time=start_time.time(),  # .time() 속성으로 시간만 저장
+    )
+    db.session.add(new_video)
+    db.session.commit()
+
+
+def finish_ffmpeg_segments(camera, writer, reason):
+    """ffmpeg 녹화기가 완료한 세그먼트 처리. 파일 이름에서 시작 시간을 읽는다."""
+    for local_path in writer.pop_finished():
+        timestamp = Path(local_path).stem.split("_", 1)[1]  # {camera_id}_{%Y%m%d_%H%M%S}
+        start_time = datetime.strptime(timestamp, "%Y%m%d_%H%M%S")
+        now_day_local = start_time.strftime("%Y-%m-%d")
+        s3_file_path = (
+            f"videos/{now_day_local}/{camera.id}/{camera.id}_{timestamp}.mp4"
+        )
+        finish_segment(camera, local_path, s3_file_path, start_time, reason)
+
+
+def record_stream_copy(camera, camera_url):
+    """
+    원본 스트림을 디코딩 없이 세그먼트 파일로 저장 (RECORDER = "copy").
+    세그먼트는 벽시계 기준 RECORD_SEGMENT_SECONDS 경계에서 전환된다.
+    릴레이는 디코딩된 프레임만 공유하므로 이 모드는 카메라에 직접 접속한다.
+    """
+    camera_id = camera.id
+    segment_seconds = current_app.config.get("RECORD_SEGMENT_SECONDS", 600)
+    video_dir = Path(current_app.config["VIDEO_FOLDER"]) / "segments" / str(camera_id)
+    if not video_dir.exists():
+        os.makedirs(video_dir)
+
+    try:
+        recorder = StreamCopyRecorder(
+            camera_url,
+            str(video_dir / f"{camera_id}_%Y%m%d_%H%M%S.mp4"),
+            segment_seconds=segment_seconds,
+        )
+    except Exception as e:
+        current_app.logger.error(f"카메라 ID {camera_id} 스트림 복사 녹화 시작 실패: {e}")
+        camera.is_recording = False
+        db.session.commit()
+        return
+
+    camera.is_active = True
+    camera.is_recording = True
+    db.session.commit()
+
+    try:
+        current_app.logger.info(f"카메라 ID {camera_id}: 스트림 복사 녹화 시작")
+        while Cams.query.get(camera_id).is_recording and camera_id in camera_streams:
+            if not recorder.isOpened():
+                current_app.logger.warning(
+                    f"카메라 ID {camera_id} ({camera_url}) 스트림이 종료되었습니다."
+                )
+                break
+            finish_ffmpeg_segments(camera, recorder, f"{segment_seconds}초 경과")
+            time.sleep(1)
+    except Exception as e:
+        current_app.logger.error(f"카메라 ID {camera_id} 녹화 중 오류 발생: {e}")
+        db_camera = Cams.query.get(camera_id)
+        if db_camera:
+            db_camera.is_recording = False
+            db.session.commit()
+    finally:
+        recorder.release()
+        finish_ffmpeg_segments(camera, recorder, "종료")
+        current_app.logger.info(
+            f"카메라 ID {camera_id} ({camera_url}) 연결 종료 (녹화)."
+        )
+
+
 def record_original_video(camera_url, camera_id):
     """
     주어진 카메라 URL에서 영상을 읽어와 원본 영상을 녹화하고 저장하는 함수 (ID 사용).
 
+    RECORDER 설정이 "copy" 이면 디코딩 없이 원본 스트림을 그대로 저장하고,
+    "ffmpeg" 이면 ffmpeg 하위 프로세스가 인코딩과 세그먼트 전환을 맡고,
+    "opencv" 이면 cv.VideoWriter 로 직접 인코딩한다.
+
     Args:
         camera_url (str): 카메라 URL.
         camera_id (int): 카메라 ID.
@@ -30,7 +123,14 @@ def record_original_video(camera_url, camera_id):
         current_app.logger.error(f"ID가 {camera_id}인 카메라를 찾을 수 없습니다.")
         return
 
-    cap = cv.VideoCapture(camera_url)
+    if current_app.config.get("RECORDER") == "copy":
+        record_stream_copy(camera, camera_url)
+        return
+
+    if current_app.config.get("USE_RELAY"):
+        cap = RelaySubscriber(camera_id)  # 릴레이가 디코딩한 프레임 사용
+    else:
+        cap = cv.VideoCapture(camera_url)
     if not cap.isOpened():
         current_app.logger.error(
             f"카메라 ID {camera_id} ({camera_url})를 열 수 없습니다."
@@ -49,6 +149,8 @@ def record_original_video(camera_url, camera_id):
     if not video_base_dir.exists():
         os.makedirs(video_base_dir)
 
+    use_ffmpeg = current_app.config.get("RECORDER") == "ffmpeg"
+    segment_seconds = current_app.config.get("RECORD_SEGMENT_SECONDS", 600)
     out = None
     current_record_filename = None
     record_start_time = time.time()
@@ -77,6 +179,26 @@ def record_original_video(camera_url, camera_id):
                 )
                 break
 
+            if frame_rate is None and use_ffmpeg:
+                frame_rate = cap.get(cv.CAP_PROP_FPS) or current_app.config.get(
+                    "VIDEO_FPS", 60
+                )
+                frame_height, frame_width, _ = frame.shape
+                # 세그먼트 파일은 카메라별 폴더에 만들고, 완료되면 업로드 후 삭제
+                video_dir = video_base_dir / "segments" / str(camera_id)
+                if not video_dir.exists():
+                    os.makedirs(video_dir)
+                out = FFmpegWriter(
+                    str(video_dir / f"{camera_id}_%Y%m%d_%H%M%S.mp4"),
+                    frame_width,
+                    frame_height,
+                    frame_rate,
+                    preset=current_app.config.get("FFMPEG_PRESET", "veryfast"),
+                    crf=current_app.config.get("FFMPEG_CRF", 23),
+                    segment_seconds=segment_seconds,
+                    align_to_clock=True,
+                )
+
             if frame_rate is None:
                 frame_rate = current_app.config.get("VIDEO_FPS", 60)  # 기본 FPS 설정
                 frame_height, frame_width, _ = frame.shape
@@ -104,6 +226,12 @@ def record_original_video(camera_url, camera_id):
                 record_start_time = now  # 최초 녹화 시작 시간 (datetime 객체)
                 # print(record_start_time)
 
+            if use_ffmpeg:
+                # 세그먼트 전환은 ffmpeg 가 파이프를 닫지 않고 처리한다
+                out.write(frame)
+                finish_ffmpeg_segments(camera, out, f"{segment_seconds}초 경과")
+                continue
+
             if out is not None and frame_rate is not None:
                 out.write(frame)
 
@@ -111,33 +239,19 @@ def record_original_video(camera_url, camera_id):
             elapsed_time = (
                 current_time_sec - record_start_time.timestamp()
             )  # datetime 객체로 비교
-            if elapsed_time >= 600:
-                # 10분이 경과하면 현재 파일을 저장하고 새로운 파일로 전환
+            if elapsed_time >= segment_seconds:
+                # 세그먼트 길이가 지나면 현재 파일을 저장하고 새로운 파일로 전환
                 if out is not None:
                     out.release()
 
                     time.sleep(1)
-                    upload_file(
+                    finish_segment(
+                        camera,
                         current_record_filename,
                         s3_file_path,
+                        record_start_time,
+                        f"{segment_seconds}초 경과",
                     )
-                    current_app.logger.info(
-                        f"{current_record_filename} -> s3://{BUCKET}/{s3_file_path} 저장 완료(10분경과)"
-                    )
-                    time.sleep(1)
-                    os.remove(current_record_filename)
-                    current_app.logger.info(
-                        f"로컬 파일 {current_record_filename} 삭제완료"
-                    )
-                    new_video = Videos(
-                        camera_id=camera_id,
-                        camera_name=camera.cam_name,
-                        video_path=s3_file_path,
-                        recorded_date=now_day_local,
-                        recorded_time=record_start_time.time(),  # .time() 속성으로 시간만 저장
-                    )
-                    db.session.add(new_video)
-                    db.session.commit()
 
                     now = datetime.now()
                     timestamp = now.strftime("%Y%m%d_%H%M%S")
@@ -172,26 +286,16 @@ def record_original_video(camera_url, camera_id):
         if out is not None:
             out.release()
             time.sleep(1)
-            upload_file(
-                current_record_filename,
-                s3_file_path,
-            )
-            current_app.logger.info(
-                f"{current_record_filename} -> s3://{BUCKET}/{s3_file_path} 저장 완료(종료)"
-            )
-            time.sleep(1)
-            os.remove(current_record_filename)
-            current_app.logger.info(f"로컬 파일 {current_record_filename} 삭제완료")
-            time.sleep(1)
-            end_video = Videos(
-                camera_id=camera_id,
-                camera_name=camera.cam_name,
-                video_path=s3_file_path,
-                recorded_date=now_day_local,
-                recorded_time=record_start_time.time(),  # 마지막 세그먼트 시작 시간
-            )
-            db.session.add(end_video)
-            db.session.commit()
+            if use_ffmpeg:
+                finish_ffmpeg_segments(camera, out, "종료")
+            else:
+                finish_segment(
+                    camera,
+                    current_record_filename,
+                    s3_file_path,
+                    record_start_time,  # 마지막 세그먼트 시작 시간
+                    "종료",
+                )
 
         time.sleep(1)
         cap.release()
@@ -1,7 +1,15 @@
 # 기업 연계 프로젝트 1
 from flask_wtf import FlaskForm
-from wtforms import StringField, SubmitField, SelectField, DateField
-from wtforms.validators import DataRequired, URL, Optional
+from wtforms import (
+    StringField,
+    SubmitField,
+    SelectField,
+    DateField,
+    BooleanField,
+    IntegerField,
+    FloatField,
+)
+from wtforms.validators import DataRequired, URL, Optional, NumberRange, Regexp
 
 # 카메라 등록 폼 클래스
 
@@ -14,9 +22,69 @@ class CameraForm(FlaskForm):
         "카메라 영상 주소",
         validators=[DataRequired("카메라 영상 주소는 필수 입니다.")],
     )
+    sub_url = StringField("서브스트림 주소 (인식용, 선택)", validators=[Optional()])
+    headless = BooleanField("화면 출력 없이 인식 (headless)")
+    profile_id = SelectField(
+        "검출 프로필", coerce=int, choices=[(0, "기본 설정")], default=0
+    )
     submit = SubmitField("카메라 등록")
 
 
+class DetectionProfileForm(FlaskForm):
+    name = StringField(
+        "프로필 이름", validators=[DataRequired("프로필 이름은 필수 입니다.")]
+    )
+    model_path = StringField("모델 파일 (.pt, .onnx, INT8: _int8.onnx)", default="yolo11n.pt")
+    imgsz = IntegerField(
+        "추론 입력 크기 (px)", validators=[Optional(), NumberRange(min=32, max=1920)]
+    )
+    conf = FloatField("신뢰도 임계값", default=0.3, validators=[NumberRange(0, 1)])
+    classes = StringField(
+        "클래스 필터 (예: 0)",
+        default="0",
+        validators=[Optional(), Regexp(r"^\d+(,\d+)*$", message="숫자를 쉼표로 구분해 주세요.")],
+    )
+    target_fps = FloatField(
+        "목표 추론 fps", validators=[Optional(), NumberRange(min=0.1, max=60)]
+    )
+    roi = StringField(
+        "ROI (x1,y1,x2,y2 / 0~1 비율)",
+        validators=[
+            Optional(),
+            Regexp(
+                r"^[01](\.\d+)?(,[01](\.\d+)?){3}$",
+                message="0~1 사이 값 4개를 쉼표로 구분해 주세요.",
+            ),
+        ],
+    )
+    stride = IntegerField(
+        "추론 간격 (N 프레임)", default=1, validators=[Optional(), NumberRange(1, 30)]
+    )
+    latency_budget_ms = IntegerField(
+        "지연 예산 (ms, 자동 튜닝)", validators=[Optional(), NumberRange(50, 10000)]
+    )
+    submit = SubmitField("프로필 등록")
+
+
+class ZoneForm(FlaskForm):
+    camera_id = SelectField("카메라", coerce=int, choices=[])
+    name = StringField("이름", validators=[DataRequired("이름은 필수 입니다.")])
+    kind = SelectField(
+        "종류", choices=[("zone", "구역 (다각형)"), ("line", "통과선 (A -> B)")]
+    )
+    points = StringField(
+        "좌표 (x1,y1,x2,y2,... / 0~1 비율)",
+        validators=[
+            DataRequired("좌표는 필수 입니다."),
+            Regexp(
+                r"^[01](\.\d+)?(,[01](\.\d+)?)*$",
+                message="0~1 사이 값을 쉼표로 구분해 주세요.",
+            ),
+        ],
+    )
+    submit = SubmitField("등록")
+
+
 class DeleteCameraForm(FlaskForm):
     submit = SubmitField("삭제")
 
@@ -25,11 +25,33 @@ from apps import db
 
 #     def is_duplicate_url(self):
 #         return Cam.query.filter_by(cam_url=self.cam_url).first()
+class DetectionProfile(db.Model):
+    """카메라별 검출 설정 (인식 모듈에서 사용)"""
+
+    __tablename__ = "detection_profiles"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(64), unique=True, nullable=False)
+    model_path = db.Column(db.String(256), default="yolo11n.pt")  # 모델 종류
+    imgsz = db.Column(db.Integer, nullable=True)  # 추론 입력 크기 (px)
+    conf = db.Column(db.Float, default=0.3)
+    classes = db.Column(db.String(64), nullable=True)  # 클래스 필터 (예: "0")
+    target_fps = db.Column(db.Float, nullable=True)  # 목표 추론 fps
+    roi = db.Column(db.String(64), nullable=True)  # "x1,y1,x2,y2" (0~1 비율)
+    stride = db.Column(db.Integer, default=1)  # N 프레임마다 추론 (중간은 박스 보간)
+    latency_budget_ms = db.Column(db.Integer, nullable=True)  # 자동 튜닝 지연 예산 (ms)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<DetectionProfile {self.name}>"
+
+
 class Cams(db.Model):
     __tablename__ = "cams"
     id = db.Column(db.Integer, primary_key=True)
     cam_name = db.Column(db.String(255), unique=True, index=True)
     cam_url = db.Column(db.String(255), nullable=False)
+    sub_url = db.Column(db.String(255), nullable=True)  # 저해상도 서브스트림 (인식용)
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     is_active = db.Column(
@@ -38,6 +60,17 @@ class Cams(db.Model):
     is_recording = db.Column(
         db.Boolean, default=False
     )
+    headless = db.Column(
+        db.Boolean, default=False
+    )  # 인식 모듈에서 화면 출력 없이 실행
+    profile_id = db.Column(
+        db.Integer, db.ForeignKey("detection_profiles.id"), nullable=True
+    )  # 검출 프로필 (없으면 기본 설정)
+    profile = db.relationship("DetectionProfile", backref="cams")
+    zones = db.relationship("Zone", backref="cam", cascade="all, delete-orphan")
+    heatmap = db.relationship(
+        "Heatmap", backref="cam", uselist=False, cascade="all, delete-orphan"
+    )
     videos = db.relationship("Videos", backref="cam", foreign_keys="Videos.camera_id")
     videos_by_name = db.relationship(
         "Videos", backref="cam_by_name", foreign_keys="Videos.camera_name"
@@ -50,6 +83,36 @@ class Cams(db.Model):
         return f"<Cam {self.cam_name}>"
 
 
+class Zone(db.Model):
+    """카메라별 구역(다각형) / 통과선 (인식 모듈 zones.py 에서 사용)"""
+
+    __tablename__ = "zones"
+    id = db.Column(db.Integer, primary_key=True)
+    camera_id = db.Column(db.Integer, db.ForeignKey(Cams.id), nullable=False)
+    name = db.Column(db.String(64), nullable=False)
+    kind = db.Column(db.String(8), default="zone")  # "zone": 다각형 구역, "line": 통과선
+    points = db.Column(db.String(512), nullable=False)  # "x1,y1,x2,y2,..." (0~1 비율)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"<Zone {self.name}>"
+
+
+class Heatmap(db.Model):
+    """카메라별 점유 히트맵 격자 (인식 모듈 main.py 가 주기적으로 갱신)"""
+
+    __tablename__ = "heatmaps"
+    id = db.Column(db.Integer, primary_key=True)
+    camera_id = db.Column(db.Integer, db.ForeignKey(Cams.id), unique=True, nullable=False)
+    width = db.Column(db.Integer, nullable=False)
+    height = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)  # float32 높이 x 너비 격자
+    updated_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"<Heatmap cam={self.camera_id}>"
+
+
 class Videos(db.Model):
     __tablename__ = "videos"
     id = db.Column(db.Integer, primary_key=True)
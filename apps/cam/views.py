@@ -11,6 +11,7 @@ from flask import (
     current_app,
     send_from_directory,
     abort,
+    Response,
 )
 from flask_wtf.csrf import generate_csrf
 from apps import db
@@ -22,11 +23,19 @@ from apps.app import (
     stop_recording_all,
     start_recording_all,
 )
-from apps.cam.models import Cams, Videos
-from apps.cam.forms import CameraForm, DeleteCameraForm, VideoSearchForm, ShutdownForm
+from apps.cam.models import Cams, Videos, DetectionProfile, Zone, Heatmap
+from apps.cam.forms import (
+    CameraForm,
+    DeleteCameraForm,
+    VideoSearchForm,
+    ShutdownForm,
+    DetectionProfileForm,
+    ZoneForm,
+)
 from flask_login import login_required  # type: ignore
 from pathlib import Path
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
+from time import sleep
 
 from collections import defaultdict
 import os
@@ -51,6 +60,11 @@ from flask_paginate import Pagination, get_page_parameter
 import socket
 import json
 import cv2 as cv
+import numpy as np
+
+from Process.frame_relay import RelaySubscriber
+from Process.sidecar import load_detections
+from Process.heatmap import heatmap_path, load_heatmap, render_heatmap, snapshot_path
 
 
 # Blueprint로 crud 앱을 생성한다.
@@ -65,6 +79,7 @@ cam = Blueprint(
 RECOGNITION_MODULE_HOST = "localhost"
 RECOGNITION_MODULE_PORT = 8001
 RECOGNITION_MODULE_STATUS_PORT = 8002  # 상태 확인용 새 포트
+RECOGNITION_MODULE_METRICS_PORT = 8003  # 카메라별 처리 메트릭 확인용 포트
 
 recognition_module_running = False
 
@@ -101,6 +116,26 @@ def check_status():
     }
 
 
+@cam.route("/check_metrics")
+def check_metrics():
+    """인식 모듈의 카메라별 처리 메트릭 (추론 fps, 추론 생략 비율 등)"""
+    data = None
+    try:
+        with socket.create_connection(
+            (RECOGNITION_MODULE_HOST, RECOGNITION_MODULE_METRICS_PORT), timeout=1
+        ) as sock:
+            chunks = []
+            while chunk := sock.recv(4096):
+                chunks.append(chunk)
+            data = json.loads(b"".join(chunks).decode("utf-8"))
+    except (ConnectionRefusedError, TimeoutError):
+        current_app.logger.warning("인식 모듈 연결 끊김 또는 응답 없음 (메트릭 확인)")
+    except:
+        pass
+
+    return {"metrics": data}
+
+
 @cam.route("/check_cam_status")
 def check_cam_status():
     num_total_cams = Cams.query.count()
@@ -138,7 +173,11 @@ def check_active():
     try:
         cap = None
         for cam in cams:
-            cap = cv.VideoCapture(cam.cam_url)
+            if current_app.config.get("USE_RELAY"):
+                # 카메라에 새로 접속하지 않고 릴레이의 연결 상태 확인
+                cap = RelaySubscriber(cam.id, timeout=0)
+            else:
+                cap = cv.VideoCapture(cam.cam_url)
             if cap.isOpened():
                 cam.is_active = True
                 # current_app.logger.info(f"카메라 {cam.cam_name}가 활성화되었습니다.")
@@ -199,13 +238,27 @@ def index():
     )
 
 
+def set_profile_choices(form):
+    """카메라 폼의 검출 프로필 선택지 설정"""
+    form.profile_id.choices = [(0, "기본 설정")] + [
+        (p.id, p.name) for p in DetectionProfile.query.order_by(DetectionProfile.name)
+    ]
+
+
 # 새로운 데이터 추가 (AJAX)
 @cam.route("/add", methods=["GET", "POST"])
 @login_required
 def add_camera():
     form = CameraForm()
+    set_profile_choices(form)
     if form.validate_on_submit():
-        cam = Cams(cam_name=form.cam_name.data, cam_url=form.cam_url.data)
+        cam = Cams(
+            cam_name=form.cam_name.data,
+            cam_url=form.cam_url.data,
+            sub_url=form.sub_url.data or None,
+            headless=form.headless.data,
+            profile_id=form.profile_id.data or None,
+        )
         if cam.is_duplicate_url():
             flash("지정 영상 주소는 이미 등록되어 있습니다.")
             return redirect(url_for("cam.add_camera"))
@@ -225,17 +278,22 @@ def add_camera():
 @login_required
 def edit_camera(camera_id):
     form = CameraForm()
+    set_profile_choices(form)
     cam = Cams.query.filter_by(id=camera_id).first()
 
     # form 으로 부터 제출된경우는 사용자를 갱신하여 사용자의 일람 화면으로 리다이렉트
     if form.validate_on_submit():
         cam.cam_name = form.cam_name.data
         cam.cam_url = form.cam_url.data
+        cam.sub_url = form.sub_url.data or None
+        cam.headless = form.headless.data
+        cam.profile_id = form.profile_id.data or None
         db.session.add(cam)
         db.session.commit()
         return redirect(url_for("cam.cameras"))
 
     # GET의 경우에는 HTML 반환
+    form.profile_id.data = cam.profile_id or 0
     return render_template("cam/editCamera.html", cam=cam, form=form)
 
 
@@ -259,12 +317,135 @@ def cameras():
     )
 
 
+@cam.route("/profiles", methods=["GET", "POST"])
+@login_required
+def profiles():
+    """검출 프로필 목록 및 등록"""
+    form = DetectionProfileForm()
+    if form.validate_on_submit():
+        if DetectionProfile.query.filter_by(name=form.name.data).first():
+            flash("같은 이름의 프로필이 이미 있습니다.")
+            return redirect(url_for("cam.profiles"))
+        profile = DetectionProfile(
+            name=form.name.data,
+            model_path=form.model_path.data or "yolo11n.pt",
+            imgsz=form.imgsz.data,
+            conf=form.conf.data,
+            classes=form.classes.data or None,
+            target_fps=form.target_fps.data,
+            roi=form.roi.data or None,
+            stride=form.stride.data or 1,
+            latency_budget_ms=form.latency_budget_ms.data,
+        )
+        db.session.add(profile)
+        db.session.commit()
+        flash("프로필을 등록했습니다. 인식 모듈을 재시작하면 적용됩니다.")
+        return redirect(url_for("cam.profiles"))
+
+    profiles = DetectionProfile.query.order_by(DetectionProfile.name).all()
+    return render_template(
+        "cam/profiles.html",
+        profiles=profiles,
+        form=form,
+        delete_form=DeleteCameraForm(),
+    )
+
+
+@cam.route("/profiles/<int:profile_id>/delete", methods=["POST"])
+@login_required
+def delete_profile(profile_id):
+    profile = DetectionProfile.query.get_or_404(profile_id)
+    for c in profile.cams:
+        c.profile_id = None  # 연결된 카메라는 기본 설정으로
+    db.session.delete(profile)
+    db.session.commit()
+    return redirect(url_for("cam.profiles"))
+
+
+@cam.route("/zones", methods=["GET", "POST"])
+@login_required
+def zones():
+    """카메라별 구역 / 통과선 목록 및 등록"""
+    form = ZoneForm()
+    form.camera_id.choices = [(c.id, c.cam_name) for c in Cams.query.order_by(Cams.id)]
+    if form.validate_on_submit():
+        count = len(form.points.data.split(",")) // 2
+        if form.points.data.count(",") % 2 == 0:
+            flash("좌표는 x,y 쌍으로 입력해 주세요.")
+        elif form.kind.data == "zone" and count < 3:
+            flash("구역은 점이 3개 이상 필요합니다.")
+        elif form.kind.data == "line" and count != 2:
+            flash("통과선은 점 2개(A, B)로 입력해 주세요.")
+        else:
+            zone = Zone(
+                camera_id=form.camera_id.data,
+                name=form.name.data,
+                kind=form.kind.data,
+                points=form.points.data,
+            )
+            db.session.add(zone)
+            db.session.commit()
+            flash("등록했습니다. 인식 모듈을 재시작하면 적용됩니다.")
+        return redirect(url_for("cam.zones"))
+
+    zones = Zone.query.order_by(Zone.camera_id, Zone.id).all()
+    return render_template(
+        "cam/zones.html", zones=zones, form=form, delete_form=DeleteCameraForm()
+    )
+
+
+@cam.route("/zones/<int:zone_id>/delete", methods=["POST"])
+@login_required
+def delete_zone(zone_id):
+    zone = Zone.query.get_or_404(zone_id)
+    db.session.delete(zone)
+    db.session.commit()
+    return redirect(url_for("cam.zones"))
+
+
 @cam.route("/live")
 def live():
     from apps.app import camera_streams  # 순환 참조 방지
 
     cams = Cams.query.all()
-    return render_template("cam/live.html", cams=cams)
+    return render_template(
+        "cam/live.html", cams=cams, use_relay=current_app.config.get("USE_RELAY")
+    )
+
+
+@cam.route("/stream/<int:camera_id>")
+def stream(camera_id):
+    """릴레이 프레임을 MJPEG 으로 전송 (라이브 화면용)"""
+    relay = RelaySubscriber(camera_id, timeout=0)
+    if not relay.isOpened():
+        relay.release()
+        abort(404)
+
+    def generate():
+        last_seq = -1
+        try:
+            while relay.isOpened():
+                latest = relay.view()
+                if latest is None or latest[0] == last_seq:
+                    sleep(0.02)
+                    continue
+                seq, _, frame = latest
+                # 공유 메모리 슬롯에서 바로 JPEG 인코딩 (복사 없음)
+                ok, jpeg = cv.imencode(".jpg", frame, [int(cv.IMWRITE_JPEG_QUALITY), 70])
+                if not ok or not relay.is_current(seq):
+                    continue  # 인코딩 도중 슬롯이 덮어써짐
+                last_seq = seq
+                yield (
+                    b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+                    + jpeg.tobytes()
+                    + b"\r\n"
+                )
+        finally:
+            relay.release()
+
+    return Response(
+        generate(), mimetype="multipart/x-mixed-replace; boundary=frame"
+    )
 
 
 @cam.route("/status")
@@ -399,8 +580,15 @@ def play_origin_video(video_id):
             current_app.logger.info(
                 f"Generated S3 presigned URL for playback: {presigned_url}"
             )
+            # 원본 영상은 검출 사이드카가 있으면 브라우저에서 박스를 그린다
+            detections_url = None
+            if not video.is_dt:
+                detections_url = url_for("cam.video_detections", video_id=video_id)
             return render_template(
-                "cam/play_video_page.html", video_path=presigned_url, video_id=video_id
+                "cam/play_video_page.html",
+                video_path=presigned_url,
+                video_id=video_id,
+                detections_url=detections_url,
             )
         else:
             flash("재생 URL 생성에 실패했습니다.", "play_error")
@@ -413,6 +601,54 @@ def play_origin_video(video_id):
         return redirect(url_for("cam.list_videos"))
 
 
+@cam.route("/video_detections/<int:video_id>")
+@login_required
+def video_detections(video_id):
+    """원본 영상 구간의 검출 사이드카 (영상 시작 기준 초 단위 시각)"""
+    video = Videos.query.get_or_404(video_id)
+    if video.recorded_date is None or video.recorded_time is None:
+        return jsonify({"width": None, "height": None, "frames": []})
+    start = datetime.combine(video.recorded_date.date(), video.recorded_time)
+    if video.rend_date is not None and video.rend_time is not None:
+        end = datetime.combine(video.rend_date, video.rend_time)
+    else:
+        # 원본 녹화는 RECORD_SEGMENT_SECONDS 단위로 나뉜다 (남는 부분은 브라우저가 무시)
+        end = start + timedelta(
+            seconds=current_app.config.get("RECORD_SEGMENT_SECONDS", 600)
+        )
+    frame_size, frames = load_detections(
+        current_app.config["DETECTION_FOLDER"], video.camera_id, start, end
+    )
+    width, height = frame_size or (None, None)
+    return jsonify({"width": width, "height": height, "frames": frames})
+
+
+@cam.route("/heatmap/<int:camera_id>")
+@login_required
+def heatmap(camera_id):
+    """카메라 점유 히트맵을 마지막 저장 화면 위에 그린 JPEG"""
+    Cams.query.get_or_404(camera_id)
+    folder = current_app.config["HEATMAP_FOLDER"]
+    path = heatmap_path(folder, camera_id)
+    if path.exists():
+        grid, _ = load_heatmap(path)
+    else:
+        # 인식 모듈과 다른 서버에서 실행 중이면 DB 에 저장된 격자 사용
+        row = Heatmap.query.filter_by(camera_id=camera_id).first_or_404()
+        grid = np.frombuffer(row.data, np.float32).reshape(row.height, row.width)
+
+    background = None
+    snapshot = snapshot_path(folder, camera_id)
+    if snapshot.exists():
+        background = cv.imread(str(snapshot))
+    ok, jpeg = cv.imencode(".jpg", render_heatmap(grid, background))
+    if not ok:
+        abort(500)
+    return Response(
+        jpeg.tobytes(), mimetype="image/jpeg", headers={"Cache-Control": "no-cache"}
+    )
+
+
 @cam.route("/videos", methods=["GET", "POST"])
 @login_required
 def list_videos():
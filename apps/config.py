@@ -12,9 +12,22 @@ class BaseConfig:
     WTF_CSRF_ENABLED = True
     VIDEO_FOLDER = baseDir / "apps" / "videos"
     DT_VIDEO_FOLDER = baseDir / "apps" / "dt_videos"
+    # 인식 모듈 검출 사이드카 (recognition_config.ANNOTATION_MODE = "sidecar")
+    DETECTION_FOLDER = baseDir / "dt_detections"
+    # 인식 모듈 점유 히트맵 (recognition_config.HEATMAP)
+    HEATMAP_FOLDER = baseDir / "dt_heatmaps"
     SNAPSHOT_FOLDER = baseDir / "apps" / "snapshots"
     LOG_FOLDER = baseDir / "apps" / "logs"
     VIDEO_FPS = 60
+    # 원본 녹화기: "opencv" (cv.VideoWriter) / "ffmpeg" (ffmpeg 하위 프로세스, 조각 MP4 세그먼트)
+    #             "copy" (디코딩 / 재인코딩 없이 카메라 스트림을 그대로 저장)
+    RECORDER = "opencv"
+    FFMPEG_PRESET = "veryfast"
+    FFMPEG_CRF = 23
+    # 카메라 릴레이 (Process/relay.py) 사용: 원본 녹화 / 라이브 화면 / 상태 확인이
+    # 카메라에 직접 접속하지 않고 릴레이 공유 메모리에서 프레임을 받는다
+    USE_RELAY = False
+    RECORD_SEGMENT_SECONDS = 600  # 원본 녹화 파일 길이 (초), ffmpeg / copy 는 벽시계 경계에 맞춤
 
 
 # 상황데  따른 환경 설정 작업 (BaseConfig 클래스 각 상황별로 상속하여 처리)
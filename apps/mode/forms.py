@@ -18,6 +18,8 @@ class ScheduleForm(FlaskForm):
 
     memo = TextAreaField("메모")
 
+    zone_id = SelectField("구역", coerce=int, choices=[(0, "화면 전체")], default=0)
+
     submit = SubmitField("신규 등록")
 
 
@@ -1,6 +1,6 @@
 from apps.app import db
 from datetime import datetime
-from apps.cam.models import Cams
+from apps.cam.models import Cams, Zone
 
 
 class ModeSchedule(db.Model):
@@ -12,6 +12,9 @@ class ModeSchedule(db.Model):
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime, nullable=False)
     memo = db.Column(db.String(256), nullable=True)
+    # 지정 시 이 구역 안의 인원 수로 판단 (없으면 화면 전체)
+    zone_id = db.Column(db.Integer, db.ForeignKey(Zone.id, ondelete="SET NULL"), nullable=True)
+    zone = db.relationship("Zone")
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -33,6 +36,18 @@ class ModeDetected(db.Model):
     dend_time = db.Column(db.DateTime, default=datetime.now)
     mode_schedule_id = db.Column(db.Integer)
     info = db.Column(db.String(256))
+    snapshots = db.relationship("ModeSnapshot", backref="mode_detected")
+
+
+class ModeSnapshot(db.Model):
+    """감지 시작 시 카메라별 스냅샷 (인식 모듈 snapshots.py, SNAPSHOT_FOLDER 기준 상대 경로)"""
+
+    __tablename__ = "mode_snapshots"
+    idx = db.Column(db.Integer, primary_key=True)
+    md_idx = db.Column(db.Integer, db.ForeignKey(ModeDetected.idx), nullable=False)
+    camera_id = db.Column(db.Integer, db.ForeignKey(Cams.id), nullable=False)
+    path = db.Column(db.String(256), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
 
 
 class CameraLogs(db.Model):
@@ -40,5 +55,11 @@ class CameraLogs(db.Model):
     idx = db.Column(db.Integer, primary_key=True)
     camera_idx = db.Column(db.Integer, db.ForeignKey(Cams.id, name="cam_id"))
     dp_cnt = db.Column(db.String(256))
+    # 로그 주기 동안의 인원 수 통계 (인식 모듈 count_stats.py)
+    dp_max = db.Column(db.Integer)
+    dp_mean = db.Column(db.Float)
+    dp_p95 = db.Column(db.Integer)
+    dp_ids = db.Column(db.Integer)  # 구간에 나타난 추적 ID 수
+    dp_zones = db.Column(db.String(1024))  # 구역 인원 / 통과선 통과 수 (JSON)
     detected_time = db.Column(db.DateTime, default=datetime.now)
     plog_idx = db.Column(db.Integer, db.ForeignKey(PlaceLogs.idx, name="plog_id"))
@@ -1,5 +1,14 @@
 # redirect, url_for, request, flash 추가
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    redirect,
+    render_template,
+    request,
+    send_from_directory,
+    url_for,
+)
 
 
 # 등록 정보를 세션에 공유
@@ -13,6 +22,7 @@ import pymysql
 from apps.app import db
 from apps.mode.forms import ScheduleForm, DeleteScheduleForm
 from apps.mode.models import ModeSchedule, ModeDetected, PlaceLogs, CameraLogs
+from apps.cam.models import Zone
 
 from apps.kakao.kakao_client import CLIENT_ID, CLIENT_SECRET
 from apps.kakao.kakao_controller import Oauth
@@ -46,6 +56,10 @@ def index():
 @login_required
 def schedule():
     form = ScheduleForm()
+    form.zone_id.choices = [(0, "화면 전체")] + [
+        (z.id, f"{z.cam.cam_name} - {z.name}")
+        for z in Zone.query.filter_by(kind="zone").order_by(Zone.camera_id, Zone.id)
+    ]
     if form.validate_on_submit():
         schedule = ModeSchedule(
             mode_type=form.mode_type.data,
@@ -54,6 +68,7 @@ def schedule():
             start_time=form.start_time.data,
             end_time=form.end_time.data,
             memo=form.memo.data,
+            zone_id=form.zone_id.data or None,
         )
         db.session.add(schedule)
         db.session.commit()
@@ -170,6 +185,13 @@ def mode_logs(schedule_id):
     )
 
 
+@mode.route("/snapshots/<path:filename>")
+@login_required
+def snapshot(filename):
+    """감지 이벤트 스냅샷 이미지"""
+    return send_from_directory(current_app.config["SNAPSHOT_FOLDER"], filename)
+
+
 # @mode.route("/schedules/<int:schedule_id>")
 # @login_required
 # def mode_logs(schedule_id):